@@ -0,0 +1,7 @@
+"""CQ Benchmark — the 4-axis cognitive quality score of an agent project.
+
+Python CLI (``python -m benchmark``) on the same scorer as the MCP
+``benchmark`` tool. See README.md.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,195 @@
+"""CQ Benchmark command-line interface on the shared scorer.
+
+Scores come from the engine behind the MCP ``benchmark`` and
+``benchmark_trend`` tools (``mcp-server/tools/benchmark.py``) and are
+recorded in the same database, so runs from the CLI and the server form
+one time series per project.
+
+Usage:
+    python -m benchmark assess ./my-agent-project/
+    python -m benchmark assess . --weight document_integrity=0.5 --format json
+    python -m benchmark trend ./my-agent-project/ --limit 10
+
+Exit codes: 0 success, 2 argument error, directory not found or
+database error.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp-server"))
+
+from tools import benchmark as scorer  # noqa: E402
+
+from benchmark import __version__  # noqa: E402
+
+# --- Colors ---
+GREEN = "\033[0;32m"
+YELLOW = "\033[0;33m"
+RED = "\033[0;31m"
+GRAY = "\033[0;90m"
+BOLD = "\033[1m"
+NC = "\033[0m"
+
+# Axis -> (label, column heading of the trend table)
+AXIS_LABELS = {
+    "context_health": ("Context Health", "CH"),
+    "decision_quality": ("Decision Quality", "DQ"),
+    "document_integrity": ("Document Integrity", "DI"),
+    "evolution": ("Evolution", "EV"),
+}
+BAR_WIDTH = 20
+
+
+# ============================================================
+# Output
+# ============================================================
+def _bar(score: float | None) -> str:
+    if score is None:
+        return "[no data]"
+    filled = round(score * BAR_WIDTH)
+    return f"[{'█' * filled}{'░' * (BAR_WIDTH - filled)}]"
+
+
+def _score(score: float | None) -> str:
+    return "  --" if score is None else f"{score:.2f}"
+
+
+def _paint(text: str, score: float | None, color: bool) -> str:
+    if not color:
+        return text
+    if score is None:
+        return f"{GRAY}{text}{NC}"
+    tone = GREEN if score >= 0.6 else YELLOW if score >= 0.4 else RED
+    return f"{tone}{text}{NC}"
+
+
+def generate_assess_text(result: dict[str, Any], color: bool) -> str:
+    overall = result["cq_score"]
+    lines = []
+    if overall is None:
+        lines.append("CQ Score: -- (no sub-metric has data)")
+    else:
+        headline = f"CQ Score: {overall:.2f} (Grade {result['grade']})"
+        lines.append(f"{BOLD}{headline}{NC}" if color else headline)
+    width = max(len(label) for label, _ in AXIS_LABELS.values()) + 1
+    for axis, (label, _) in AXIS_LABELS.items():
+        score = result["axes"][axis]["score"]
+        lines.append(_paint(f"  {label + ':':<{width}} {_score(score)}  {_bar(score)}", score, color))
+
+    lines.append("")
+    lines.append("Sub-metrics:")
+    for metric in result["metrics"]:
+        note = f"  ({metric['note']})" if metric.get("note") else ""
+        line = f"  {metric['id']:<5} {metric['name']:<28} {_score(metric['score'])}{note}"
+        lines.append(_paint(line, metric["score"], color))
+
+    coverage = result["coverage"]
+    scan = result["scan"]
+    lines.append("")
+    lines.append(
+        f"Measured {coverage['measured']}/{coverage['total']} sub-metrics; "
+        f"{scan['documents']} documents, {scan['configs']} configs "
+        f"({scan['analyzed']} analyzed, {scan['unchanged']} unchanged)"
+    )
+    lines.append(f"Period: {result['period']}")
+    trend = result["trend"]
+    if trend["change"] is not None:
+        lines.append(f"Change since the previous run: {trend['change']:+.3f} (was {trend['previous']:.2f})")
+    if result["weakest_documents"]:
+        lines.append("")
+        lines.append("Documents with the most surviving mutations:")
+        for doc in result["weakest_documents"]:
+            lines.append(f"  {doc['path']}: {doc['survived']}/{doc['mutations']} survived")
+    return "\n".join(lines)
+
+
+def generate_trend_text(result: dict[str, Any]) -> str:
+    if not result["history"]:
+        return f"No recorded scores for {result['project_dir']}. Run: python -m benchmark assess {result['project_dir']}"
+    lines = [f"{'recorded at':<26} {'CQ':>5} {'grade':>5}  " + "  ".join(f"{h:>4}" for _, h in AXIS_LABELS.values())]
+    for entry in result["history"]:
+        axes = "  ".join(_score(entry["axes"].get(axis)) for axis in AXIS_LABELS)
+        lines.append(f"{entry['recorded_at'][:26]:<26} {_score(entry['cq_score']):>5} {entry['grade'] or '--':>5}  {axes}")
+    overall = result["trend"]["cq_score"]
+    if len(result["history"]) > 1 and overall["change"] is not None:
+        slope = "" if overall["slope_per_day"] is None else f", {overall['slope_per_day']:+.4f} per day"
+        lines.append("")
+        lines.append(f"Change over {len(result['history'])} runs: {overall['change']:+.3f}{slope}")
+    return "\n".join(lines)
+
+
+# ============================================================
+# Main
+# ============================================================
+def _weight(text: str) -> tuple[str, float]:
+    key, sep, value = text.partition("=")
+    try:
+        if not sep:
+            raise ValueError
+        return key.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE with a number, got '{text}'") from None
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="benchmark",
+        description="CQ Benchmark — 4-axis cognitive quality score of an agent project",
+        epilog="Exit codes: 0 success, 2 argument error, directory not found or database error.",
+    )
+    parser.add_argument("--version", "-v", action="version", version=f"benchmark {__version__}")
+    parser.add_argument("command", choices=["assess", "trend"],
+                        help="assess: score the project and record it; trend: recorded scores over time")
+    parser.add_argument("project_dir")
+    parser.add_argument("--format", default="text", choices=["text", "json"])
+    parser.add_argument("--days", type=int, default=30, help="Period of telemetry and learnings (assess)")
+    parser.add_argument("--weight", type=_weight, action="append", default=[], metavar="KEY=VALUE",
+                        help="Weight of an axis or sub-metric ID, e.g. evolution=0.4 or DI-1=0.5 (assess; repeatable)")
+    parser.add_argument("--project", default="", help="Learned-store project scope to include (assess)")
+    parser.add_argument("--no-record", action="store_true", help="Do not add the score to the time series (assess)")
+    parser.add_argument("--limit", type=int, default=30, help="Most recent records to show (trend)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    if not Path(args.project_dir).is_dir():
+        print(f"Error: Not a directory: {args.project_dir}", file=sys.stderr)
+        return 2
+    color = sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+    try:
+        if args.command == "assess":
+            result = scorer.assess(
+                args.project_dir, args.days, dict(args.weight) or None, args.project, not args.no_record,
+            )
+        else:
+            history = scorer._INDEX.history(str(Path(args.project_dir).resolve()), max(1, args.limit))
+            for entry in history:
+                entry["grade"] = scorer.grade(entry["cq_score"])
+            result = {
+                "project_dir": args.project_dir,
+                "records": len(history),
+                "history": history,
+                "trend": scorer.trend(history),
+            }
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except sqlite3.Error as e:
+        print(f"Error: Benchmark database error: {e}", file=sys.stderr)
+        return 2
+
+    if args.format == "json":
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif args.command == "assess":
+        print(generate_assess_text(result, color))
+    else:
+        print(generate_trend_text(result))
+    return 0
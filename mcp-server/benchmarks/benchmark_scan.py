@@ -0,0 +1,77 @@
+"""CQ Benchmark scoring pass over a large project: cold, warm and after an edit.
+
+Generates a project of preset-shaped documents and cqlint fixture configs
+(see ``corpora.py``), a learned store and telemetry, then times
+``tools.benchmark.assess`` three times: on an empty cache (every file
+analyzed), unchanged (every file stat'ed, none re-analyzed), and after
+one document is edited. Peak RSS of the process is reported at the end.
+
+Usage:
+    python benchmarks/benchmark_scan.py
+    python benchmarks/benchmark_scan.py --docs 2000 --configs 500 --lines 200
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import corpora
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from telemetry.collector import TelemetryCollector  # noqa: E402
+from tools import benchmark, learn  # noqa: E402
+
+
+def _timed(label: str, project: Path) -> None:
+    start = time.perf_counter()
+    result = benchmark.assess(project, record=False)
+    elapsed = time.perf_counter() - start
+    scan = result["scan"]
+    print(
+        f"{label:<10} {elapsed:>9.2f}s {scan['analyzed']:>9} {scan['unchanged']:>10} "
+        f"{result['cq_score']!s:>9}"
+    )
+
+
+def run(args) -> None:
+    with tempfile.TemporaryDirectory(prefix="cq-bench-") as tmp:
+        tmp = Path(tmp)
+        project = tmp / "project"
+        docs = project / "docs"
+        docs.mkdir(parents=True)
+        for seed in range(args.docs):
+            corpora.write_document(docs, args.lines, seed=seed)[0].rename(docs / f"doc_{seed:05d}.md")
+        corpora.write_lint_tree(project / "agents", args.configs)
+        benchmark._INDEX = benchmark.BenchmarkIndex(tmp / "benchmark.db")
+        benchmark._TELEMETRY = TelemetryCollector(str(corpora.write_telemetry(tmp / "telemetry", 10_000)))
+        learn.LEARNED_BASE = tmp / "learned"
+        corpora.write_learned_store(learn.LEARNED_BASE / "global.jsonl", args.learnings)
+
+        print(f"{args.docs} documents x {args.lines} lines, {args.configs} configs, {args.learnings} learnings")
+        print(f"{'pass':<10} {'time':>10} {'analyzed':>9} {'unchanged':>10} {'cq_score':>9}")
+        _timed("cold", project)
+        _timed("warm", project)
+        with open(docs / "doc_00000.md", "a", encoding="utf-8") as f:
+            f.write("\nThe vendor shall respond within a reasonable time.\n")
+        _timed("one edit", project)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak RSS: {peak_mb:.0f} MB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--docs", type=int, default=1000, help="Documents in the project")
+    parser.add_argument("--lines", type=int, default=200, help="Lines per document")
+    parser.add_argument("--configs", type=int, default=200, help="YAML configs in the project")
+    parser.add_argument("--learnings", type=int, default=10_000, help="Entries in the learned store")
+    args = parser.parse_args()
+    run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
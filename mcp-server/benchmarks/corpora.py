@@ -0,0 +1,146 @@
+"""Synthetic corpora for the performance benchmarks.
+
+Every generator is deterministic for a given seed, so two runs of the
+benchmark suite measure the same inputs and baselines stay comparable.
+"""
+
+import json
+import random
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import docgen
+
+CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
+
+_VOCABULARY = (
+    "system service request response client server module data record "
+    "contract party notice payment term policy access user account report "
+    "review audit process schedule release component interface storage "
+    "session token budget context persona mutation learning template"
+).split()
+
+_TASK_VERBS = (
+    "refactor", "implement", "analyze", "review", "migrate", "update",
+    "optimize", "test", "document", "integrate", "evaluate", "fix",
+)
+
+
+def write_document(directory: Path, line_count: int, seed: int = 0, preset: str = "contract") -> tuple[Path, dict]:
+    """Write a preset-shaped synthetic document; return its path and ground truth."""
+    path = directory / f"{preset}_{line_count}.md"
+    return path, docgen.write_document(path, preset, line_count, seed)
+
+
+def make_task_description(word_count: int, seed: int = 0) -> str:
+    """Generate a multi-sentence task description of ~``word_count`` words."""
+    rng = random.Random(seed)
+    sentences: list[str] = []
+    words = 0
+    connectors = ("", "Then ", "After that, ", "Based on the results, ", "Also ")
+    while words < word_count:
+        sentence = (
+            f"{rng.choice(connectors)}{rng.choice(_TASK_VERBS)} the "
+            f"{rng.choice(_VOCABULARY)} {rng.choice(_VOCABULARY)} and "
+            f"{rng.choice(_TASK_VERBS)} each {rng.choice(_VOCABULARY)} "
+            f"across the {rng.choice(_VOCABULARY)} layer."
+        )
+        sentences.append(sentence[0].upper() + sentence[1:])
+        words += len(sentence.split())
+    return " ".join(sentences)
+
+
+def make_file_list(count: int, seed: int = 0) -> list[str]:
+    """Generate ``count`` plausible repository file paths.
+
+    The paths do not exist on disk; the gate tool then takes its
+    inaccessible-file fallbacks, which still exercises the stat calls.
+    """
+    rng = random.Random(seed)
+    top = ("src", "lib", "tests", "docs", "config", "scripts", "node_modules", "build")
+    exts = (".py", ".ts", ".md", ".yaml", ".json", ".sh", ".png", ".lock")
+    return [
+        f"/repo/{rng.choice(top)}/{rng.choice(_VOCABULARY)}/"
+        f"{rng.choice(_VOCABULARY)}_{rng.choice(_VOCABULARY)}_{i}{rng.choice(exts)}"
+        for i in range(count)
+    ]
+
+
+def make_subtasks(count: int, seed: int = 0) -> list[dict]:
+    """Generate a layered DAG of ``count`` subtasks in decompose's format.
+
+    Each subtask depends on up to two subtasks from the preceding layer of
+    ~sqrt(count) nodes, giving roughly sqrt(count) waves.
+    """
+    rng = random.Random(seed)
+    width = max(1, int(count ** 0.5))
+    subtasks = []
+    for i in range(count):
+        layer_start = (i // width - 1) * width
+        deps = set()
+        if layer_start >= 0:
+            for _ in range(rng.randint(0, 2)):
+                deps.add(layer_start + rng.randrange(width))
+        subtasks.append({
+            "id": f"ST-{i + 1}",
+            "description": f"{rng.choice(_TASK_VERBS)} the {rng.choice(_VOCABULARY)}",
+            "estimated_tokens": rng.choice((2000, 5000, 15000, 50000)),
+            "dependencies": [f"ST-{d + 1}" for d in sorted(deps)],
+        })
+    return subtasks
+
+
+def write_learned_store(path: Path, entry_count: int, seed: int = 0) -> Path:
+    """Write a JSONL learned store with ``entry_count`` entries."""
+    rng = random.Random(seed)
+    categories = ("pattern_usage", "failure", "preference", "optimization")
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(entry_count):
+            observation = " ".join(rng.choice(_VOCABULARY) for _ in range(rng.randint(8, 20)))
+            f.write(json.dumps({
+                "id": f"L{i:08d}",
+                "observation": observation,
+                "category": rng.choice(categories),
+                "confidence": round(rng.random(), 2),
+                "project": "",
+                "timestamp": (base + timedelta(seconds=i)).isoformat(),
+                "tags": [],
+            }) + "\n")
+    return path
+
+
+def write_telemetry(storage: Path, event_count: int, days: int = 14, seed: int = 0) -> Path:
+    """Write ``event_count`` telemetry events spread over ``days`` days."""
+    rng = random.Random(seed)
+    tools = ("decompose", "gate", "persona", "cqlint", "mutate", "learn")
+    events_dir = storage / "events"
+    events_dir.mkdir(parents=True, exist_ok=True)
+    (storage / "aggregates").mkdir(exist_ok=True)
+    today = datetime.now(timezone.utc).date()
+    per_day = max(1, event_count // days)
+    for d in range(days):
+        day = today - timedelta(days=d)
+        with open(events_dir / f"{day.isoformat()}.jsonl", "w", encoding="utf-8") as f:
+            for _ in range(per_day):
+                f.write(json.dumps({
+                    "timestamp": f"{day.isoformat()}T12:00:00+00:00",
+                    "event_type": "tool_invocation",
+                    "tool": f"cq_engine__{rng.choice(tools)}",
+                    "data": {"status": "error" if rng.random() < 0.05 else "success"},
+                    "session_id": f"s{rng.randint(0, per_day // 10 + 1):05d}",
+                    "duration_ms": rng.randint(1, 2000),
+                }) + "\n")
+    return storage
+
+
+def write_lint_tree(directory: Path, file_count: int) -> Path:
+    """Populate a directory with copies of the cqlint fixtures."""
+    fixtures = sorted((CQ_ENGINE_ROOT / "cqlint" / "tests").glob("*/*.yaml"))
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(file_count):
+        src = fixtures[i % len(fixtures)]
+        shutil.copyfile(src, directory / f"{i:05d}_{src.name}")
+    return directory
@@ -0,0 +1,418 @@
+"""Deterministic, preset-driven synthetic document generator for MutaDoc.
+
+Produces Markdown documents of any size shaped like the documents a preset
+targets (contract, api_spec, academic_paper, policy), with controlled
+densities of the constructs the mutation strategies look for:
+
+- vague modifiers (ambiguity)
+- numeric parameters and ranges (boundary, contradiction)
+- "shall" / "shall not" obligations (contradiction)
+- supported and unsupported claims (inversion)
+- headings and cross-references (deletion)
+
+While rendering, the generator records every construct it inserts in a
+ledger and derives the expected finding counts per strategy from that
+ledger. Filler text is drawn only from words that trigger no strategy, so
+the expected counts are exact ground truth for the ``mutate`` tool and
+performance and correctness can be benchmarked together.
+
+Usage:
+    python benchmarks/docgen.py --preset contract --lines 50000 --seed 7 \\
+        --out /tmp/contract_50k.md
+    python benchmarks/docgen.py --preset policy --lines 2000 --out /tmp/p.md --verify
+
+Writes the document and ``<out>.expected.json`` next to it.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.mutate import (  # noqa: E402
+    CLAIM_INDICATORS,
+    EVIDENCE_KEYWORDS,
+    NUMERIC_PARAM_RE,
+    RANGE_RE,
+    VAGUE_MODIFIERS,
+    _load_preset,
+)
+
+STRATEGIES = ("contradiction", "ambiguity", "deletion", "inversion", "boundary")
+
+# Per-body-line probabilities before preset weighting
+DEFAULT_DENSITIES: dict[str, float] = {
+    "vague_modifier": 0.15,
+    "numeric": 0.10,
+    "range": 0.03,
+    "obligation": 0.08,
+    "claim": 0.05,
+    "cross_reference": 0.08,
+}
+DEFAULT_SECTION_LINES = 20
+
+# Which strategy weight scales which density
+DENSITY_STRATEGY = {
+    "vague_modifier": "ambiguity",
+    "numeric": "boundary",
+    "range": "boundary",
+    "obligation": "contradiction",
+    "claim": "inversion",
+    "cross_reference": "deletion",
+}
+
+# Fraction of obligations that are negative ("shall not")
+NEGATIVE_OBLIGATION_RATIO = 0.3
+# Fraction of claims that carry their own supporting evidence
+SUPPORTED_CLAIM_RATIO = 0.4
+# Mean number of obligations per distinct subject
+OBLIGATIONS_PER_SUBJECT = 8
+# Inversion looks for evidence this many lines around a claim
+CLAIM_CONTEXT_WINDOW = 3
+
+# Documents reuse a small set of round numbers ("30 days", "5 business days")
+COMMON_VALUES = (1, 2, 3, 5, 7, 10, 14, 15, 20, 24, 30, 45, 60, 90, 99, 120)
+
+UNITS = ("days", "hours", "minutes", "percent", "months", "weeks", "business days", "attempts")
+
+_GENERIC_WORDS = (
+    "account", "archive", "asset", "budget", "catalog", "channel", "client",
+    "component", "deliverable", "document", "facility", "invoice", "ledger",
+    "license", "notice", "outcome", "payment", "platform", "portal", "record",
+    "registry", "release", "report", "schedule", "service", "statement",
+    "storage", "system", "vendor", "workflow",
+)
+
+_SECTION_TOPICS = (
+    "Definitions", "Scope", "Fees", "Payment", "Delivery", "Acceptance",
+    "Support", "Security", "Audit", "Confidentiality", "Termination",
+    "Renewal", "Notices", "Escalation", "Reporting", "Records", "Transfer",
+    "Governance", "Exceptions", "Remedies",
+)
+
+_PARTIES = (
+    "Provider", "Customer", "Licensee", "Licensor", "Contractor", "Agency",
+    "Operator", "Supplier", "Subscriber", "Integrator",
+)
+
+_OBLIGATION_VERBS = ("maintain", "deliver", "publish", "retain", "review", "approve")
+_PROHIBITION_VERBS = ("transfer", "disclose", "modify", "suspend", "delete", "resell")
+
+
+def _pattern_for(phrase: str) -> re.Pattern:
+    """Compile the word-boundary pattern the strategies use for a phrase."""
+    return re.compile(r"\b" + re.escape(phrase) + r"\b", re.IGNORECASE)
+
+
+_MODIFIER_PATTERNS = [_pattern_for(m) for m in VAGUE_MODIFIERS]
+_CLAIM_PATTERNS = [_pattern_for(c) for c in CLAIM_INDICATORS]
+_MODAL_RE = re.compile(r"\b(shall|must)\b", re.IGNORECASE)
+
+
+def _is_clean(text: str) -> bool:
+    """True if ``text`` triggers no strategy, even right after a number."""
+    return not (
+        any(p.search(text) for p in _MODIFIER_PATTERNS)
+        or any(p.search(text) for p in _CLAIM_PATTERNS)
+        or EVIDENCE_KEYWORDS.search(text)
+        or _MODAL_RE.search(text)
+        or NUMERIC_PARAM_RE.search(f"1 {text}")
+        or RANGE_RE.search(text)
+        or re.search(r"\d", text)
+    )
+
+
+def _isolated(phrases: list[str], patterns: list[re.Pattern]) -> list[str]:
+    """Keep phrases that match exactly one catalog entry (themselves) and
+    are not evidence keywords, so one insertion yields one finding."""
+    return [
+        phrase for phrase in phrases
+        if sum(1 for p in patterns if p.search(phrase)) == 1
+        and not EVIDENCE_KEYWORDS.search(phrase)
+    ]
+
+
+SAFE_MODIFIERS = _isolated(VAGUE_MODIFIERS, _MODIFIER_PATTERNS)
+SAFE_CLAIMS = _isolated(CLAIM_INDICATORS, _CLAIM_PATTERNS)
+
+
+def _party_name(index: int) -> str:
+    """Return a distinct single-token party name for an index."""
+    base = _PARTIES[index % len(_PARTIES)]
+    suffix = ""
+    n = index // len(_PARTIES)
+    while n:
+        n, rem = divmod(n - 1, 26)
+        suffix = chr(ord("A") + rem) + suffix
+    return base + suffix
+
+
+def _unit_key(unit: str) -> str:
+    """Normalize a unit the way the contradiction strategy does."""
+    key = unit.lower().rstrip("s")
+    return "percent" if key in ("%", "percent") else key
+
+
+def generate_document(
+    preset: str = "contract",
+    lines: int = 1000,
+    seed: int = 0,
+    densities: dict[str, float] | None = None,
+    section_lines: int = DEFAULT_SECTION_LINES,
+) -> tuple[str, dict]:
+    """Generate a synthetic document and its ground truth.
+
+    Args:
+        preset: Preset name from mutadoc/presets/ (drives terminology and
+            strategy weights; disabled strategies get zero density).
+        lines: Exact number of lines in the document.
+        seed: Random seed; identical arguments give identical output.
+        densities: Overrides for DEFAULT_DENSITIES (before preset weights).
+        section_lines: Mean body lines per section (heading density).
+
+    Returns:
+        ``(markdown_text, ground_truth)`` where ground truth holds the
+        expected ``mutate`` finding counts per strategy.
+    """
+    config = _load_preset(preset)
+    if not config:
+        raise ValueError(f"Preset not found: {preset}")
+
+    rng = random.Random(seed)
+    weights = config.get("strategies", {})
+    rates = {**DEFAULT_DENSITIES, **(densities or {})}
+    for key, strategy in DENSITY_STRATEGY.items():
+        strat = weights.get(strategy, {"weight": 1.0, "enabled": True})
+        rates[key] = rates[key] * strat["weight"] if strat["enabled"] else 0.0
+
+    terms = [t for t in config.get("domain_terminology", []) if _is_clean(t)]
+    words = terms + [w for w in _GENERIC_WORDS if _is_clean(w)]
+
+    # --- Section plan ---
+    title = f"Synthetic {config.get('name', preset).replace('_', ' ').title()} Document"
+    preamble_lines = 3
+    body_budget = max(0, lines - preamble_lines)
+    section_sizes: list[int] = []
+    planned = 0
+    while planned < body_budget:
+        section_sizes.append(max(2, int(rng.expovariate(1 / section_lines)) + 2))
+        planned += section_sizes[-1] + 1  # body lines + heading
+    width = len(str(len(section_sizes)))
+    section_names = [
+        f"Section {i + 1:0{width}d} {rng.choice(_SECTION_TOPICS)}"
+        for i in range(len(section_sizes))
+    ]
+
+    n_obligation_subjects = max(
+        2, int(body_budget * rates["obligation"] / OBLIGATIONS_PER_SUBJECT)
+    )
+    subjects = [_party_name(i) for i in range(n_obligation_subjects)]
+
+    # --- Ledger ---
+    rendered: list[str] = []
+    modifier_lines = 0
+    numeric: list[tuple[str, str, str]] = []     # (value, unit_key, section)
+    ranges = 0
+    obligations: list[tuple[int, str, bool]] = []  # (line, subject, negative)
+    claims: list[tuple[int, bool]] = []            # (line, supported)
+    inbound_refs = [0] * len(section_sizes)
+
+    def body_line(section_idx: int, section_name: str) -> str:
+        nonlocal modifier_lines, ranges
+        line_no = len(rendered) + 1
+        parts = [f"The {rng.choice(words)} covers the {rng.choice(words)} for each {rng.choice(words)}."]
+        if rng.random() < rates["vague_modifier"]:
+            parts.append(f"The {rng.choice(words)} is managed on a {rng.choice(SAFE_MODIFIERS)} basis.")
+            modifier_lines += 1
+        if rng.random() < rates["numeric"]:
+            value = str(rng.choice(COMMON_VALUES))
+            unit = rng.choice(UNITS)
+            parts.append(f"Notice is given within {value} {unit}.")
+            numeric.append((value, _unit_key(unit), section_name))
+        if rng.random() < rates["range"]:
+            low, high = sorted(rng.sample(COMMON_VALUES, 2))
+            high = str(high)
+            unit = rng.choice(UNITS)
+            parts.append(f"The {rng.choice(words)} applies between {low} and {high} {unit}.")
+            numeric.append((high, _unit_key(unit), section_name))
+            ranges += 1
+        if rng.random() < rates["obligation"]:
+            subject = rng.choice(subjects)
+            if rng.random() < NEGATIVE_OBLIGATION_RATIO:
+                parts.append(f"{subject} shall not {rng.choice(_PROHIBITION_VERBS)} the {rng.choice(words)}.")
+                obligations.append((line_no, subject.lower(), True))
+            else:
+                parts.append(f"{subject} shall {rng.choice(_OBLIGATION_VERBS)} the {rng.choice(words)}.")
+                obligations.append((line_no, subject.lower(), False))
+        if rng.random() < rates["claim"]:
+            indicator = rng.choice(SAFE_CLAIMS)
+            claim = f"{indicator[0].upper()}{indicator[1:]} the {rng.choice(words)} remains stable"
+            if rng.random() < SUPPORTED_CLAIM_RATIO:
+                parts.append(f"{claim}, because the {rng.choice(words)} was verified.")
+                claims.append((line_no, True))
+            else:
+                parts.append(f"{claim}.")
+                claims.append((line_no, False))
+        if len(section_sizes) > 1 and rng.random() < rates["cross_reference"]:
+            target = rng.randrange(len(section_sizes) - 1)
+            if target >= section_idx:
+                target += 1
+            parts.append(f"See {section_names[target]} for the {rng.choice(words)} terms.")
+            inbound_refs[target] += 1
+        return " ".join(parts)
+
+    rendered.append(f"# {title}")
+    rendered.append("")
+    rendered.append(f"The {rng.choice(words)} covers the {rng.choice(words)} for each {rng.choice(words)}.")
+    for idx, (name, size) in enumerate(zip(section_names, section_sizes)):
+        if len(rendered) >= lines:
+            break
+        rendered.append(f"## {name}")
+        for _ in range(size):
+            if len(rendered) >= lines:
+                break
+            rendered.append(body_line(idx, name))
+    rendered = rendered[:lines]
+    while len(rendered) < lines:
+        rendered.append("")
+    written_sections = sum(1 for line in rendered if line.startswith("## "))
+
+    # --- Ground truth from the ledger ---
+    # Contradiction (numeric): distinct value pairs that share a unit across
+    # different sections (pairs are de-duplicated on values alone)
+    by_unit: dict[str, dict[str, set[str]]] = {}
+    for value, unit, section in numeric:
+        by_unit.setdefault(unit, {}).setdefault(value, set()).add(section)
+    value_pairs: set[tuple[str, str]] = set()
+    for values in by_unit.values():
+        ordered = sorted(values)
+        for i, a in enumerate(ordered):
+            for b in ordered[i + 1:]:
+                # Only a pair confined to one and the same section is exempt
+                if not (len(values[a]) == 1 and values[a] == values[b]):
+                    value_pairs.add((a, b))
+    # Contradiction (modal): every affirmative x negative pair per subject
+    modal_pairs = 0
+    by_subject: dict[str, tuple[list[int], list[int]]] = {}
+    for line_no, subject, negative in obligations:
+        pos, neg = by_subject.setdefault(subject, ([], []))
+        (neg if negative else pos).append(line_no)
+    for pos, neg in by_subject.values():
+        modal_pairs += len(pos) * len(neg) - len(set(pos) & set(neg))
+
+    # Inversion: unsupported claims with no supported claim nearby
+    supported_lines = sorted(line for line, supported in claims if supported)
+    supported_set = set(supported_lines)
+    inversions = sum(
+        1 for line, supported in claims
+        if not supported and not any(
+            (line + d) in supported_set
+            for d in range(-CLAIM_CONTEXT_WINDOW, CLAIM_CONTEXT_WINDOW + 1)
+        )
+    )
+
+    # Deletion: the title section plus every written section with 0 or >= 3
+    # inbound references (references to unwritten sections still count as
+    # text, but those sections have no heading to report)
+    deletion = 1 + sum(
+        1 for idx in range(written_sections)
+        if inbound_refs[idx] == 0 or inbound_refs[idx] >= 3
+    )
+
+    expected = {
+        "contradiction": len(value_pairs) + modal_pairs,
+        "ambiguity": modifier_lines,
+        "deletion": deletion,
+        "inversion": inversions,
+        "boundary": len(numeric) + ranges,
+    }
+    ground_truth = {
+        "preset": preset,
+        "seed": seed,
+        "lines": lines,
+        "sections": written_sections + 1,
+        "densities": rates,
+        "inserted": {
+            "vague_modifiers": modifier_lines,
+            "numeric_parameters": len(numeric),
+            "ranges": ranges,
+            "obligations": len(obligations),
+            "negative_obligations": sum(1 for _, _, neg in obligations if neg),
+            "claims": len(claims),
+            "supported_claims": len(supported_lines),
+            "cross_references": sum(inbound_refs),
+        },
+        "expected": {
+            "by_strategy": expected,
+            "total": sum(expected.values()),
+        },
+    }
+    return "\n".join(rendered), ground_truth
+
+
+def write_document(
+    path: Path,
+    preset: str = "contract",
+    lines: int = 1000,
+    seed: int = 0,
+    **kwargs,
+) -> dict:
+    """Write a generated document plus ``<path>.expected.json``; return ground truth."""
+    text, truth = generate_document(preset, lines, seed, **kwargs)
+    path.write_text(text, encoding="utf-8")
+    path.with_name(path.name + ".expected.json").write_text(
+        json.dumps(truth, indent=2) + "\n", encoding="utf-8"
+    )
+    return truth
+
+
+def verify(path: Path, truth: dict) -> dict:
+    """Run ``mutate`` on a generated document and compare against ground truth."""
+    from tools.mutate import mutate
+    result = json.loads(asyncio.run(mutate(str(path))))
+    actual = result["summary"]["by_strategy"]
+    expected = truth["expected"]["by_strategy"]
+    mismatches = {
+        s: {"expected": expected[s], "actual": actual.get(s, 0)}
+        for s in STRATEGIES
+        if expected[s] != actual.get(s, 0)
+    }
+    return {
+        "passed": not mismatches,
+        "mismatches": mismatches,
+        "elapsed_seconds": result["metadata"]["elapsed_seconds"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic MutaDoc document")
+    parser.add_argument("--preset", default="contract",
+                        choices=("contract", "api_spec", "academic_paper", "policy"))
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--section-lines", type=int, default=DEFAULT_SECTION_LINES)
+    for key, value in DEFAULT_DENSITIES.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=float, default=value,
+                            help=f"Per-line density before preset weighting (default: {value})")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--verify", action="store_true", help="Run mutate and compare counts")
+    args = parser.parse_args()
+
+    densities = {key: getattr(args, key) for key in DEFAULT_DENSITIES}
+    out = Path(args.out)
+    truth = write_document(out, args.preset, args.lines, args.seed,
+                           densities=densities, section_lines=args.section_lines)
+    report = {"document": str(out), "expected": truth["expected"]}
+    if args.verify:
+        report["verification"] = verify(out, truth)
+    print(json.dumps(report, indent=2))
+    return 0 if report.get("verification", {}).get("passed", True) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
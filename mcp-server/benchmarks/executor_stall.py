@@ -0,0 +1,109 @@
+"""Event-loop stall during a large ``mutate`` call: inline vs ToolExecutor.
+
+Runs one ``mutate`` call on a generated document while a ticker measures
+how late the event loop wakes up, and ``search`` calls are made every
+50 ms. First with the tool coroutine awaited directly, as the server did
+before ``tools/executor.py``, then through a ``ToolExecutor`` that routes
+``mutate`` to a worker process and ``search`` to a thread.
+
+Usage:
+    python benchmarks/executor_stall.py
+    python benchmarks/executor_stall.py --lines 5000
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import corpora
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.executor import ToolExecutor  # noqa: E402
+from tools.lazy import lazy_tool  # noqa: E402
+
+POLICIES = {
+    "mutate": {"pool": "process", "max_concurrent": 2, "timeout_seconds": 600},
+    "search": {"pool": "thread", "max_concurrent": 8, "timeout_seconds": 30},
+}
+TICK_SECONDS = 0.01
+PROBE_INTERVAL_SECONDS = 0.05
+
+
+async def _ticker(done: asyncio.Event) -> float:
+    """Largest delay past a scheduled wake-up, in ms."""
+    worst = 0.0
+    while not done.is_set():
+        expected = time.perf_counter() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        worst = max(worst, time.perf_counter() - expected)
+    return worst * 1000
+
+
+async def _prober(search, done: asyncio.Event) -> list[float]:
+    """Latencies of search calls issued while mutate runs, in ms."""
+    latencies = []
+    while not done.is_set():
+        start = time.perf_counter()
+        await search(query="token budget overflow in review tasks", top_k=5)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+    return latencies
+
+
+async def measure(mutate, search, doc: Path) -> dict:
+    done = asyncio.Event()
+    ticker = asyncio.ensure_future(_ticker(done))
+    prober = asyncio.ensure_future(_prober(search, done))
+    # Let the ticker and prober start before the long call
+    await asyncio.sleep(0.1)
+    start = time.perf_counter()
+    await mutate(target_path=str(doc))
+    elapsed = time.perf_counter() - start
+    done.set()
+    latencies = sorted(await prober)
+    return {
+        "mutate_s": elapsed,
+        "max_loop_lag_ms": await ticker,
+        "search_calls": len(latencies),
+        "search_max_ms": latencies[-1],
+    }
+
+
+def _row(label: str, result: dict) -> str:
+    return (
+        f"{label:<10} {result['mutate_s']:>9.2f}s {result['max_loop_lag_ms']:>12.1f} "
+        f"{result['search_calls']:>8} {result['search_max_ms']:>12.1f}"
+    )
+
+
+async def run(lines: int) -> None:
+    raw_mutate = lazy_tool("tools.mutate", "mutate")
+    raw_search = lazy_tool("tools.search", "search")
+    executor = ToolExecutor(POLICIES, preload=["tools.mutate"])
+    executor.prestart()
+    mutate = executor.wrap(raw_mutate, "mutate", "tools.mutate")
+    search = executor.wrap(raw_search, "search", "tools.search")
+    # Build the search index before timing
+    await raw_search(query="warm up")
+
+    with tempfile.TemporaryDirectory(prefix="cq-exec-") as tmp:
+        doc, _ = corpora.write_document(Path(tmp), lines)
+        print(f"{'mode':<10} {'mutate':>10} {'loop lag ms':>12} {'searches':>8} {'search max ms':>12}")
+        print(_row("inline", await measure(raw_mutate, raw_search, doc)))
+        print(_row("executor", await measure(mutate, search, doc)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--lines", type=int, default=5000, help="Lines in the mutated document")
+    args = parser.parse_args()
+    asyncio.run(run(args.lines))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
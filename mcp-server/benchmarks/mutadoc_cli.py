@@ -0,0 +1,195 @@
+"""MutaDoc CLI benchmark: ``mutadoc.sh`` vs ``python -m mutadoc``.
+
+Generates preset-shaped documents at each size (see ``corpora.py``) and
+times a full ``test`` run of each CLI as a fresh process, the way a user
+or a hook invokes it. A final multi-file run compares the shell script
+looped over all documents with one Python invocation testing them in
+parallel worker processes.
+
+Before timing, both CLIs run ``quick`` and ``test`` on the MutaDoc test
+fixtures with their presets, and the run fails unless they agree on:
+- Exit code and reported persona (a preset's ``default_persona``)
+- Finding counts per strategy and severity, except Inversion: the engine
+  checks its own claim-indicator catalog
+- Kill score, for ``quick`` runs. The Python CLI reports the engine's
+  kill score, so the shell's is recomputed from its findings (see
+  ``shell_kill_score``); ``test`` runs only print both, since the shell's
+  denominator also counts probes that produced no finding.
+
+Usage:
+    python benchmarks/mutadoc_cli.py
+    python benchmarks/mutadoc_cli.py --lines 100 500 2000 --files 8 --jobs 4
+
+The shell script is slow on large documents; ``--max-bash-lines`` skips
+it above that size.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import corpora
+
+CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
+MUTADOC_SH = CQ_ENGINE_ROOT / "mutadoc" / "mutadoc.sh"
+FIXTURES = CQ_ENGINE_ROOT / "mutadoc" / "test_fixtures"
+
+# (command, fixture, preset) runs the two CLIs must agree on
+PARITY_RUNS = [
+    (command, fixture, preset)
+    for fixture, preset in (
+        ("specs/sample_api_spec.md", "api_spec"),
+        ("papers/sample_paper.md", "academic_paper"),
+        ("contracts/sample_contract.md", "contract"),
+    )
+    for command in ("quick", "test")
+]
+
+# Strategies whose findings are not compared (different catalogs by design)
+UNCOMPARED_STRATEGIES = {"Inversion"}
+
+
+def _time(cmd: list[str]) -> float:
+    """Run ``cmd`` from the repository root; return wall time in seconds."""
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=CQ_ENGINE_ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode not in (0, 1):
+        raise RuntimeError(f"{' '.join(cmd[:3])} failed: {proc.stderr.strip()[-300:]}")
+    return elapsed
+
+
+def bash_cmd(paths: list[Path]) -> list[str]:
+    if len(paths) == 1:
+        return ["bash", str(MUTADOC_SH), "test", str(paths[0]), "--format", "json"]
+    # The shell script takes one document per run
+    loop = "; ".join(
+        f"bash '{MUTADOC_SH}' test '{p}' --format json" for p in paths
+    )
+    return ["bash", "-c", f"{loop}; true"]
+
+
+def python_cmd(paths: list[Path], jobs: int = 0) -> list[str]:
+    return [sys.executable, "-m", "mutadoc", "test", *map(str, paths),
+            "--format", "json", "--jobs", str(jobs)]
+
+
+def _run_json(cmd: list[str]) -> tuple[int, dict]:
+    """Run a CLI with ``--format json``; return (exit code, report)."""
+    proc = subprocess.run(cmd, cwd=CQ_ENGINE_ROOT, capture_output=True, text=True)
+    try:
+        report = json.loads(proc.stdout)
+    except ValueError:
+        report = {}
+    return proc.returncode, report if isinstance(report, dict) else {}
+
+
+def _finding_counts(report: dict) -> dict[str, int]:
+    """Count findings per ``Strategy/Severity``, skipping uncompared strategies."""
+    counts: dict[str, int] = {}
+    for f in report.get("findings", []):
+        if f.get("strategy") in UNCOMPARED_STRATEGIES:
+            continue
+        key = f"{f.get('strategy')}/{f.get('severity')}"
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def shell_kill_score(report: dict) -> int:
+    """Kill score of a ``quick`` report under mutadoc.sh semantics.
+
+    In the shell script every ambiguity finding is one applied mutation,
+    and Critical and Major findings (including persona escalations) count
+    as killed, rounded down to a whole percent.
+    """
+    findings = report.get("findings", [])
+    if not findings:
+        return 0
+    killed = sum(1 for f in findings if f.get("severity") in ("Critical", "Major"))
+    return killed * 100 // len(findings)
+
+
+def check_parity() -> list[str]:
+    """Mismatches between the two CLIs on ``PARITY_RUNS``."""
+    mismatches = []
+    for command, fixture, preset in PARITY_RUNS:
+        args = [command, str(FIXTURES / fixture), "--preset", preset, "--format", "json"]
+        bash_exit, bash = _run_json(["bash", str(MUTADOC_SH), *args])
+        python_exit, python = _run_json([sys.executable, "-m", "mutadoc", *args])
+        bash_score = bash.get("score", {}).get("kill_score")
+        python_score = python.get("score", {}).get("kill_score")
+
+        problems = []
+        if bash_exit != python_exit:
+            problems.append(f"exit sh={bash_exit} py={python_exit}")
+        personas = [r.get("metadata", {}).get("persona", "?") for r in (bash, python)]
+        if personas[0] != personas[1]:
+            problems.append(f"persona sh={personas[0]} py={personas[1]}")
+        bash_counts, python_counts = _finding_counts(bash), _finding_counts(python)
+        if bash_counts != python_counts:
+            problems.append(f"findings sh={bash_counts} py={python_counts}")
+        if command == "quick" and bash_score != shell_kill_score(python):
+            problems.append(f"kill score sh={bash_score} py={shell_kill_score(python)} (shell semantics)")
+
+        status = "ok" if not problems else "MISMATCH"
+        print(f"{command} {fixture} --preset {preset}: exit={python_exit} persona={personas[1]} "
+              f"findings={sum(python_counts.values())} kill score sh={bash_score} py={python_score} {status}")
+        mismatches += [f"{command} {fixture}: {p}" for p in problems]
+    return mismatches
+
+
+def _row(label: str, bash_s: float | None, python_s: float) -> str:
+    if bash_s is None:
+        return f"{label:<28} {'skipped':>10} {python_s:>9.3f}s {'-':>9}"
+    return f"{label:<28} {bash_s:>9.3f}s {python_s:>9.3f}s {bash_s / python_s:>8.1f}x"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[100, 500, 2000],
+                        help="Document sizes in lines")
+    parser.add_argument("--files", type=int, default=8, help="Documents in the multi-file run")
+    parser.add_argument("--file-lines", type=int, default=200, help="Lines per document in the multi-file run")
+    parser.add_argument("--jobs", type=int, default=0, help="Python worker processes (default: one per CPU)")
+    parser.add_argument("--max-bash-lines", type=int, default=2000,
+                        help="Skip the shell script for larger documents")
+    args = parser.parse_args()
+
+    mismatches = check_parity()
+    if mismatches:
+        for mismatch in mismatches:
+            print(f"  {mismatch}", file=sys.stderr)
+        print(f"FAIL: CLIs disagree on {len(mismatches)} checks", file=sys.stderr)
+        return 1
+
+    print()
+    print(f"{'run':<28} {'mutadoc.sh':>10} {'python':>10} {'speedup':>9}")
+    try:
+        with tempfile.TemporaryDirectory(prefix="cq-mutadoc-") as tmp:
+            directory = Path(tmp)
+            for lines in args.lines:
+                path, _ = corpora.write_document(directory, lines)
+                bash_s = _time(bash_cmd([path])) if lines <= args.max_bash_lines else None
+                print(_row(f"test, {lines} lines", bash_s, _time(python_cmd([path]))))
+
+            multi = directory / "multi"
+            multi.mkdir()
+            paths = [
+                corpora.write_document(multi, args.file_lines, seed=seed)[0].rename(multi / f"doc_{seed}.md")
+                for seed in range(args.files)
+            ]
+            bash_s = _time(bash_cmd(paths)) if args.file_lines <= args.max_bash_lines else None
+            label = f"test, {args.files} x {args.file_lines} lines"
+            print(_row(label, bash_s, _time(python_cmd(paths, args.jobs))))
+    except RuntimeError as e:
+        print(f"FAIL: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
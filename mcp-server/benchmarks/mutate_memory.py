@@ -0,0 +1,143 @@
+"""Peak memory of ``mutate`` on large documents: read_text vs mmap.
+
+Generates documents of each size: a preset-shaped document (see
+``corpora.py``) followed by a long appendix of plain records with no
+findings, the shape of an exported policy or contract dump. Each size is
+then mutation-tested with all strategies in a fresh process, once from
+text (``read_text``, as before ``tools/document.py``) and once from a
+``MappedDocument``. Peak RSS is reported as is and as growth over the
+interpreter at startup, relative to the file size. The two runs must
+produce identical findings.
+
+Usage:
+    python benchmarks/mutate_memory.py
+    python benchmarks/mutate_memory.py --sizes 10 100 --max-text-mb 100
+
+Sizes are in MB. Reading a 1 GB file as text needs several GB of memory,
+so ``--max-text-mb`` skips the text run above that size.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import corpora
+
+MCP_SERVER_DIR = Path(__file__).resolve().parent.parent
+MB = 1024 * 1024
+
+# Appendix words: no vague modifiers, claim indicators, modal verbs or digits
+_FILLER_WORDS = (
+    "record entry field ledger archive export column row batch owner "
+    "status summary region branch office ticket queue channel folder "
+    "label origin target holder vendor invoice carrier route station"
+).split()
+
+
+def write_large_document(path: Path, size_mb: int, seed: int = 0) -> Path:
+    """Write a ~``size_mb`` MB document: a preset-shaped head and a plain appendix."""
+    head_path, _ = corpora.write_document(path.parent, 500, seed=seed)
+    head = head_path.read_text(encoding="utf-8")
+    head_path.unlink()
+    rng = random.Random(seed)
+    block = "".join(
+        " ".join(rng.choice(_FILLER_WORDS) for _ in range(rng.randint(6, 14))) + ".\n"
+        for _ in range(20000)
+    ).encode("utf-8")
+    target = size_mb * MB
+    with open(path, "wb") as f:
+        f.write(head.encode("utf-8"))
+        f.write(b"\n## Appendix: Archived Records\n\n")
+        written = f.tell()
+        while written < target:
+            chunk = block[:target - written]
+            f.write(chunk)
+            written += len(chunk)
+    return path
+
+
+def _worker(mode: str, path: str) -> None:
+    """Run all strategies over ``path``; print peak RSS and a findings digest."""
+    sys.path.insert(0, str(MCP_SERVER_DIR))
+    from tools.document import MappedDocument
+    from tools.mutate import run_mutations
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "text":
+        content = Path(path).read_text(encoding="utf-8")
+        run = run_mutations(content)
+    else:
+        with MappedDocument(path) as doc:
+            run = run_mutations(doc)
+    elapsed = time.perf_counter() - start
+    digest = hashlib.sha256(json.dumps(run["mutations"], sort_keys=True).encode()).hexdigest()
+    print(json.dumps({
+        "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "startup_mb": baseline_kb / 1024,
+        "seconds": elapsed,
+        "mutations": len(run["mutations"]),
+        "digest": digest,
+    }))
+
+
+def measure(mode: str, path: Path) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", mode, str(path)],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} run failed: {proc.stderr.strip()[-300:]}")
+    return json.loads(proc.stdout)
+
+
+def _row(size_mb: int, mode: str, result: dict | None) -> str:
+    if result is None:
+        return f"{size_mb:>6} MB {mode:<6} {'skipped':>10}"
+    growth = result["peak_mb"] - result["startup_mb"]
+    return (
+        f"{size_mb:>6} MB {mode:<6} {result['peak_mb']:>8.1f} MB {growth:>8.1f} MB "
+        f"{growth / size_mb:>7.2f}x {result['seconds']:>8.1f}s {result['mutations']:>9}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Document sizes in MB")
+    parser.add_argument("--max-text-mb", type=int, default=200,
+                        help="Skip the read_text run for larger documents")
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(*args.worker)
+        return 0
+
+    print(f"{'size':>9} {'mode':<6} {'peak RSS':>11} {'growth':>11} {'/size':>8} {'time':>9} {'findings':>9}")
+    try:
+        with tempfile.TemporaryDirectory(prefix="cq-mutate-mem-") as tmp:
+            for size_mb in args.sizes:
+                path = write_large_document(Path(tmp) / f"dump_{size_mb}mb.md", size_mb)
+                text = measure("text", path) if size_mb <= args.max_text_mb else None
+                mapped = measure("mmap", path)
+                print(_row(size_mb, "text", text))
+                print(_row(size_mb, "mmap", mapped))
+                if text is not None and text["digest"] != mapped["digest"]:
+                    raise RuntimeError(f"{size_mb} MB: mmap findings differ from read_text")
+                path.unlink()
+    except RuntimeError as e:
+        print(f"FAIL: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
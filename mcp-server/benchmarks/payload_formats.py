@@ -0,0 +1,100 @@
+"""Payload size and serialization time per tool and response format.
+
+Calls each tool once on synthetic corpora (see ``corpora.py``), then
+re-serializes its result in every ``response_format`` and reports the
+payload bytes, the size relative to ``pretty``, and the median time to
+serialize (minimizer included). Compact and minimal output use orjson
+when it is installed; the backend in use is printed first.
+
+Usage:
+    python benchmarks/payload_formats.py
+    python benchmarks/payload_formats.py --lines 10000 --files 5000 --repeats 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import corpora
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools import cqlint_tool, decompose, facts, gate, learn, mutate, persona, search  # noqa: E402
+from tools.response import RESPONSE_FORMATS, json_backend, render  # noqa: E402
+
+
+def _calls(tmp: Path, args) -> list[tuple[str, object, object]]:
+    """(tool name, coroutine, minimizer) for every tool."""
+    doc, _ = corpora.write_document(tmp, args.lines)
+    corpus = tmp / "corpus"
+    corpus.mkdir()
+    for seed in range(args.docs):
+        corpora.write_document(corpus, 200, seed=seed)[0].rename(corpus / f"doc_{seed}.md")
+    facts._INDEX = facts.FactIndex(tmp / "facts.db")
+    learn.LEARNED_BASE = tmp / "learned"
+    corpora.write_learned_store(learn.LEARNED_BASE / "global.jsonl", 1000)
+    text = corpora.make_task_description(args.words)
+    persona_dir = str(corpora.CQ_ENGINE_ROOT / "mutadoc" / "personas")
+    return [
+        ("mutate", mutate.mutate(str(doc)), mutate._minimal),
+        ("conflicts", facts.conflicts(str(corpus / "doc_0.md"), str(corpus)), facts._minimal),
+        ("decompose", decompose.decompose(text, budget=2000, max_subtasks=16), decompose._minimal),
+        ("gate", gate.gate("Fix the session token refresh in the auth api handler",
+                           corpora.make_file_list(args.files)), gate._minimal),
+        ("persona", persona.persona(text, custom_persona_dir=persona_dir), None),
+        ("persona_batch", persona.persona_batch(corpora.make_subtasks(args.tasks),
+                                                custom_persona_dir=persona_dir), persona._minimal_batch),
+        ("search", search.search("token budget overflow in review tasks", top_k=10), search._minimal),
+        ("learn", learn.learn("context gate filtering reduced token budget overflow", "optimization"), None),
+        ("cqlint", cqlint_tool.cqlint(str(corpora.write_lint_tree(tmp / "lint", 20))), cqlint_tool._minimal),
+    ]
+
+
+def _time_render(payload: dict, response_format: str, minimal, ensure_ascii: bool, repeats: int) -> float:
+    """Median render time in microseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        render(payload, response_format, minimal, ensure_ascii=ensure_ascii)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6
+
+
+def run(args) -> None:
+    print(f"JSON backend for compact/minimal: {json_backend()}")
+    print(f"{'tool':<14} {'format':<8} {'bytes':>10} {'vs pretty':>10} {'serialize µs':>13}")
+    with tempfile.TemporaryDirectory(prefix="cq-payload-") as tmp:
+        for name, call, minimal in _calls(Path(tmp), args):
+            payload = json.loads(asyncio.run(call))
+            if "error" in payload:
+                print(f"{name:<14} error: {payload['error']}")
+                continue
+            ensure_ascii = name != "learn"
+            pretty_bytes = None
+            for response_format in RESPONSE_FORMATS:
+                size = len(render(payload, response_format, minimal, ensure_ascii=ensure_ascii).encode("utf-8"))
+                pretty_bytes = pretty_bytes or size
+                micros = _time_render(payload, response_format, minimal, ensure_ascii, args.repeats)
+                print(f"{name:<14} {response_format:<8} {size:>10} {size / pretty_bytes:>9.0%} {micros:>13.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--lines", type=int, default=2000, help="Lines in the mutated document")
+    parser.add_argument("--docs", type=int, default=50, help="Documents in the conflicts corpus")
+    parser.add_argument("--words", type=int, default=2000, help="Words in the decompose/persona task")
+    parser.add_argument("--files", type=int, default=1000, help="Files offered to gate")
+    parser.add_argument("--tasks", type=int, default=100, help="Tasks in the persona_batch call")
+    parser.add_argument("--repeats", type=int, default=20, help="Serializations timed per format")
+    args = parser.parse_args()
+    run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
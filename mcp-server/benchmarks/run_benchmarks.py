@@ -0,0 +1,441 @@
+"""Performance benchmark harness for the CQ Engine MCP tools and resources.
+
+Runs every tool (decompose, gate, persona, cqlint, mutate, learn, search,
+conflicts, thinktank, benchmark), every
+resource (patterns, learned, health) and the wave scheduler over synthetic
+corpora at several scales, and records per case:
+
+- latency percentiles (p50/p95/p99, min, max, mean) over repeated calls
+- peak RSS of the isolated worker process
+- peak Python allocations (tracemalloc) for a single call
+
+Each case runs in its own forked process, so peak RSS is per case and a
+runaway case can be killed by the timeout without affecting the rest.
+
+Baselines are stored as JSON under benchmarks/baselines/<profile>.json.
+When a baseline exists, the run fails (exit code 1) if any case's latency
+or allocation peak exceeds the baseline by more than --threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py --profile quick
+    python benchmarks/run_benchmarks.py --profile standard --update-baseline
+    python benchmarks/run_benchmarks.py --profile full --only mutate,gate --threshold 0.3
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+import corpora  # noqa: E402
+
+BASELINE_DIR = BENCH_DIR / "baselines"
+
+# Scale profiles: corpus sizes per dimension
+PROFILES: dict[str, dict[str, list[int]]] = {
+    "quick": {
+        "doc_lines": [100, 1_000],
+        "task_words": [50, 500],
+        "file_count": [100, 1_000],
+        "learned_entries": [1_000, 10_000],
+        "lint_files": [5],
+        "telemetry_events": [1_000],
+        "subtasks": [100, 1_000],
+        "corpus_docs": [20, 100],
+    },
+    "standard": {
+        "doc_lines": [100, 1_000, 10_000],
+        "task_words": [50, 500, 5_000],
+        "file_count": [100, 1_000, 10_000],
+        "learned_entries": [1_000, 10_000, 100_000],
+        "lint_files": [5, 50],
+        "telemetry_events": [10_000],
+        "subtasks": [100, 1_000, 10_000],
+        "corpus_docs": [100, 500],
+    },
+    "full": {
+        "doc_lines": [100, 1_000, 10_000, 100_000],
+        "task_words": [50, 500, 5_000, 50_000],
+        "file_count": [100, 1_000, 10_000, 100_000],
+        "learned_entries": [1_000, 10_000, 100_000, 1_000_000],
+        "lint_files": [5, 50, 500],
+        "telemetry_events": [10_000, 100_000],
+        "subtasks": [100, 1_000, 10_000, 100_000],
+        "corpus_docs": [100, 500, 2_000],
+    },
+}
+
+# Calls slower than this are only repeated MIN_REPEATS times
+SLOW_CALL_SECONDS = 1.0
+MIN_REPEATS = 2
+# Differences below this are treated as noise regardless of threshold
+NOISE_FLOOR_MS = 2.0
+
+
+# ============================================================
+# Case setup — each returns a zero-argument callable to time
+# ============================================================
+def _setup_decompose(tmp: Path, words: int):
+    from tools.decompose import decompose
+    text = corpora.make_task_description(words)
+    return lambda: decompose(text, budget=50000, max_subtasks=8)
+
+
+def _setup_gate(tmp: Path, count: int):
+    from tools.gate import gate
+    files = corpora.make_file_list(count)
+    return lambda: gate("Fix the session token refresh in the auth api handler", files)
+
+
+def _setup_persona(tmp: Path, words: int):
+    from tools.persona import persona
+    text = corpora.make_task_description(words)
+    persona_dir = str(corpora.CQ_ENGINE_ROOT / "mutadoc" / "personas")
+    return lambda: persona(text, custom_persona_dir=persona_dir)
+
+
+def _setup_cqlint(tmp: Path, count: int):
+    from tools.cqlint_tool import cqlint
+    target = corpora.write_lint_tree(tmp / "lint", count)
+    return lambda: cqlint(str(target), output_format="json")
+
+
+def _setup_mutate(tmp: Path, lines: int):
+    from tools.mutate import mutate
+    doc, truth = corpora.write_document(tmp, lines)
+    expected = truth["expected"]["by_strategy"]
+
+    async def run() -> str:
+        result = await mutate(str(doc))
+        # Correctness is checked on every timed call: a faster but wrong
+        # engine must not produce a passing baseline
+        actual = json.loads(result)["summary"]["by_strategy"]
+        if any(actual.get(s, 0) != n for s, n in expected.items()):
+            raise AssertionError(f"mutate findings {actual} != ground truth {expected}")
+        return result
+    return run
+
+
+def _setup_mutate_incremental(tmp: Path, lines: int):
+    from tools.mutate import mutate
+    doc, truth = corpora.write_document(tmp, lines)
+    expected = truth["expected"]["by_strategy"]
+    original = doc.read_text(encoding="utf-8").split("\n")
+    middle = len(original) // 2
+    asyncio.run(mutate(str(doc), incremental=True))
+    edits = 0
+
+    async def run() -> str:
+        # One-line edit per call that adds no findings, so the ground truth holds
+        nonlocal edits
+        edits += 1
+        edited = original[:]
+        edited[middle] += " (edited)" * (edits % 2)
+        doc.write_text("\n".join(edited), encoding="utf-8")
+        result = await mutate(str(doc), incremental=True)
+        actual = json.loads(result)["summary"]["by_strategy"]
+        if any(actual.get(s, 0) != n for s, n in expected.items()):
+            raise AssertionError(f"mutate findings {actual} != ground truth {expected}")
+        return result
+    return run
+
+
+def _setup_thinktank(tmp: Path, lines: int):
+    from tools.thinktank import thinktank
+    doc, _ = corpora.write_document(tmp, lines)
+    return lambda: thinktank(str(doc))
+
+
+def _setup_learn(tmp: Path, entries: int):
+    from tools import learn as learn_module
+    learn_module.LEARNED_BASE = tmp / "learned"
+    corpora.write_learned_store(learn_module.LEARNED_BASE / "global.jsonl", entries)
+    return lambda: learn_module.learn(
+        "context gate filtering reduced token budget overflow in review tasks",
+        "optimization",
+    )
+
+
+def _setup_search(tmp: Path, _scale: int):
+    from tools.search import search, warm_index
+    warm_index()
+    return lambda: search("token budget overflow in review tasks", top_k=5)
+
+
+def _setup_conflicts(tmp: Path, docs: int):
+    from tools import facts as facts_module
+    corpus = tmp / "corpus"
+    corpus.mkdir()
+    for seed in range(docs):
+        corpora.write_document(corpus, 200, seed=seed)[0].rename(corpus / f"doc_{seed}.md")
+    facts_module._INDEX = facts_module.FactIndex(tmp / "facts.db")
+    # Initial build is excluded; timed calls measure the steady state
+    # (stat every file, re-extract none, query the target's buckets)
+    facts_module._INDEX.update(corpus)
+    return lambda: facts_module.conflicts(str(corpus / "doc_0.md"), str(corpus))
+
+
+def _setup_benchmark(tmp: Path, docs: int):
+    from telemetry.collector import TelemetryCollector
+    from tools import benchmark as benchmark_module, learn as learn_module
+    project = tmp / "project"
+    (project / "docs").mkdir(parents=True)
+    for seed in range(docs):
+        corpora.write_document(project / "docs", 200, seed=seed)[0].rename(project / "docs" / f"doc_{seed}.md")
+    corpora.write_lint_tree(project / "agents", 20)
+    benchmark_module._INDEX = benchmark_module.BenchmarkIndex(tmp / "benchmark.db")
+    benchmark_module._TELEMETRY = TelemetryCollector(str(corpora.write_telemetry(tmp / "telemetry", 1_000)))
+    learn_module.LEARNED_BASE = tmp / "learned"
+    corpora.write_learned_store(learn_module.LEARNED_BASE / "global.jsonl", 1_000)
+    # The first (cold) pass is excluded; timed calls measure the steady
+    # state (stat every file, re-analyze none)
+    benchmark_module.assess(project, record=False)
+    return lambda: benchmark_module.benchmark(str(project), record=False)
+
+
+def _setup_patterns(tmp: Path, _scale: int):
+    from resources.patterns import patterns_catalog
+    return patterns_catalog
+
+
+def _setup_learned(tmp: Path, entries: int):
+    from resources import learned as learned_module
+    learned_module.LEARNED_DIR = tmp / "learned"
+    corpora.write_learned_store(learned_module.LEARNED_DIR / "global.jsonl", entries)
+    return learned_module.learned_entries
+
+
+def _setup_health(tmp: Path, events: int):
+    from telemetry.collector import TelemetryCollector
+    storage = corpora.write_telemetry(tmp / "telemetry", events)
+
+    def health() -> str:
+        # Fresh collector per call, as each server process would have
+        collector = TelemetryCollector(str(storage))
+        return json.dumps({
+            "weekly_summary": collector.get_weekly_summary(),
+            "pattern_usage": collector.get_pattern_usage(),
+            "sessions": collector.get_session_summary(),
+        })
+    return health
+
+
+def _setup_scheduler(tmp: Path, count: int):
+    from scheduler import StubExecutor, WaveScheduler
+    subtasks = corpora.make_subtasks(count)
+
+    def run():
+        # Zero-delay stub: measures scheduling overhead, not execution
+        scheduler = WaveScheduler(StubExecutor(), max_concurrency=32, token_budget=200000)
+        return scheduler.run(subtasks)
+    return run
+
+
+# (case name, scale dimension, setup function)
+CASES = [
+    ("decompose", "task_words", _setup_decompose),
+    ("gate", "file_count", _setup_gate),
+    ("persona", "task_words", _setup_persona),
+    ("cqlint", "lint_files", _setup_cqlint),
+    ("mutate", "doc_lines", _setup_mutate),
+    ("mutate_incremental", "doc_lines", _setup_mutate_incremental),
+    ("thinktank", "doc_lines", _setup_thinktank),
+    ("learn", "learned_entries", _setup_learn),
+    ("search", None, _setup_search),
+    ("conflicts", "corpus_docs", _setup_conflicts),
+    ("benchmark", "corpus_docs", _setup_benchmark),
+    ("resource_patterns", None, _setup_patterns),
+    ("resource_learned", "learned_entries", _setup_learned),
+    ("resource_health", "telemetry_events", _setup_health),
+    ("scheduler", "subtasks", _setup_scheduler),
+]
+
+
+# ============================================================
+# Measurement
+# ============================================================
+def _call(loop: asyncio.AbstractEventLoop, fn):
+    """Invoke a case callable, driving coroutines on the given loop."""
+    result = fn()
+    if inspect.isawaitable(result):
+        result = loop.run_until_complete(result)
+    return result
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def _run_case(setup, scale: int, repeats: int, conn) -> None:
+    """Worker process body: set up, time, trace allocations, report."""
+    try:
+        loop = asyncio.new_event_loop()
+        with tempfile.TemporaryDirectory(prefix="cq-bench-") as tmp:
+            fn = setup(Path(tmp), scale)
+            _call(loop, fn)  # warm-up (imports, caches, first-run effects)
+
+            timings: list[float] = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                _call(loop, fn)
+                timings.append((time.perf_counter() - t0) * 1000)
+                if len(timings) >= MIN_REPEATS and sum(timings) / 1000 > SLOW_CALL_SECONDS * MIN_REPEATS:
+                    break
+
+            tracemalloc.start()
+            _call(loop, fn)
+            _, peak_alloc = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        timings.sort()
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        rss_unit = 1 if platform.system() == "Darwin" else 1024
+        conn.send({
+            "runs": len(timings),
+            "p50_ms": round(_percentile(timings, 50), 3),
+            "p95_ms": round(_percentile(timings, 95), 3),
+            "p99_ms": round(_percentile(timings, 99), 3),
+            "min_ms": round(timings[0], 3),
+            "max_ms": round(timings[-1], 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * rss_unit,
+            "peak_alloc_bytes": peak_alloc,
+        })
+    except Exception as exc:
+        conn.send({"error": f"{type(exc).__name__}: {exc}"})
+    finally:
+        conn.close()
+
+
+def run_case(setup, scale: int, repeats: int, timeout: float) -> dict:
+    """Run one case in an isolated process and return its measurements."""
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_case, args=(setup, scale, repeats, child_conn))
+    proc.start()
+    child_conn.close()
+    if parent_conn.poll(timeout):
+        result = parent_conn.recv()
+    else:
+        proc.kill()
+        result = {"error": f"timed out after {timeout:g}s"}
+    proc.join()
+    return result
+
+
+# ============================================================
+# Baseline comparison
+# ============================================================
+def compare(results: dict, baseline: dict, threshold: float, metric: str) -> list[dict]:
+    """Return regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for case_id, current in results.items():
+        base = baseline.get(case_id)
+        if not base or "error" in base:
+            continue
+        if "error" in current:
+            regressions.append({"case": case_id, "reason": current["error"]})
+            continue
+        cur_ms, base_ms = current[metric], base[metric]
+        if cur_ms > base_ms * (1 + threshold) and cur_ms - base_ms > NOISE_FLOOR_MS:
+            regressions.append({
+                "case": case_id,
+                "reason": f"{metric} {base_ms:.2f}ms -> {cur_ms:.2f}ms "
+                          f"(+{(cur_ms / base_ms - 1) * 100:.0f}%)",
+            })
+        cur_alloc, base_alloc = current["peak_alloc_bytes"], base["peak_alloc_bytes"]
+        if base_alloc and cur_alloc > base_alloc * (1 + threshold):
+            regressions.append({
+                "case": case_id,
+                "reason": f"peak_alloc {base_alloc} -> {cur_alloc} bytes "
+                          f"(+{(cur_alloc / base_alloc - 1) * 100:.0f}%)",
+            })
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CQ Engine MCP performance benchmarks")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--only", default="", help="Comma-separated case names to run")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Per-case timeout (seconds)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative regression vs. baseline (0.25 = +25%%)")
+    parser.add_argument("--metric", choices=("p50_ms", "p95_ms", "mean_ms"), default="p50_ms")
+    parser.add_argument("--baseline", default="", help="Baseline JSON path (default: baselines/<profile>.json)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", default="", help="Write full results JSON to this path")
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    only = {c.strip() for c in args.only.split(",") if c.strip()}
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_DIR / f"{args.profile}.json"
+
+    results: dict[str, dict] = {}
+    for name, dimension, setup in CASES:
+        if only and name not in only:
+            continue
+        scales = profile[dimension] if dimension else [0]
+        for scale in scales:
+            case_id = f"{name}/{dimension}={scale}" if dimension else name
+            result = run_case(setup, scale, args.repeats, args.timeout)
+            results[case_id] = result
+            if "error" in result:
+                print(f"{case_id:42s} ERROR {result['error']}", file=sys.stderr)
+            else:
+                print(
+                    f"{case_id:42s} p50={result['p50_ms']:>10.2f}ms "
+                    f"p95={result['p95_ms']:>10.2f}ms "
+                    f"rss={result['peak_rss_bytes'] / 2**20:>7.1f}MiB "
+                    f"alloc={result['peak_alloc_bytes'] / 2**20:>7.1f}MiB",
+                    file=sys.stderr,
+                )
+
+    report = {
+        "profile": args.profile,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    regressions: list[dict] = []
+    if args.update_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        existing = {}
+        if baseline_path.exists():
+            existing = json.loads(baseline_path.read_text(encoding="utf-8")).get("results", {})
+        report_to_store = dict(report, results={**existing, **results})
+        baseline_path.write_text(json.dumps(report_to_store, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline.get("results", {}), args.threshold, args.metric)
+        report["regressions"] = regressions
+        report["threshold"] = args.threshold
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    for reg in regressions:
+        print(f"REGRESSION {reg['case']}: {reg['reason']}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
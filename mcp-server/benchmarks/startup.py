@@ -0,0 +1,118 @@
+"""Startup benchmark: time-to-first-response of a fresh server process.
+
+Every Claude Code session spawns its own server, so this is latency every
+session pays. Each run starts ``server.py`` over stdio and measures:
+
+- ``initialize_ms``: spawn until the reply to ``initialize``
+- ``tools_list_ms``: spawn until the reply to ``tools/list``
+- ``first_call_ms``: spawn until the reply to a first ``tools/call``
+  (which is where lazily loaded tool modules are imported)
+
+Usage:
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --runs 10 --no-warm-load   # CQ_ENGINE_WARM_LOAD=0
+
+Exits non-zero if the server fails to answer.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SERVER = Path(__file__).resolve().parent.parent / "server.py"
+
+FIRST_CALL = {
+    "name": "decompose",
+    "arguments": {"task_description": "Refactor the auth module, then update its tests."},
+}
+
+
+def _request(proc: subprocess.Popen, msg_id: int | None, method: str, params: dict) -> None:
+    message = {"jsonrpc": "2.0", "method": method, "params": params}
+    if msg_id is not None:
+        message["id"] = msg_id
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+
+def _reply(proc: subprocess.Popen, msg_id: int) -> dict:
+    """Read stdout until the response with ``msg_id`` arrives."""
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"server exited: {proc.stderr.read()[-500:]}")
+        message = json.loads(line)
+        if message.get("id") == msg_id:
+            if "error" in message:
+                raise RuntimeError(f"server error: {message['error']}")
+            return message
+
+
+def run_once(warm_load: bool, home: str) -> dict:
+    """Start one server process and time its first three replies."""
+    env = dict(os.environ, HOME=home, CQ_ENGINE_WARM_LOAD="1" if warm_load else "0")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(SERVER)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, env=env, cwd=str(SERVER.parent),
+    )
+    try:
+        _request(proc, 1, "initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "cq-startup-benchmark", "version": "0"},
+        })
+        _reply(proc, 1)
+        initialize_ms = (time.perf_counter() - start) * 1000
+        _request(proc, None, "notifications/initialized", {})
+        _request(proc, 2, "tools/list", {})
+        _reply(proc, 2)
+        tools_list_ms = (time.perf_counter() - start) * 1000
+        _request(proc, 3, "tools/call", FIRST_CALL)
+        _reply(proc, 3)
+        first_call_ms = (time.perf_counter() - start) * 1000
+    finally:
+        proc.kill()
+        proc.wait()
+    return {
+        "initialize_ms": initialize_ms,
+        "tools_list_ms": tools_list_ms,
+        "first_call_ms": first_call_ms,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--no-warm-load", action="store_true",
+                        help="Disable background warm-loading of tool modules")
+    args = parser.parse_args()
+
+    runs = []
+    # A throwaway HOME keeps telemetry from the runs out of ~/.cq-engine
+    with tempfile.TemporaryDirectory(prefix="cq-startup-") as home:
+        for _ in range(args.runs):
+            try:
+                runs.append(run_once(not args.no_warm_load, home))
+            except (RuntimeError, json.JSONDecodeError) as e:
+                print(f"FAIL: {e}", file=sys.stderr)
+                return 1
+
+    for metric in ("initialize_ms", "tools_list_ms", "first_call_ms"):
+        values = sorted(r[metric] for r in runs)
+        print(
+            f"{metric:<16} p50={statistics.median(values):8.1f}ms "
+            f"min={values[0]:8.1f}ms max={values[-1]:8.1f}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
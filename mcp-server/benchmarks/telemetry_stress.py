@@ -0,0 +1,145 @@
+"""Stress test: many server processes emitting telemetry concurrently.
+
+Spawns N writer processes that share one telemetry directory (as parallel
+Claude Code sessions do), while a reader process keeps refreshing the shared
+daily rollup. Afterwards it verifies that:
+
+- every line in the daily event file is a complete, parseable record
+- no record was lost (count == writers * events_per_writer)
+- the incrementally maintained rollup matches a full re-scan
+
+Usage:
+    python benchmarks/telemetry_stress.py --writers 12 --events 500
+
+Exits non-zero if any check fails.
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from telemetry.collector import TelemetryCollector  # noqa: E402
+
+TOOLS = ("decompose", "gate", "persona", "cqlint", "mutate", "learn")
+
+
+def _writer(storage: str, writer_id: int, events: int, barrier) -> None:
+    """Emit ``events`` tool invocations from one simulated server process."""
+    collector = TelemetryCollector(storage)
+    collector._session_id = f"stress-{writer_id:03d}"
+    barrier.wait()
+    for i in range(events):
+        collector.emit("tool_invocation", f"cq_engine__{TOOLS[i % len(TOOLS)]}", {
+            "_duration_ms": (writer_id * 7 + i) % 250,
+            "status": "success",
+            # Padding makes records large enough to expose interleaving
+            "payload": "x" * (64 + (i % 5) * 512),
+        })
+
+
+def _reader(storage: str, stop, barrier) -> None:
+    """Continuously refresh the shared rollup while writers are running."""
+    collector = TelemetryCollector(storage)
+    barrier.wait()
+    while not stop.is_set():
+        collector.get_daily_summary()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--writers", type=int, default=12)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cq-telemetry-stress-") as storage:
+        TelemetryCollector(storage).ensure_storage()  # create directory layout up front
+        barrier = multiprocessing.Barrier(args.writers + args.readers)
+        stop = multiprocessing.Event()
+
+        readers = [
+            multiprocessing.Process(target=_reader, args=(storage, stop, barrier))
+            for _ in range(args.readers)
+        ]
+        writers = [
+            multiprocessing.Process(
+                target=_writer, args=(storage, w, args.events, barrier)
+            )
+            for w in range(args.writers)
+        ]
+
+        start = time.perf_counter()
+        for proc in readers + writers:
+            proc.start()
+        for proc in writers:
+            proc.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for proc in readers:
+            proc.join()
+
+        expected = args.writers * args.events
+        failures: list[str] = []
+
+        event_file = Path(storage) / "events" / f"{date.today().isoformat()}.jsonl"
+        raw = event_file.read_bytes()
+        lines = raw.split(b"\n")
+        if lines and lines[-1] == b"":
+            lines.pop()
+        else:
+            failures.append("event file does not end with a newline")
+
+        per_writer: dict[str, int] = {}
+        per_tool: dict[str, int] = {}
+        corrupt = 0
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                corrupt += 1
+                continue
+            sid = event["session_id"]
+            per_writer[sid] = per_writer.get(sid, 0) + 1
+            per_tool[event["tool"]] = per_tool.get(event["tool"], 0) + 1
+
+        if corrupt:
+            failures.append(f"{corrupt} corrupt record(s)")
+        if len(lines) != expected:
+            failures.append(f"expected {expected} records, found {len(lines)}")
+        short = {s: n for s, n in per_writer.items() if n != args.events}
+        if short:
+            failures.append(f"writers with missing records: {short}")
+
+        summary = TelemetryCollector(storage).get_daily_summary()
+        if summary["total_events"] != expected:
+            failures.append(
+                f"shared rollup counts {summary['total_events']}, expected {expected}"
+            )
+        rollup_tools = {t: s["count"] for t, s in summary["by_tool"].items()}
+        if rollup_tools != per_tool:
+            failures.append(f"per-tool rollup {rollup_tools} != re-scan {per_tool}")
+
+        print(json.dumps({
+            "writers": args.writers,
+            "readers": args.readers,
+            "events_per_writer": args.events,
+            "records": len(lines),
+            "elapsed_s": round(elapsed, 3),
+            "events_per_s": round(expected / elapsed) if elapsed else None,
+            "rollup_total": summary["total_events"],
+            "passed": not failures,
+            "failures": failures,
+        }, indent=2))
+
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
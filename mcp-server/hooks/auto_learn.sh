@@ -70,6 +70,10 @@ if [[ -z "$INPUT" ]]; then
     exit 0
 fi
 
+# Fast path: record through the hook daemon when it is running
+source "$(dirname "${BASH_SOURCE[0]}")/hook_daemon.sh"
+try_daemon learn && exit 0
+
 # Extract message — try jq first, fall back to grep
 MESSAGE=""
 if command -v jq >/dev/null 2>&1; then
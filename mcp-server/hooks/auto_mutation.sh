@@ -31,6 +31,10 @@ log() {
 # Read stdin
 INPUT=$(cat)
 
+# Fast path: answer from the hook daemon when it is running
+source "$SCRIPT_DIR/hook_daemon.sh"
+try_daemon mutation && exit 0
+
 # Check for jq
 if ! command -v jq >/dev/null 2>&1; then
     approve "jq not available, skipping mutation check"
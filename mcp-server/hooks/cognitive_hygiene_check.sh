@@ -55,6 +55,10 @@ max0() {
 # Read stdin (JSON from Claude Code)
 INPUT=$(cat)
 
+# Fast path: answer from the hook daemon when it is running
+source "$(dirname "${BASH_SOURCE[0]}")/hook_daemon.sh"
+try_daemon hygiene && exit 0
+
 # Check for jq availability
 if ! command -v jq >/dev/null 2>&1; then
     approve "jq not available, skipping check"
@@ -0,0 +1,52 @@
+"""Thin client for the CQ Engine hook daemon.
+
+Forwards a hook's stdin payload to ``hook_daemon.py`` over its Unix socket
+and prints the reply. Run it with ``python3 -S -I`` so startup stays in the
+low milliseconds: only the built-in ``_socket`` module is imported.
+
+Usage:
+    python3 -S -I hooks/hook_client.py <hygiene|mutation|learn> < payload.json
+
+Exits 75 (EX_TEMPFAIL) without output if the daemon is not reachable, so
+the calling hook can fall back to its shell implementation.
+"""
+
+import _socket
+import os
+import sys
+
+EX_TEMPFAIL = 75
+# Longer than the daemon's 30 s mutation-check deadline
+TIMEOUT_SECONDS = 35.0
+
+
+def main() -> int:
+    if len(sys.argv) != 2:
+        return EX_TEMPFAIL
+    path = os.environ.get("CQ_ENGINE_HOOK_SOCKET") or os.path.expanduser("~/.cq-engine/hookd.sock")
+    payload = sys.stdin.buffer.read()
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    sock.settimeout(TIMEOUT_SECONDS)
+    try:
+        sock.connect(path)
+    except OSError:
+        return EX_TEMPFAIL
+    try:
+        sock.sendall(sys.argv[1].encode() + b"\n" + payload)
+        sock.shutdown(_socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except OSError:
+        return EX_TEMPFAIL
+    finally:
+        sock.close()
+    sys.stdout.buffer.write(b"".join(chunks))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""Persistent hook daemon for the CQ Engine Claude Code hooks.
+
+The shell hooks fork jq, bc, find, stat and (for auto_mutation.sh) a
+full mutadoc.sh run on every matching tool call. This daemon serves the
+same three hooks from one long-lived Python process over a Unix socket,
+reusing the mutate and learn engines in-process:
+
+- ``hygiene``  — Context Health Score (cognitive_hygiene_check.sh)
+- ``mutation`` — MutaDoc quick check of modified files (auto_mutation.sh),
+  cached per file by (mtime, size); an edited file is re-analyzed only in
+  the sections that changed (incremental ``mutate``). Checks run in a
+  worker thread with the shell hook's 30 s limit, so a large document
+  never blocks the other hooks
+- ``learn``    — learning extraction (auto_learn.sh), appended to the
+  learned store in the shell hook's record format
+
+Protocol: the client sends the hook name on the first line followed by
+the hook's JSON payload, then closes its write side; the daemon answers
+with the hook's stdout and closes the connection.
+
+Usage:
+    python hooks/hook_daemon.py            # foreground
+    python hooks/hook_daemon.py --idle 1800
+
+The hooks start it on demand; it exits after ``--idle`` seconds without
+requests. A lock file ensures one daemon per socket.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX platform — no Unix sockets either
+    fcntl = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools import learn as learn_module  # noqa: E402
+from tools.mutate import _INCREMENTAL  # noqa: E402
+
+SOCKET_PATH = Path(
+    os.environ.get("CQ_ENGINE_HOOK_SOCKET", "~/.cq-engine/hookd.sock")
+).expanduser()
+DEFAULT_IDLE_SECONDS = 1800
+MUTATION_CACHE_SIZE = 512
+# auto_mutation.sh wraps its check in `timeout 30`; hook_client.py waits
+# a little longer, so the daemon's answer arrives before the client gives
+# up and the shell fallback re-runs the same check
+MUTATION_TIMEOUT_SECONDS = 30
+SEVEN_DAYS = 7 * 24 * 3600
+
+# Same file pattern and classification rules as the shell hooks
+_MODIFIED_FILE_RE = re.compile(r"(/[a-zA-Z0-9_./-]+\.(?:md|yaml|yml|txt|json))")
+_FAILURE_RE = re.compile(r"failed|error|exception|crash|timeout|abort|panic")
+_SUCCESS_RE = re.compile(r"success|completed|passed|optimized|improved|resolved")
+_PATTERN_USAGE_RE = re.compile(
+    r"attention.?budget|context.?gate|cognitive.?profile|wave.?scheduler|"
+    r"assumption.?mutation|experience.?distillation|file.?based|"
+    r"template.?driven|cqlint|mutadoc|thinktank|cqe"
+)
+
+
+def _approve(reason: str) -> str:
+    return json.dumps({"decision": "approve", "reason": reason}) + "\n"
+
+
+def hygiene(payload: dict) -> str:
+    """Context Health Score for the file an Edit/Write is about to touch."""
+    threshold = float(os.environ.get("CONTEXT_HEALTH_THRESHOLD", "0.6"))
+    file_path = (payload.get("tool_input") or {}).get("file_path") or ""
+    if not file_path:
+        return _approve("No file path in tool input")
+
+    # 1. File count score: penalize directories with too many files
+    dir_file_count = 0
+    try:
+        with os.scandir(os.path.dirname(file_path) or ".") as it:
+            dir_file_count = sum(1 for e in it if e.is_file(follow_symlinks=False))
+    except OSError:
+        pass
+    count_score = max(0.0, 1.0 - (dir_file_count - 5) * 0.05)
+
+    # 2. File size and 3. freshness scores
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        size_bytes, freshness = 0, 1.0  # New file — perfectly fresh
+    else:
+        size_bytes = st.st_size
+        age = time.time() - st.st_mtime
+        if age <= SEVEN_DAYS:
+            freshness = max(0.0, 1.0 - (age / SEVEN_DAYS) * 0.5)
+        else:
+            freshness = max(0.0, 0.5 - (age / (SEVEN_DAYS * 4)) * 0.5)
+    size_score = max(0.0, 1.0 - size_bytes / 100000.0)
+
+    # 4. Aggregate, clamped to 1.0
+    health = min(1.0, (count_score + size_score + freshness) / 3.0)
+    if health < threshold:
+        return _approve(
+            f"Context health WARNING (score: {health:.2f}, threshold: {threshold}). "
+            f"Directory has {dir_file_count} files, target file is {size_bytes} bytes. "
+            "Consider applying Context Gate pattern."
+        )
+    return _approve(f"Context health OK (score: {health:.2f})")
+
+
+def _count_surviving(path: str, fingerprint: tuple[int, int]) -> tuple[tuple[int, int], int] | None:
+    """Quick-check ``path`` (worker thread); None if it cannot be read."""
+    try:
+        content = Path(path).read_text(encoding="utf-8")
+        run = _INCREMENTAL.run(str(Path(path).resolve()), content, "ambiguity")
+    except (OSError, UnicodeDecodeError, ValueError):
+        return None
+    return fingerprint, sum(1 for m in run["mutations"] if not m["detected"])
+
+
+class MutationChecker:
+    """MutaDoc quick check (ambiguity strategy) with a per-file result cache."""
+
+    def __init__(
+        self,
+        cache_size: int = MUTATION_CACHE_SIZE,
+        timeout_seconds: float = MUTATION_TIMEOUT_SECONDS,
+    ) -> None:
+        self.cache_size = cache_size
+        self.timeout_seconds = timeout_seconds
+        self._cache: "OrderedDict[str, tuple[tuple[int, int], int]]" = OrderedDict()
+        # Checks in flight, so a repeated request waits on the same thread
+        self._running: dict[str, asyncio.Future] = {}
+
+    def _store(self, path: str, future: asyncio.Future) -> None:
+        self._running.pop(path, None)
+        if future.cancelled() or future.exception() is not None or future.result() is None:
+            return
+        # Cached even after a timeout, so the next check of the file is a hit
+        self._cache[path] = future.result()
+        self._cache.move_to_end(path)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def surviving(self, path: str, timeout: float | None = None) -> int | None:
+        """Surviving mutations in ``path``; None if it cannot be checked in time.
+
+        ``timeout`` defaults to ``timeout_seconds``.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == fingerprint:
+            self._cache.move_to_end(path)
+            return cached[1]
+        future = self._running.get(path)
+        if future is None:
+            future = asyncio.ensure_future(asyncio.to_thread(_count_surviving, path, fingerprint))
+            future.add_done_callback(lambda f, path=path: self._store(path, f))
+            self._running[path] = future
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(future), self.timeout_seconds if timeout is None else timeout,
+            )
+        except asyncio.TimeoutError:
+            return None
+        return None if result is None else result[1]
+
+    async def __call__(self, payload: dict) -> str:
+        tool_output = payload.get("tool_output") or ""
+        if not isinstance(tool_output, str):
+            tool_output = json.dumps(tool_output)
+        if not tool_output:
+            return _approve("No tool output to analyze")
+        files = sorted(set(_MODIFIED_FILE_RE.findall(tool_output)))
+        if not files:
+            return _approve("No modified files detected in output")
+
+        # One deadline for the whole request; files not checked in time are skipped
+        deadline = time.monotonic() + self.timeout_seconds
+        total = 0
+        checked = []
+        for path in files:
+            if not os.path.isfile(path):
+                continue
+            count = await self.surviving(path, max(0.0, deadline - time.monotonic()))
+            if count is None:
+                continue
+            total += count
+            checked.append(f"{os.path.basename(path)}: {count}")
+        if not checked:
+            return _approve("No existing files to check")
+        if total:
+            return _approve(
+                f"Mutation check: {total} surviving mutations in {len(checked)} file(s) "
+                f"[{', '.join(checked)}]"
+            )
+        return _approve(f"Mutation check passed: 0 surviving mutations in {len(checked)} file(s)")
+
+
+def _classify(message: str) -> str:
+    lower = message.lower()
+    if _FAILURE_RE.search(lower):
+        return "failure"
+    if _SUCCESS_RE.search(lower):
+        return "optimization"
+    if _PATTERN_USAGE_RE.search(lower):
+        return "pattern_usage"
+    return "preference"
+
+
+async def learn_hook(payload: dict) -> str:
+    """Record a learning from a notification (no stdout, like auto_learn.sh).
+
+    Appends the shell hook's record as is. The ``learn`` tool's similarity
+    scan over the whole store is skipped: it costs far more than the hook's
+    budget on a large store.
+    """
+    message = payload.get("message") or ""
+    if not isinstance(message, str) or not message.strip():
+        return ""
+    now = datetime.now(timezone.utc)
+    entry = {
+        "id": f"L{now:%Y%m%d_%H%M%S}_{random.randint(0, 32767)}",
+        "observation": " ".join(message[:200].replace('"', "'").split()),
+        "category": _classify(message),
+        "confidence": 0.5,
+        "timestamp": f"{now:%Y-%m-%dT%H:%M:%SZ}",
+        "source": "auto_learn_hook",
+    }
+    path = learn_module._get_storage_path("")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+    return ""
+
+
+class HookDaemon:
+    """Unix-socket server dispatching hook requests to in-process handlers."""
+
+    def __init__(self, socket_path: Path = SOCKET_PATH, idle_seconds: float = DEFAULT_IDLE_SECONDS) -> None:
+        self.socket_path = socket_path
+        self.idle_seconds = idle_seconds
+        self.mutation = MutationChecker()
+        self._last_request = time.monotonic()
+        self.handlers = {
+            "hygiene": hygiene,
+            "mutation": self.mutation,
+            "learn": learn_hook,
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._last_request = time.monotonic()
+        try:
+            hook = (await reader.readline()).decode("utf-8", "replace").strip()
+            raw = await reader.read()
+            handler = self.handlers.get(hook)
+            if handler is None:
+                reply = _approve(f"Unknown hook: {hook}")
+            else:
+                try:
+                    payload = json.loads(raw) if raw.strip() else {}
+                except json.JSONDecodeError:
+                    payload = {}
+                try:
+                    reply = handler(payload if isinstance(payload, dict) else {})
+                    if asyncio.iscoroutine(reply):
+                        reply = await reply
+                except Exception as e:
+                    # Hooks never block Claude Code
+                    reply = "" if hook == "learn" else _approve(f"Hook daemon error: {e}")
+            writer.write(reply.encode("utf-8"))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        async with server:
+            while time.monotonic() - self._last_request < self.idle_seconds:
+                await asyncio.sleep(min(30.0, self.idle_seconds))
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+    def run(self) -> int:
+        """Serve until idle; return 1 if another daemon already owns the socket."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_fd = os.open(f"{self.socket_path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return 1
+        try:
+            # Stale socket from a daemon that did not exit cleanly
+            self.socket_path.unlink()
+        except OSError:
+            pass
+        learn_dir = os.environ.get("CQ_ENGINE_LEARN_DIR")
+        if learn_dir:
+            learn_module.LEARNED_BASE = Path(learn_dir).expanduser()
+        try:
+            asyncio.run(self.serve())
+        finally:
+            os.close(lock_fd)
+        return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--socket", default=str(SOCKET_PATH))
+    parser.add_argument("--idle", type=float, default=DEFAULT_IDLE_SECONDS,
+                        help="Exit after this many seconds without requests")
+    args = parser.parse_args()
+    return HookDaemon(Path(args.socket).expanduser(), args.idle).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+#!/usr/bin/env bash
+# hook_daemon.sh — shared fast path for the CQ Engine hooks
+# Part of cq-engine (Cognitive Quality Engineering)
+#
+# Sourced by the hook scripts. try_daemon forwards $INPUT to the hook
+# daemon (hook_daemon.py) through the thin client and prints its reply.
+# If the daemon is not running it is started in the background for the
+# next call, and the hook falls back to its shell implementation.
+# Set CQ_ENGINE_HOOK_DAEMON=0 to always use the shell implementation.
+
+HOOK_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+CQ_PYTHON="${CQ_ENGINE_PYTHON:-python3}"
+
+try_daemon() {
+    local hook="$1" reply
+    [[ "${CQ_ENGINE_HOOK_DAEMON:-1}" == "0" ]] && return 1
+    command -v "$CQ_PYTHON" >/dev/null 2>&1 || return 1
+    if reply=$(printf '%s' "$INPUT" | "$CQ_PYTHON" -S -I "$HOOK_DIR/hook_client.py" "$hook" 2>/dev/null); then
+        [[ -n "$reply" ]] && printf '%s\n' "$reply"
+        return 0
+    fi
+    nohup "$CQ_PYTHON" "$HOOK_DIR/hook_daemon.py" </dev/null >/dev/null 2>&1 &
+    return 1
+}
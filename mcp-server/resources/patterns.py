@@ -2,10 +2,19 @@
 
 Provides the cq_engine://patterns resource — a structured index of all
 CQE patterns with names, summaries, and file locations.
+
+The catalog is built lazily on first read and cached as serialized
+bytes. Every read re-stats the patterns directory and its files; the
+catalog is only rebuilt when a name, mtime or size changed. Each payload
+carries an ``etag`` (content hash), and clients that pass the etag they
+already hold get a short ``not_modified`` reply instead of the catalog.
 """
 
+import hashlib
 import json
+import os
 import re
+import threading
 from pathlib import Path
 
 CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
@@ -80,24 +89,9 @@ def _extract_classification(content: str) -> dict:
     return result
 
 
-async def patterns_catalog() -> str:
-    """Provide the CQE Pattern catalog.
-
-    Returns a JSON object listing all patterns with their names,
-    file locations, summaries, and classification metadata.
-    """
-    if not PATTERNS_DIR.is_dir():
-        return json.dumps(
-            {
-                "patterns": [],
-                "total": 0,
-                "version": "v0.1",
-                "error": f"Patterns directory not found: {PATTERNS_DIR}",
-            },
-            indent=2,
-        )
-
-    pattern_files = sorted(PATTERNS_DIR.glob("[0-9][0-9]_*.md"))
+def _build_catalog(patterns_dir: Path) -> dict:
+    """Parse every pattern file into the catalog structure."""
+    pattern_files = sorted(patterns_dir.glob("[0-9][0-9]_*.md"))
     patterns = []
 
     for pf in pattern_files:
@@ -116,7 +110,7 @@ async def patterns_catalog() -> str:
         })
 
     # Include README if it exists
-    readme_path = PATTERNS_DIR / "README.md"
+    readme_path = patterns_dir / "README.md"
     readme_summary = ""
     if readme_path.is_file():
         readme_content = readme_path.read_text(encoding="utf-8")
@@ -129,5 +123,83 @@ async def patterns_catalog() -> str:
     }
     if readme_summary:
         result["catalog_description"] = readme_summary
+    return result
 
-    return json.dumps(result, indent=2)
+
+class PatternCatalog:
+    """Serialized pattern catalog, rebuilt only when the directory changes."""
+
+    def __init__(self, patterns_dir: Path) -> None:
+        self.patterns_dir = patterns_dir
+        self._lock = threading.Lock()
+        self._key: tuple | None = None
+        self._snapshot: tuple[str, bytes, str] = ("", b"", "")
+
+    def _stat_key(self) -> tuple | None:
+        """Fingerprint the directory: its own mtime plus (name, mtime, size) per file."""
+        try:
+            entries = [(".", os.stat(self.patterns_dir).st_mtime_ns, 0)]
+            with os.scandir(self.patterns_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".md") and entry.is_file():
+                        st = entry.stat()
+                        entries.append((entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            return None
+        return tuple(sorted(entries))
+
+    def snapshot(self) -> tuple[str, bytes, str]:
+        """Rebuild if the directory changed; return (text, payload, etag)."""
+        key = self._stat_key()
+        if key is None or key != self._key:
+            with self._lock:
+                if key is None or key != self._key:
+                    self._rebuild(key)
+        return self._snapshot
+
+    def _rebuild(self, key: tuple | None) -> None:
+        if key is None:
+            result = {
+                "patterns": [],
+                "total": 0,
+                "version": "v0.1",
+                "error": f"Patterns directory not found: {self.patterns_dir}",
+            }
+        else:
+            result = _build_catalog(self.patterns_dir)
+        etag = hashlib.blake2b(
+            json.dumps(result, sort_keys=True).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        text = json.dumps({**result, "etag": etag}, indent=2)
+        self._snapshot = (text, text.encode("utf-8"), etag)
+        self._key = key
+
+    @property
+    def etag(self) -> str:
+        """Content hash of the current catalog."""
+        return self.snapshot()[2]
+
+    def text(self) -> str:
+        """Return the catalog as a JSON string."""
+        return self.snapshot()[0]
+
+    def payload(self) -> bytes:
+        """Return the catalog as UTF-8 encoded JSON."""
+        return self.snapshot()[1]
+
+
+CATALOG = PatternCatalog(PATTERNS_DIR)
+
+
+async def patterns_catalog(if_none_match: str = "") -> str:
+    """Provide the CQE Pattern catalog.
+
+    Returns a JSON object listing all patterns with their names,
+    file locations, summaries, and classification metadata, plus the
+    catalog ``etag``. If ``if_none_match`` equals the current etag, only
+    ``{"etag": ..., "not_modified": true}`` is returned.
+    """
+    text, _, etag = CATALOG.snapshot()
+    if if_none_match and if_none_match == etag:
+        return json.dumps({"etag": if_none_match, "not_modified": True}, indent=2)
+    return text
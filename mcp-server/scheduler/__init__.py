@@ -0,0 +1,10 @@
+"""CQ Engine Wave Scheduler — execute decompositions wave by wave."""
+from .executors import CallableExecutor, Executor, StubExecutor, SubprocessExecutor
+from .waves import WaveScheduler
+__all__ = [
+    "WaveScheduler",
+    "Executor",
+    "CallableExecutor",
+    "SubprocessExecutor",
+    "StubExecutor",
+]
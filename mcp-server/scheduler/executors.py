@@ -0,0 +1,117 @@
+"""Pluggable executors for the wave scheduler.
+
+An executor runs one subtask and returns its output, or raises to signal
+failure (the scheduler decides whether to retry). ``inputs`` maps each
+dependency's subtask ID to that dependency's output.
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import random
+from typing import Any, Callable
+
+
+class Executor:
+    """Base class for subtask executors."""
+
+    async def run(self, subtask: dict, inputs: dict[str, Any]) -> Any:
+        """Execute ``subtask`` and return its output."""
+        raise NotImplementedError
+
+
+class CallableExecutor(Executor):
+    """Run subtasks with a Python callable ``func(subtask, inputs)``.
+
+    Coroutine functions are awaited on the event loop; plain functions run
+    in a worker thread so they cannot stall other subtasks.
+    """
+
+    def __init__(self, func: Callable[[dict, dict], Any]) -> None:
+        self.func = func
+
+    async def run(self, subtask: dict, inputs: dict[str, Any]) -> Any:
+        if inspect.iscoroutinefunction(self.func):
+            return await self.func(subtask, inputs)
+        return await asyncio.to_thread(self.func, subtask, inputs)
+
+
+class SubprocessExecutor(Executor):
+    """Run each subtask as a local command.
+
+    The subtask and its dependency inputs are written to the command's
+    stdin as JSON; stdout is the output (parsed as JSON when possible).
+    ``{id}`` in any argument is replaced with the subtask ID, and the
+    subtask ID and token estimate are also exported as ``CQ_SUBTASK_ID``
+    and ``CQ_SUBTASK_TOKENS``.
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        timeout: float | None = None,
+        cwd: str | None = None,
+    ) -> None:
+        self.command = command
+        self.timeout = timeout
+        self.cwd = cwd
+
+    async def run(self, subtask: dict, inputs: dict[str, Any]) -> Any:
+        argv = [arg.replace("{id}", subtask["id"]) for arg in self.command]
+        env = dict(os.environ)
+        env["CQ_SUBTASK_ID"] = subtask["id"]
+        env["CQ_SUBTASK_TOKENS"] = str(subtask.get("estimated_tokens", 0))
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            env=env,
+        )
+        payload = json.dumps({"subtask": subtask, "inputs": inputs}).encode("utf-8")
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(payload), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise RuntimeError(f"command timed out after {self.timeout}s")
+        if proc.returncode != 0:
+            detail = stderr.decode("utf-8", errors="replace").strip()[-500:]
+            raise RuntimeError(f"command exited with {proc.returncode}: {detail}")
+        text = stdout.decode("utf-8", errors="replace")
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+
+
+class StubExecutor(Executor):
+    """Simulated executor for measuring scheduling throughput.
+
+    Sleeps ``seconds_per_1k_tokens`` per 1,000 estimated tokens and fails
+    each attempt with probability ``failure_rate`` (seeded, so runs are
+    reproducible).
+    """
+
+    def __init__(
+        self,
+        seconds_per_1k_tokens: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    async def run(self, subtask: dict, inputs: dict[str, Any]) -> Any:
+        self.calls += 1
+        delay = self.seconds_per_1k_tokens * subtask.get("estimated_tokens", 0) / 1000
+        await asyncio.sleep(delay)
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise RuntimeError(f"stub failure for {subtask['id']}")
+        return {"id": subtask["id"], "inputs": sorted(inputs)}
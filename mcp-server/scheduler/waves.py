@@ -0,0 +1,301 @@
+"""Wave scheduler: execute a decomposition wave by wave.
+
+Implements CQE Pattern #04 (Wave Scheduler) on top of decompose output:
+- Waves are hard barriers; a subtask starts only after every earlier wave
+  has finished
+- Within a wave, subtasks are admitted in order while both the concurrency
+  limit and the global token budget allow (Budget-Constrained Wave Sizing)
+- Failed subtasks are retried with exponential backoff; subtasks whose
+  dependencies did not complete are skipped rather than run on stale input
+
+With a checkpoint directory, every finished subtask and wave is written
+as a JSON file (Pattern #07, File-Based I/O), and a re-run resumes from
+the subtasks already completed. Task checkpoints carry a fingerprint of
+the subtask, so a different decomposition reusing the same IDs (decompose
+always emits ST-1..ST-n) starts fresh instead of resuming stale outputs.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from tools.dag import build_schedule
+
+from .executors import Executor
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TOKEN_BUDGET = 200000
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    """Write JSON atomically so readers never see a partial checkpoint."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _safe_name(subtask_id: str) -> str:
+    """Map a subtask ID to a file name."""
+    return re.sub(r"[^\w.-]", "_", subtask_id)
+
+
+def _fingerprint(subtask: dict) -> str:
+    """Hash the fields that define a subtask's work."""
+    spec = {
+        "description": subtask.get("description", ""),
+        "dependencies": sorted(subtask.get("dependencies", [])),
+        "estimated_tokens": subtask.get("estimated_tokens", 0),
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class WaveScheduler:
+    """Dispatch decomposed subtasks to an executor, wave by wave."""
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        task_timeout: float | None = None,
+        checkpoint_dir: str | Path | None = None,
+        telemetry=None,
+    ) -> None:
+        """
+        Args:
+            executor: Runs individual subtasks.
+            max_concurrency: Most subtasks running at once.
+            token_budget: Most estimated tokens in flight at once (0 = no
+                limit). A subtask larger than the budget runs alone.
+            max_retries: Extra attempts after a failure.
+            retry_backoff: Delay before the first retry, doubled each time.
+            task_timeout: Per-attempt timeout in seconds.
+            checkpoint_dir: Directory for task/wave checkpoint files.
+            telemetry: Optional TelemetryCollector for per-wave timing.
+        """
+        self.executor = executor
+        self.max_concurrency = max(1, max_concurrency)
+        self.token_budget = token_budget
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.task_timeout = task_timeout
+        self.checkpoint_dir = Path(checkpoint_dir).expanduser() if checkpoint_dir else None
+        self.telemetry = telemetry
+
+    # --- Checkpoints ---
+
+    def _task_file(self, subtask_id: str) -> Path:
+        return self.checkpoint_dir / "tasks" / f"{_safe_name(subtask_id)}.json"
+
+    def _load_checkpoint(self, subtask: dict) -> dict | None:
+        """Return a completed checkpoint of this exact subtask, if one exists."""
+        if self.checkpoint_dir is None:
+            return None
+        try:
+            record = json.loads(self._task_file(subtask["id"]).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if record.get("status") != "completed":
+            return None
+        # Same ID from a different decomposition: not this subtask's output
+        if record.get("fingerprint") != _fingerprint(subtask):
+            return None
+        return record
+
+    def _save(self, path_parts: tuple[str, ...], payload: dict) -> None:
+        if self.checkpoint_dir is None:
+            return
+        try:
+            _write_json(self.checkpoint_dir.joinpath(*path_parts), payload)
+        except OSError:
+            # Checkpointing is best-effort; the run itself continues
+            pass
+
+    # --- Execution ---
+
+    async def _attempt(self, subtask: dict, inputs: dict[str, Any]) -> tuple[dict, Any]:
+        """Run one subtask with retries; return (record, output)."""
+        start = time.time()
+        error = ""
+        attempts = 0
+        for attempt in range(self.max_retries + 1):
+            attempts = attempt + 1
+            try:
+                output = await asyncio.wait_for(
+                    self.executor.run(subtask, inputs), timeout=self.task_timeout
+                )
+            except asyncio.TimeoutError:
+                error = f"timed out after {self.task_timeout}s"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            else:
+                record = {
+                    "task_id": subtask["id"],
+                    "status": "completed",
+                    "attempts": attempts,
+                    "duration_ms": int((time.time() - start) * 1000),
+                    "estimated_tokens": subtask.get("estimated_tokens", 0),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "output": output,
+                }
+                return record, output
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+        record = {
+            "task_id": subtask["id"],
+            "status": "failed",
+            "attempts": attempts,
+            "duration_ms": int((time.time() - start) * 1000),
+            "estimated_tokens": subtask.get("estimated_tokens", 0),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "error": error,
+        }
+        return record, None
+
+    async def _run_wave(
+        self,
+        wave_no: int,
+        members: list[dict],
+        results: dict[str, dict],
+        outputs: dict[str, Any],
+    ) -> dict:
+        """Run one wave under the concurrency and token-budget limits."""
+        start = time.time()
+        cond = asyncio.Condition()
+        state = {"running": 0, "tokens": 0, "peak_running": 0, "peak_tokens": 0}
+
+        def has_room(tokens: int) -> bool:
+            if state["running"] >= self.max_concurrency:
+                return False
+            if state["running"] == 0 or self.token_budget <= 0:
+                return True
+            return state["tokens"] + tokens <= self.token_budget
+
+        async def run_admitted(subtask: dict, tokens: int, inputs: dict[str, Any]) -> None:
+            try:
+                record, output = await self._attempt(subtask, inputs)
+                record["fingerprint"] = _fingerprint(subtask)
+                results[subtask["id"]] = record
+                if record["status"] == "completed":
+                    outputs[subtask["id"]] = output
+                self._save(("tasks", f"{_safe_name(subtask['id'])}.json"), record)
+            finally:
+                async with cond:
+                    state["running"] -= 1
+                    state["tokens"] -= tokens
+                    cond.notify_all()
+
+        running: list[asyncio.Task] = []
+        for subtask in members:
+            sid = subtask["id"]
+            checkpoint = self._load_checkpoint(subtask)
+            if checkpoint is not None:
+                results[sid] = {**checkpoint, "resumed": True}
+                outputs[sid] = checkpoint.get("output")
+                continue
+            blocked = [d for d in subtask["dependencies"] if d not in outputs]
+            if blocked:
+                results[sid] = {
+                    "task_id": sid,
+                    "status": "skipped",
+                    "error": f"dependencies not completed: {', '.join(blocked)}",
+                }
+                continue
+
+            tokens = subtask.get("estimated_tokens", 0)
+            # Admission control: in-order, so large subtasks are not starved
+            async with cond:
+                await cond.wait_for(lambda: has_room(tokens))
+                state["running"] += 1
+                state["tokens"] += tokens
+                state["peak_running"] = max(state["peak_running"], state["running"])
+                state["peak_tokens"] = max(state["peak_tokens"], state["tokens"])
+            inputs = {d: outputs[d] for d in subtask["dependencies"]}
+            running.append(asyncio.ensure_future(run_admitted(subtask, tokens, inputs)))
+
+        if running:
+            await asyncio.gather(*running)
+
+        statuses = [results[st["id"]]["status"] for st in members]
+        report = {
+            "wave": wave_no,
+            "subtasks": [st["id"] for st in members],
+            "duration_ms": int((time.time() - start) * 1000),
+            "completed": statuses.count("completed"),
+            "failed": statuses.count("failed"),
+            "skipped": statuses.count("skipped"),
+            "resumed": sum(1 for st in members if results[st["id"]].get("resumed")),
+            "peak_concurrency": state["peak_running"],
+            "peak_tokens_in_flight": state["peak_tokens"],
+        }
+        self._save(("waves", f"wave_{wave_no:03d}.json"), report)
+        if self.telemetry is not None:
+            self.telemetry.emit("wave_completed", "cq_engine__scheduler", {
+                "_duration_ms": report["duration_ms"],
+                **{k: v for k, v in report.items() if k not in ("subtasks", "duration_ms")},
+                "status": "error" if report["failed"] else "success",
+            })
+        return report
+
+    async def run(self, decomposition: dict | list | str) -> dict:
+        """Execute a decomposition.
+
+        Args:
+            decomposition: decompose output (JSON string or dict with
+                "subtasks" and optionally "schedule"), or a bare list of
+                subtasks with ``id``, ``estimated_tokens`` and ``dependencies``.
+
+        Returns:
+            Run report: overall status, per-wave reports, and one record per
+            subtask (status, attempts, duration, output or error).
+
+        Raises:
+            ValueError: If the dependency graph is invalid.
+        """
+        if isinstance(decomposition, str):
+            decomposition = json.loads(decomposition)
+        if isinstance(decomposition, list):
+            decomposition = {"subtasks": decomposition}
+        subtasks = decomposition["subtasks"]
+        by_id = {st["id"]: st for st in subtasks}
+        schedule = decomposition.get("schedule") or build_schedule(subtasks)
+        self._save(("schedule.json",), schedule)
+
+        start = time.time()
+        results: dict[str, dict] = {}
+        outputs: dict[str, Any] = {}
+        waves = []
+        for wave in schedule["waves"]:
+            members = [by_id[sid] for sid in wave["subtasks"]]
+            waves.append(await self._run_wave(wave["wave"], members, results, outputs))
+        elapsed = time.time() - start
+
+        counts = {"completed": 0, "failed": 0, "skipped": 0}
+        for record in results.values():
+            counts[record["status"]] += 1
+        if counts["completed"] == len(subtasks):
+            status = "completed"
+        elif counts["completed"]:
+            status = "partial"
+        else:
+            status = "failed"
+
+        report = {
+            "status": status,
+            **counts,
+            "waves": waves,
+            "subtasks": [results[st["id"]] for st in subtasks],
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "subtasks_per_s": round(len(subtasks) / elapsed, 1) if elapsed else None,
+        }
+        self._save(("report.json",), {k: v for k, v in report.items() if k != "subtasks"})
+        return report
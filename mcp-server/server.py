@@ -6,25 +6,21 @@ Install: claude mcp add cq-engine -- python server.py
 
 import functools
 import json
+import os
+import threading
 import time
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
-# Import tools
-from tools.decompose import decompose
-from tools.gate import gate
-from tools.persona import persona
-from tools.cqlint_tool import cqlint
-from tools.mutate import mutate
-from tools.learn import learn
-
-# Import resources
-from resources.patterns import patterns_catalog
-from resources.learned import learned_entries
+# Tools are registered from stubs; their modules load on first call
+from tools.lazy import lazy_tool, warm_load
+from tools.executor import ToolExecutor
+from tools.budget import output_budget
 
 # Import telemetry
-from telemetry.collector import TelemetryCollector
+from telemetry.collector import TelemetryCollector, extract_quality
+from telemetry.maintenance import MaintenanceScheduler
 
 # --- Initialize ---
 
@@ -33,6 +29,7 @@ mcp = FastMCP(
     description="Cognitive Quality Engineering for LLM Agents",
 )
 telemetry = TelemetryCollector()
+maintenance = MaintenanceScheduler(telemetry)
 
 
 # --- Telemetry wrapper ---
@@ -46,10 +43,12 @@ def wrap_with_telemetry(tool_func, tool_name):
         try:
             result = await tool_func(*args, **kwargs)
             duration_ms = int((time.time() - start) * 1000)
-            telemetry.emit("tool_invocation", f"cq_engine__{tool_name}", {
-                "_duration_ms": duration_ms,
-                "status": "success",
-            })
+            data = {"_duration_ms": duration_ms, "status": "success"}
+            # Benchmark inputs (see tools/benchmark.py)
+            quality = extract_quality(tool_name, result)
+            if quality:
+                data["quality"] = quality
+            telemetry.emit("tool_invocation", f"cq_engine__{tool_name}", data)
             return result
         except Exception as e:
             duration_ms = int((time.time() - start) * 1000)
@@ -65,12 +64,60 @@ def wrap_with_telemetry(tool_func, tool_name):
 
 # --- Register tools with telemetry ---
 
-mcp.tool()(wrap_with_telemetry(decompose, "decompose"))
-mcp.tool()(wrap_with_telemetry(gate, "gate"))
-mcp.tool()(wrap_with_telemetry(persona, "persona"))
-mcp.tool()(wrap_with_telemetry(cqlint, "cqlint"))
-mcp.tool()(wrap_with_telemetry(mutate, "mutate"))
-mcp.tool()(wrap_with_telemetry(learn, "learn"))
+# Tool name -> module that defines it
+TOOL_MODULES = {
+    "decompose": "tools.decompose",
+    "gate": "tools.gate",
+    "persona": "tools.persona",
+    "persona_batch": "tools.persona",
+    "cqlint": "tools.cqlint_tool",
+    "mutate": "tools.mutate",
+    "learn": "tools.learn",
+    "search": "tools.search",
+    "conflicts": "tools.facts",
+    "thinktank": "tools.thinktank",
+    "benchmark": "tools.benchmark",
+    "benchmark_trend": "tools.benchmark",
+    "page": "tools.budget",
+}
+
+# Where each tool runs (see tools/executor.py): CPU-bound tools in worker
+# processes, file I/O and short CPU work in threads, tools that already
+# await I/O on the event loop. Deadlines include time spent queued.
+TOOL_POLICIES = {
+    # Incremental runs rely on per-file state kept in the server process
+    "mutate": {"pool": "process", "max_concurrent": 2, "timeout_seconds": 120, "thread_when": ("incremental",)},
+    # One indexer at a time: concurrent calls would re-extract the same files
+    "conflicts": {"pool": "process", "max_concurrent": 1, "timeout_seconds": 120},
+    "thinktank": {"pool": "process", "max_concurrent": 2, "timeout_seconds": 120},
+    "decompose": {"pool": "thread", "max_concurrent": 4, "timeout_seconds": 30},
+    "gate": {"pool": "thread", "max_concurrent": 4, "timeout_seconds": 30},
+    "persona": {"pool": "thread", "max_concurrent": 4, "timeout_seconds": 30},
+    "persona_batch": {"pool": "thread", "max_concurrent": 2, "timeout_seconds": 60},
+    # Appends to the learned store after a duplicate check
+    "learn": {"pool": "thread", "max_concurrent": 1, "timeout_seconds": 30},
+    # In-memory index built in the server process
+    "search": {"pool": "thread", "max_concurrent": 8, "timeout_seconds": 30},
+    # Awaits the cqlint.sh subprocess
+    "cqlint": {"pool": "loop", "max_concurrent": 2, "timeout_seconds": 120},
+    # One scan at a time: concurrent calls would re-analyze the same files.
+    # Mostly file I/O and waits on cqlint.sh subprocesses
+    "benchmark": {"pool": "thread", "max_concurrent": 1, "timeout_seconds": 600},
+    "benchmark_trend": {"pool": "thread", "max_concurrent": 4, "timeout_seconds": 30},
+    # Reads results cached in the server process
+    "page": {"pool": "thread", "max_concurrent": 8, "timeout_seconds": 30},
+}
+
+executor = ToolExecutor(
+    TOOL_POLICIES,
+    preload=sorted({TOOL_MODULES[name] for name, p in TOOL_POLICIES.items() if p["pool"] == "process"}),
+)
+
+# Budgets are applied here, not in the tool, so truncated results are
+# cached in this process whichever pool computed them
+for _name, _module in TOOL_MODULES.items():
+    _tool = executor.wrap(lazy_tool(_module, _name), _name, _module)
+    mcp.tool()(wrap_with_telemetry(output_budget.wrap(_tool, _name), _name))
 
 
 # --- Register resources ---
@@ -78,12 +125,21 @@ mcp.tool()(wrap_with_telemetry(learn, "learn"))
 @mcp.resource("cq_engine://patterns")
 async def patterns_resource() -> str:
     """CQE Pattern catalog — 8 cognitive quality patterns."""
+    from resources.patterns import patterns_catalog
     return await patterns_catalog()
 
 
+@mcp.resource("cq_engine://patterns/{etag}")
+async def patterns_if_changed_resource(etag: str) -> str:
+    """CQE Pattern catalog, or a short not_modified reply if etag is current."""
+    from resources.patterns import patterns_catalog
+    return await patterns_catalog(if_none_match=etag)
+
+
 @mcp.resource("cq_engine://learned")
 async def learned_resource() -> str:
     """Accumulated learnings from agent sessions."""
+    from resources.learned import learned_entries
     return await learned_entries()
 
 
@@ -95,14 +151,52 @@ async def health_resource() -> str:
     return json.dumps({
         "weekly_summary": weekly,
         "pattern_usage": pattern_usage,
+        "maintenance": maintenance.status(),
+        "executor": executor.status(),
+        "output_budget": output_budget.status(),
         "version": "0.1.0",
     }, indent=2)
 
 
+@mcp.resource("cq_engine://health/sessions")
+async def health_sessions_resource() -> str:
+    """Session analytics — top sessions by total tool time (last 7 days)."""
+    return json.dumps(telemetry.get_session_summary(), indent=2)
+
+
+@mcp.resource("cq_engine://health/sessions/{sort_by}/{top_k}")
+async def health_sessions_top_resource(sort_by: str, top_k: str) -> str:
+    """Session analytics — top-k sessions by total_duration_ms, calls, errors or error_rate."""
+    try:
+        k = int(top_k)
+    except ValueError:
+        return json.dumps({"error": f"top_k must be an integer, got '{top_k}'"})
+    return json.dumps(
+        telemetry.get_session_summary(top_k=k, sort_by=sort_by), indent=2
+    )
+
+
 # --- Entry point ---
 
+# Delay before background warm-loading of tool modules
+WARM_LOAD_DELAY_SECONDS = 0.5
+
+
 def main():
     """Run the CQ Engine MCP Server."""
+    maintenance.start()
+    if os.environ.get("CQ_ENGINE_WARM_LOAD", "1") != "0":
+        # Import tool modules and build the search index off the request
+        # path, once the handshake has had a head start
+        warmer = threading.Timer(
+            WARM_LOAD_DELAY_SECONDS,
+            warm_load,
+            args=(sorted(set(TOOL_MODULES.values())),),
+            kwargs={"hooks": [("tools.search", "warm_index")]},
+        )
+        warmer.daemon = True
+        warmer.start()
+        executor.prestart()
     mcp.run()
 
 
@@ -1,3 +1,4 @@
 """CQ Engine Telemetry — Local-only usage data collection."""
 from .collector import TelemetryCollector
-__all__ = ["TelemetryCollector"]
+from .maintenance import MaintenanceScheduler
+__all__ = ["TelemetryCollector", "MaintenanceScheduler"]
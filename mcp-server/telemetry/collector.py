@@ -3,13 +3,28 @@
 Collects tool invocation events, stores them in daily JSONL files,
 and provides summary/aggregation methods. All data stays local.
 No network calls. Ever.
+
+Several server processes (one per Claude Code session) share the same
+storage directory. Appends are serialized with an advisory lock on the
+daily event file, and per-day aggregates under ``aggregates/`` are
+maintained incrementally from a byte offset into that file, so every
+instance reads one shared set of rollups instead of re-scanning raw events.
 """
 
+import contextlib
+import heapq
 import json
+import math
 import os
 import uuid
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX platform — fall back to unlocked appends
+    fcntl = None
 
 # Pattern mapping: tool name keyword -> pattern name
 TOOL_PATTERN_MAP: dict[str, str] = {
@@ -21,18 +36,174 @@ TOOL_PATTERN_MAP: dict[str, str] = {
     "cqlint": "Patterns 01-05 (Quality Linting)",
 }
 
+AGGREGATE_LOCK_NAME = ".lock"
+
+# Bump when the rollup schema changes; stale rollups are rebuilt from events
+AGGREGATE_VERSION = 2
+
+# Duration histogram resolution: buckets per doubling (~19% relative error)
+DURATION_BUCKETS_PER_OCTAVE = 4
+
+# Sort keys accepted by get_session_summary()
+SESSION_SORT_KEYS = ("total_duration_ms", "calls", "errors", "error_rate")
+
+# Gate selections at or above this relevance count as relevant context
+# (CQ Benchmark CH-1 uses 0.3 as its relevance threshold)
+RELEVANT_SCORE = 0.3
+
+
+@contextlib.contextmanager
+def _locked(fd: int | None) -> Iterator[None]:
+    """Hold an exclusive advisory lock on an open file descriptor."""
+    if fcntl is None or fd is None:
+        yield
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _empty_aggregate(date_str: str) -> dict:
+    """Return a fresh daily aggregate with nothing folded in yet."""
+    return {
+        "version": AGGREGATE_VERSION,
+        "date": date_str,
+        "offset": 0,
+        "total_events": 0,
+        "by_tool": {},
+        "sessions": {},
+    }
+
+
+def _duration_bucket(duration_ms: float) -> int:
+    """Map a duration to its log-scale histogram bucket."""
+    return int(math.log2(max(duration_ms, 0) + 1) * DURATION_BUCKETS_PER_OCTAVE)
+
+
+def _bucket_upper_ms(bucket: int) -> int:
+    """Return the upper bound (ms) of a histogram bucket."""
+    return round(2 ** ((bucket + 1) / DURATION_BUCKETS_PER_OCTAVE) - 1)
+
+
+def _histogram_percentile(histogram: dict[str, int], q: float) -> int | None:
+    """Approximate the q-th percentile (0-100) from a duration histogram."""
+    total = sum(histogram.values())
+    if total == 0:
+        return None
+    rank = max(1, math.ceil(total * q / 100))
+    seen = 0
+    for bucket in sorted(histogram, key=int):
+        seen += histogram[bucket]
+        if seen >= rank:
+            return _bucket_upper_ms(int(bucket))
+    return None
+
+
+def extract_quality(tool: str, result: str) -> dict[str, float]:
+    """Quality signals in a tool result, recorded with its telemetry event.
+
+    Only ``gate`` and ``thinktank`` results carry signals (the CQ Benchmark
+    Context Health and Decision Quality inputs); they are read from fields
+    that a ``max_output_tokens`` cut leaves in place.
+    """
+    if tool not in ("gate", "thinktank"):
+        return {}
+    try:
+        payload = json.loads(result)
+    except ValueError:
+        return {}
+    if not isinstance(payload, dict) or "error" in payload:
+        return {}
+    if tool == "gate":
+        health = payload.get("context_health") or {}
+        selected = payload.get("selected_files") or []
+        tokens = sum(f.get("estimated_tokens", 0) for f in selected)
+        relevant = sum(
+            f.get("estimated_tokens", 0) for f in selected
+            if f.get("relevance_score", 0) >= RELEVANT_SCORE
+        )
+        signals = {
+            "gate.contamination_risk": health.get("contamination_risk"),
+            "gate.freshness": health.get("freshness"),
+        }
+        if tokens:
+            signals["gate.relevant_token_share"] = relevant / tokens
+    else:
+        summary = payload.get("summary") or {}
+        signals = {
+            "thinktank.independent_perspectives": summary.get("independent_perspectives"),
+            "thinktank.strategy_coverage": summary.get("strategy_coverage"),
+        }
+    return {k: v for k, v in signals.items() if isinstance(v, (int, float))}
+
+
+def _fold_event(aggregate: dict, event: dict) -> None:
+    """Fold a single event into a daily aggregate in place."""
+    aggregate["total_events"] += 1
+    tool = event.get("tool", "unknown")
+    stats = aggregate["by_tool"].setdefault(
+        tool, {"count": 0, "total_duration_ms": 0, "duration_count": 0}
+    )
+    stats["count"] += 1
+    duration = event.get("duration_ms")
+    if duration is not None:
+        stats["total_duration_ms"] += duration
+        stats["duration_count"] += 1
+
+    # Per-session rollup: bounded size regardless of events per session
+    data = event.get("data")
+    is_error = isinstance(data, dict) and data.get("status") == "error"
+    session = aggregate["sessions"].setdefault(
+        event.get("session_id", "unknown"),
+        {"calls": 0, "errors": 0, "total_duration_ms": 0, "tools": {}, "histogram": {}},
+    )
+    session["calls"] += 1
+    session["tools"][tool] = session["tools"].get(tool, 0) + 1
+    if is_error:
+        session["errors"] += 1
+    if duration is not None:
+        session["total_duration_ms"] += duration
+        bucket = str(_duration_bucket(duration))
+        session["histogram"][bucket] = session["histogram"].get(bucket, 0) + 1
+
+    # Quality signals: running sums, so any window can be averaged.
+    # Rollups written before signals were recorded simply have none.
+    quality = data.get("quality") if isinstance(data, dict) else None
+    if isinstance(quality, dict):
+        signals = aggregate.setdefault("quality", {})
+        for name, value in quality.items():
+            if isinstance(value, (int, float)):
+                stats = signals.setdefault(name, {"sum": 0.0, "count": 0})
+                stats["sum"] += value
+                stats["count"] += 1
+
 
 class TelemetryCollector:
     """Local-only telemetry collector. No network calls. Ever."""
 
     def __init__(self, storage_path: str = "~/.cq-engine/telemetry") -> None:
         self.storage_path = Path(storage_path).expanduser()
-        self.storage_path.mkdir(parents=True, exist_ok=True)
-        (self.storage_path / "events").mkdir(exist_ok=True)
-        (self.storage_path / "aggregates").mkdir(exist_ok=True)
+        # Directories are created on first write, keeping construction
+        # (and so server startup) free of filesystem calls
+        self._dirs_ready = False
         self._session_id = os.environ.get(
             "CQ_SESSION_ID", str(uuid.uuid4())[:8]
         )
+        # date_str -> aggregate, valid while the event file size matches
+        self._aggregate_cache: dict[str, dict] = {}
+
+    def ensure_storage(self) -> None:
+        """Create the storage directories if this instance has not yet."""
+        if self._dirs_ready:
+            return
+        try:
+            (self.storage_path / "events").mkdir(parents=True, exist_ok=True)
+            (self.storage_path / "aggregates").mkdir(exist_ok=True)
+        except OSError:
+            return
+        self._dirs_ready = True
 
     def _events_dir(self) -> Path:
         """Return the events directory path."""
@@ -42,6 +213,14 @@ class TelemetryCollector:
         """Return the JSONL file path for a given date string."""
         return self._events_dir() / f"{date_str}.jsonl"
 
+    def _aggregates_dir(self) -> Path:
+        """Return the aggregates (rollup) directory path."""
+        return self.storage_path / "aggregates"
+
+    def _aggregate_file(self, date_str: str) -> Path:
+        """Return the rollup file path for a given date string."""
+        return self._aggregates_dir() / f"{date_str}.json"
+
     def emit(self, event_type: str, tool: str, data: dict) -> None:
         """Append a telemetry event to the daily JSONL file.
 
@@ -68,28 +247,125 @@ class TelemetryCollector:
         if duration_ms is not None:
             event["duration_ms"] = duration_ms
 
+        record = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        self.ensure_storage()
         event_file = self._event_file(today_str)
         try:
-            with open(event_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            fd = os.open(event_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # One locked write per record: concurrent emitters from other
+                # server processes can never interleave partial lines.
+                with _locked(fd):
+                    view = memoryview(record)
+                    while view:
+                        written = os.write(fd, view)
+                        view = view[written:]
+            finally:
+                os.close(fd)
         except OSError:
-            # File lock contention or permission error — skip silently
+            # Permission error or full disk — skip silently
             pass
 
-    def _load_events(self, date_str: str) -> list[dict]:
-        """Load all events for a given date."""
+    def _read_aggregate(self, date_str: str) -> dict:
+        """Read the persisted rollup for a date, or an empty one."""
+        try:
+            aggregate = json.loads(
+                self._aggregate_file(date_str).read_text(encoding="utf-8")
+            )
+        except (OSError, json.JSONDecodeError):
+            return _empty_aggregate(date_str)
+        if (
+            not isinstance(aggregate, dict)
+            or aggregate.get("version") != AGGREGATE_VERSION
+        ):
+            return _empty_aggregate(date_str)
+        return aggregate
+
+    def _write_aggregate(self, aggregate: dict) -> None:
+        """Persist a rollup atomically (write temp file, then rename)."""
+        self.ensure_storage()
+        target = self._aggregate_file(aggregate["date"])
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(
+                json.dumps(aggregate, ensure_ascii=False), encoding="utf-8"
+            )
+            os.replace(tmp, target)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+
+    def _refresh_aggregate(self, date_str: str) -> dict:
+        """Bring the shared rollup for a date up to date and return it.
+
+        Only the bytes appended since the last refresh (by any process) are
+        parsed. Refreshes are serialized across processes by a lock file in
+        the aggregates directory; a trailing partial line is left for the
+        next refresh.
+        """
         event_file = self._event_file(date_str)
-        if not event_file.exists():
-            return []
-        events = []
-        for line in event_file.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if line:
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-        return events
+        try:
+            size = event_file.stat().st_size
+        except OSError:
+            size = None
+
+        cached = self._aggregate_cache.get(date_str)
+        if cached is not None and (size is None or cached["offset"] == size):
+            return cached
+        if size is None:
+            # No raw events (never written, or already purged) — the rollup,
+            # if any, is all that remains. Rollups are replaced atomically.
+            aggregate = self._read_aggregate(date_str)
+            self._aggregate_cache[date_str] = aggregate
+            return aggregate
+
+        lock_path = self._aggregates_dir() / AGGREGATE_LOCK_NAME
+        try:
+            lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            lock_fd = None
+
+        try:
+            with _locked(lock_fd):
+                aggregate = self._read_aggregate(date_str)
+                if size < aggregate["offset"]:
+                    # Event file was truncated or replaced — rebuild from scratch
+                    aggregate = _empty_aggregate(date_str)
+                if size > aggregate["offset"]:
+                    aggregate["offset"] = self._fold_from_offset(
+                        event_file, aggregate, aggregate["offset"]
+                    )
+                    self._write_aggregate(aggregate)
+        finally:
+            if lock_fd is not None:
+                os.close(lock_fd)
+
+        self._aggregate_cache[date_str] = aggregate
+        return aggregate
+
+    def _fold_from_offset(self, event_file: Path, aggregate: dict, offset: int) -> int:
+        """Fold complete lines after ``offset`` into the aggregate.
+
+        Returns the new offset (end of the last complete line read).
+        """
+        try:
+            with open(event_file, "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # Partial line still being written
+                    offset += len(raw)
+                    raw = raw.strip()
+                    if not raw:
+                        continue
+                    try:
+                        event = json.loads(raw)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    _fold_event(aggregate, event)
+        except OSError:
+            pass
+        return offset
 
     def get_daily_summary(self, date_str: str | None = None) -> dict:
         """Get summary for a specific date.
@@ -103,24 +379,13 @@ class TelemetryCollector:
         if date_str is None:
             date_str = date.today().isoformat()
 
-        events = self._load_events(date_str)
-
-        by_tool: dict[str, dict] = {}
-        for event in events:
-            tool = event.get("tool", "unknown")
-            if tool not in by_tool:
-                by_tool[tool] = {"count": 0, "total_duration_ms": 0, "has_duration": False}
-            by_tool[tool]["count"] += 1
-            duration = event.get("duration_ms")
-            if duration is not None:
-                by_tool[tool]["total_duration_ms"] += duration
-                by_tool[tool]["has_duration"] = True
+        aggregate = self._refresh_aggregate(date_str)
 
         # Compute averages and clean up
         by_tool_clean: dict[str, dict] = {}
-        for tool, stats in by_tool.items():
+        for tool, stats in aggregate["by_tool"].items():
             entry: dict = {"count": stats["count"]}
-            if stats["has_duration"] and stats["count"] > 0:
+            if stats["duration_count"] and stats["count"] > 0:
                 entry["avg_duration_ms"] = round(
                     stats["total_duration_ms"] / stats["count"]
                 )
@@ -128,7 +393,7 @@ class TelemetryCollector:
 
         return {
             "date": date_str,
-            "total_events": len(events),
+            "total_events": aggregate["total_events"],
             "by_tool": by_tool_clean,
         }
 
@@ -192,14 +457,13 @@ class TelemetryCollector:
 
         for i in range(30):
             day_str = (today - timedelta(days=i)).isoformat()
-            events = self._load_events(day_str)
-            for event in events:
-                tool = event.get("tool", "")
+            aggregate = self._refresh_aggregate(day_str)
+            for tool, stats in aggregate["by_tool"].items():
                 # Match tool name against pattern keywords
                 for keyword, pattern in TOOL_PATTERN_MAP.items():
                     if keyword in tool:
                         pattern_counts[pattern] = (
-                            pattern_counts.get(pattern, 0) + 1
+                            pattern_counts.get(pattern, 0) + stats["count"]
                         )
                         break
 
@@ -209,9 +473,132 @@ class TelemetryCollector:
             "total_mapped_events": sum(pattern_counts.values()),
         }
 
+    def get_quality_summary(self, days: int = 30) -> dict:
+        """Get the quality signals recorded over the last ``days`` days.
+
+        Returns:
+            Dict with the mean and count of each signal (see
+            ``extract_quality``) and the number of sessions in the period.
+        """
+        today = date.today()
+        merged: dict[str, dict] = {}
+        for i in range(days):
+            day_str = (today - timedelta(days=i)).isoformat()
+            for name, stats in self._refresh_aggregate(day_str).get("quality", {}).items():
+                target = merged.setdefault(name, {"sum": 0.0, "count": 0})
+                target["sum"] += stats["sum"]
+                target["count"] += stats["count"]
+        return {
+            "period": f"Last {days} days (since {(today - timedelta(days=days - 1)).isoformat()})",
+            "sessions": len(self._merge_sessions(days)),
+            "signals": {
+                name: {"mean": stats["sum"] / stats["count"], "count": stats["count"]}
+                for name, stats in sorted(merged.items()) if stats["count"]
+            },
+        }
+
+    def _merge_sessions(self, days: int) -> dict[str, dict]:
+        """Merge per-session rollups across the last ``days`` days."""
+        today = date.today()
+        merged: dict[str, dict] = {}
+        for i in range(days):
+            day_str = (today - timedelta(days=i)).isoformat()
+            for sid, stats in self._refresh_aggregate(day_str)["sessions"].items():
+                target = merged.get(sid)
+                if target is None:
+                    merged[sid] = {
+                        "calls": stats["calls"],
+                        "errors": stats["errors"],
+                        "total_duration_ms": stats["total_duration_ms"],
+                        "tools": dict(stats["tools"]),
+                        "histogram": dict(stats["histogram"]),
+                    }
+                    continue
+                target["calls"] += stats["calls"]
+                target["errors"] += stats["errors"]
+                target["total_duration_ms"] += stats["total_duration_ms"]
+                for tool, count in stats["tools"].items():
+                    target["tools"][tool] = target["tools"].get(tool, 0) + count
+                for bucket, count in stats["histogram"].items():
+                    target["histogram"][bucket] = target["histogram"].get(bucket, 0) + count
+        return merged
+
+    def get_session_summary(
+        self,
+        days: int = 7,
+        top_k: int = 10,
+        sort_by: str = "total_duration_ms",
+    ) -> dict:
+        """Get session-level analytics from the shared rollups.
+
+        Args:
+            days: Number of days (today inclusive) to include.
+            top_k: Number of sessions to return in the ranking.
+            sort_by: Ranking key — one of SESSION_SORT_KEYS.
+
+        Returns:
+            Dict with the top-k sessions (calls, duration percentiles,
+            error rate, tool mix) and the typical (median) session profile.
+        """
+        if sort_by not in SESSION_SORT_KEYS:
+            return {
+                "error": f"Invalid sort_by '{sort_by}'. Must be one of: {', '.join(SESSION_SORT_KEYS)}",
+            }
+
+        sessions = self._merge_sessions(days)
+
+        def sort_key(item: tuple[str, dict]) -> float:
+            stats = item[1]
+            if sort_by == "error_rate":
+                return stats["errors"] / stats["calls"] if stats["calls"] else 0.0
+            return stats[sort_by]
+
+        top = []
+        for sid, stats in heapq.nlargest(max(0, top_k), sessions.items(), key=sort_key):
+            top.append({
+                "session_id": sid,
+                "calls": stats["calls"],
+                "errors": stats["errors"],
+                "error_rate": round(stats["errors"] / stats["calls"], 3) if stats["calls"] else 0.0,
+                "total_duration_ms": stats["total_duration_ms"],
+                "p50_duration_ms": _histogram_percentile(stats["histogram"], 50),
+                "p95_duration_ms": _histogram_percentile(stats["histogram"], 95),
+                "tools": stats["tools"],
+            })
+
+        # Typical session: median calls and median per-tool usage among
+        # sessions that used the tool at all
+        calls = sorted(s["calls"] for s in sessions.values())
+        per_tool: dict[str, list[int]] = {}
+        for stats in sessions.values():
+            for tool, count in stats["tools"].items():
+                per_tool.setdefault(tool, []).append(count)
+        tool_mix = {}
+        for tool, counts in sorted(per_tool.items()):
+            counts.sort()
+            tool_mix[tool] = {
+                "sessions": len(counts),
+                "median_calls_per_session": counts[len(counts) // 2],
+                "max_calls_per_session": counts[-1],
+            }
+
+        return {
+            "period": f"Last {days} days (since {(date.today() - timedelta(days=days - 1)).isoformat()})",
+            "total_sessions": len(sessions),
+            "sort_by": sort_by,
+            "top_sessions": top,
+            "typical_session": {
+                "median_calls": calls[len(calls) // 2] if calls else 0,
+                "tool_mix": tool_mix,
+            },
+        }
+
     def purge_old_events(self, retention_days: int = 90) -> int:
         """Delete event files older than retention_days.
 
+        Each file is folded into its daily rollup first, so summaries for
+        purged days remain available from ``aggregates/``.
+
         Args:
             retention_days: Number of days to retain. Files older than
                 this are deleted.
@@ -220,22 +607,48 @@ class TelemetryCollector:
             Number of files deleted.
         """
         cutoff = date.today() - timedelta(days=retention_days)
-        deleted = 0
+        return len(self.purge_event_files(lambda file_date, _size: file_date < cutoff))
 
-        for file_path in self._events_dir().iterdir():
-            if not file_path.name.endswith(".jsonl"):
+    def purge_event_files(self, should_delete) -> list[tuple[str, int]]:
+        """Roll up and delete raw event files selected by a predicate.
+
+        Args:
+            should_delete: Callable ``(file_date, size_bytes) -> bool``,
+                called oldest-first. Today's file is never deleted.
+
+        Returns:
+            List of ``(file_name, size_bytes)`` for deleted files.
+        """
+        today = date.today()
+        candidates: list[tuple[date, str, int]] = []
+        try:
+            with os.scandir(self._events_dir()) as it:
+                for entry in it:
+                    if not entry.name.endswith(".jsonl"):
+                        continue
+                    # Parse date from filename (YYYY-MM-DD.jsonl)
+                    try:
+                        file_date = date.fromisoformat(entry.name[:-len(".jsonl")])
+                        size = entry.stat().st_size
+                    except (ValueError, OSError):
+                        continue
+                    if file_date < today:
+                        candidates.append((file_date, entry.name, size))
+        except OSError:
+            return []
+
+        deleted: list[tuple[str, int]] = []
+        for file_date, name, size in sorted(candidates):
+            if not should_delete(file_date, size):
                 continue
-            # Parse date from filename (YYYY-MM-DD.jsonl)
-            date_part = file_path.stem
+            date_str = file_date.isoformat()
+            # Downsample before deleting: fold every complete record into
+            # the rollup (a torn trailing line from a crashed writer is lost)
+            self._refresh_aggregate(date_str)
             try:
-                file_date = date.fromisoformat(date_part)
-            except ValueError:
+                os.remove(self._events_dir() / name)
+            except OSError:
                 continue
-            if file_date < cutoff:
-                try:
-                    os.remove(file_path)
-                    deleted += 1
-                except OSError:
-                    continue
-
+            self._aggregate_cache.pop(date_str, None)
+            deleted.append((name, size))
         return deleted
@@ -0,0 +1,385 @@
+"""Background retention for CQ Engine local data.
+
+Runs time- and size-based retention over everything the server accumulates
+under ~/.cq-engine/: raw telemetry events, daily rollups, caches and
+learned stores. Raw events are folded into their daily rollups before
+they are deleted, so summaries survive the purge. Learned-store entries
+past the age or size limit are moved to learned/archive/, which is
+pruned in turn, so the stores every learn call scans stay bounded.
+
+The scheduler runs in a low-priority daemon thread. Several server
+processes may share one data directory; a non-blocking lock file ensures
+only one of them performs a pass at a time, and the last-run state is
+persisted so every instance reports the same bytes-reclaimed totals.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from .collector import TelemetryCollector
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX platform — passes are not coordinated
+    fcntl = None
+
+CQ_ENGINE_HOME = Path("~/.cq-engine").expanduser()
+
+# Default retention policy. Ages are in days, sizes in bytes.
+DEFAULT_POLICY: dict[str, dict] = {
+    # Raw JSONL events: rolled up, then deleted
+    "events": {"max_age_days": 30, "max_bytes": 256 * 1024 * 1024},
+    # Daily rollups (aggregates/*.json)
+    "rollups": {"max_age_days": 365, "max_bytes": 64 * 1024 * 1024},
+    # Derived caches (~/.cq-engine/cache/), safe to rebuild
+    "caches": {"max_age_days": 7, "max_bytes": 128 * 1024 * 1024},
+    # Each learned store (learned/*.jsonl, learned/projects/*.jsonl):
+    # older or overflowing entries are moved to learned/archive/
+    "learned": {"max_age_days": 365, "max_bytes": 32 * 1024 * 1024},
+    # Archived learned entries (learned/archive/)
+    "learned_archives": {"max_age_days": 180, "max_bytes": 256 * 1024 * 1024},
+}
+
+DEFAULT_INTERVAL_SECONDS = 6 * 3600
+INITIAL_DELAY_SECONDS = 60
+STATE_FILE_NAME = "maintenance.json"
+LOCK_FILE_NAME = ".maintenance.lock"
+LOW_PRIORITY_NICENESS = 10
+# SQLite files that belong to the database named by the rest of the path.
+# Deleted first, so a crash mid-unit never leaves a journal to be replayed
+# into a new database.
+SQLITE_SIDECARS = ("-wal", "-shm", "-journal")
+
+
+def _lower_thread_priority() -> None:
+    """Lower the calling thread's scheduling priority where supported.
+
+    On Linux each thread has its own nice value, so this does not slow
+    down the event loop thread serving tool calls.
+    """
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), LOW_PRIORITY_NICENESS)
+    except (AttributeError, OSError):
+        pass
+
+
+def _prune_directory(
+    directory: Path,
+    max_age_days: int,
+    max_bytes: int,
+    suffixes: tuple[str, ...] = (),
+) -> list[tuple[str, int]]:
+    """Delete files older than max_age_days, then oldest-first until the
+    directory total fits in max_bytes.
+
+    A SQLite database and its ``-wal``/``-shm``/``-journal`` files are one
+    unit, aged by the newest of them and sized by their total: deleting a
+    WAL alone loses committed transactions. A database with a ``-shm``
+    file is open in WAL mode and is never deleted: a connection that
+    outlives the unlink would keep using the deleted files while other
+    processes build a new database.
+
+    Returns:
+        List of ``(relative_path, size_bytes)`` for deleted files.
+    """
+    if not directory.is_dir():
+        return []
+
+    # Unit path -> [newest mtime, total size, [(file, size, sidecar suffix)]]
+    units: dict[Path, list] = {}
+    for root, _dirs, names in os.walk(directory):
+        for name in names:
+            if suffixes and not name.endswith(suffixes):
+                continue
+            path = Path(root) / name
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            sidecar = next((x for x in SQLITE_SIDECARS if name.endswith(x)), None)
+            key = path.with_name(name[:-len(sidecar)]) if sidecar else path
+            unit = units.setdefault(key, [0.0, 0, []])
+            unit[0] = max(unit[0], st.st_mtime)
+            unit[1] += st.st_size
+            unit[2].append((path, st.st_size, sidecar))
+
+    cutoff = time.time() - max_age_days * 86400
+    total = sum(size for _, size, _ in units.values())
+    deleted: list[tuple[str, int]] = []
+    for key, (mtime, size, members) in sorted(units.items(), key=lambda item: item[1][0]):
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        if any(sidecar == "-shm" for _, _, sidecar in members):
+            continue
+        for path, member_size, _ in sorted(members, key=lambda m: m[2] is None):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                total -= member_size
+                continue
+            except OSError:
+                break
+            total -= member_size
+            deleted.append((str(path.relative_to(directory)), member_size))
+    return deleted
+
+
+def _entry_date(line: bytes) -> str:
+    """The ``YYYY-MM-DD`` of a learned entry's timestamp, or "" if unreadable."""
+    try:
+        return str(json.loads(line).get("timestamp", ""))[:10]
+    except (ValueError, AttributeError):
+        return ""
+
+
+def _rotate_learned_store(path: Path, archive: Path, max_age_days: int, max_bytes: int) -> tuple[int, int]:
+    """Move the leading entries of ``path`` older than ``max_age_days``, then
+    the oldest until the store fits in ``max_bytes``, to ``archive``.
+
+    Entries are appended in time order, so only a prefix is moved. Lines
+    appended while the store is rewritten are carried over; learn does not
+    lock the store, so an append in the last instant before the replace
+    can still be lost.
+
+    Returns:
+        ``(entries, bytes)`` moved.
+    """
+    cutoff = (date.today() - timedelta(days=max_age_days)).isoformat()
+    try:
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            first = f.readline()
+    except OSError:
+        return 0, 0
+    first_date = _entry_date(first)
+    if size <= max_bytes and (not first_date or first_date >= cutoff):
+        return 0, 0
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read(size)
+    except OSError:
+        return 0, 0
+    lines = data.splitlines(keepends=True)
+    if lines and not lines[-1].endswith(b"\n"):
+        # An append in progress: leave it to the next pass
+        data = data[:len(data) - len(lines.pop())]
+        size = len(data)
+    remaining = size
+    moved = 0
+    for line in lines:
+        entry_date = _entry_date(line)
+        if remaining <= max_bytes and (not entry_date or entry_date >= cutoff):
+            break
+        remaining -= len(line)
+        moved += 1
+    if not moved:
+        return 0, 0
+
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        # Archive first: a crash before the replace duplicates, never loses
+        with open(archive, "ab") as f:
+            f.write(b"".join(lines[:moved]))
+        with open(tmp, "wb") as f:
+            f.write(b"".join(lines[moved:]))
+            with open(path, "rb") as src:
+                src.seek(size)
+                f.write(src.read())
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return 0, 0
+    return moved, size - remaining
+
+
+class MaintenanceScheduler:
+    """Periodic retention pass over local CQ Engine data."""
+
+    def __init__(
+        self,
+        collector: TelemetryCollector,
+        policy: dict[str, dict] | None = None,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        cache_dir: str | Path = CQ_ENGINE_HOME / "cache",
+        learned_dir: str | Path = CQ_ENGINE_HOME / "learned",
+    ) -> None:
+        self.collector = collector
+        self.policy = {**DEFAULT_POLICY, **(policy or {})}
+        self.interval_seconds = interval_seconds
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.learned_dir = Path(learned_dir).expanduser()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _state_file(self) -> Path:
+        """Return the path of the persisted last-run state."""
+        return self.collector.storage_path / STATE_FILE_NAME
+
+    def status(self) -> dict:
+        """Return the persisted maintenance state for the health resource."""
+        try:
+            state = json.loads(self._state_file().read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {"last_run": None, "bytes_reclaimed_total": 0}
+        return state
+
+    def _purge_events(self) -> list[tuple[str, int]]:
+        """Roll up and delete raw events past the age or size limit."""
+        limits = self.policy["events"]
+        cutoff = date.today() - timedelta(days=limits["max_age_days"])
+        try:
+            total = sum(
+                entry.stat().st_size
+                for entry in os.scandir(self.collector._events_dir())
+                if entry.name.endswith(".jsonl")
+            )
+        except OSError:
+            total = 0
+        budget = {"remaining": total}
+
+        def should_delete(file_date: date, size: int) -> bool:
+            # Called oldest-first: age limit, then trim oldest until under size
+            if file_date < cutoff or budget["remaining"] > limits["max_bytes"]:
+                budget["remaining"] -= size
+                return True
+            return False
+
+        return self.collector.purge_event_files(should_delete)
+
+    def _rotate_learned(self) -> dict[str, int]:
+        """Move old and overflowing learned entries to learned/archive/."""
+        limits = self.policy["learned"]
+        archive_dir = self.learned_dir / "archive"
+        today = date.today().isoformat()
+        entries = moved_bytes = 0
+        stores = sorted(self.learned_dir.glob("*.jsonl")) + sorted(self.learned_dir.glob("projects/*.jsonl"))
+        for store in stores:
+            relative = store.relative_to(self.learned_dir).with_suffix("")
+            archive = archive_dir / relative.parent / f"{relative.name}.{today}.jsonl"
+            n, size = _rotate_learned_store(store, archive, limits["max_age_days"], limits["max_bytes"])
+            entries += n
+            moved_bytes += size
+        return {"entries_archived": entries, "bytes_archived": moved_bytes}
+
+    def run_once(self) -> dict:
+        """Run one retention pass and persist its report.
+
+        Returns:
+            Report with files and bytes reclaimed per target, or
+            ``{"skipped": ...}`` if another process holds the lock.
+        """
+        self.collector.ensure_storage()
+        lock_path = self.collector.storage_path / LOCK_FILE_NAME
+        try:
+            lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return {"skipped": "lock file unavailable"}
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return {"skipped": "another process is running maintenance"}
+
+            start = time.time()
+            # Before the archive is pruned, so its sizes include this pass
+            learned = self._rotate_learned()
+            results = {
+                "events": self._purge_events(),
+                "rollups": _prune_directory(
+                    self.collector._aggregates_dir(),
+                    self.policy["rollups"]["max_age_days"],
+                    self.policy["rollups"]["max_bytes"],
+                    suffixes=(".json",),
+                ),
+                "caches": _prune_directory(
+                    self.cache_dir,
+                    self.policy["caches"]["max_age_days"],
+                    self.policy["caches"]["max_bytes"],
+                ),
+                "learned_archives": _prune_directory(
+                    self.learned_dir / "archive",
+                    self.policy["learned_archives"]["max_age_days"],
+                    self.policy["learned_archives"]["max_bytes"],
+                    suffixes=(".jsonl",),
+                ),
+            }
+
+            by_target = {
+                target: {
+                    "files_deleted": len(deleted),
+                    "bytes_reclaimed": sum(size for _, size in deleted),
+                }
+                for target, deleted in results.items()
+            }
+            reclaimed = sum(t["bytes_reclaimed"] for t in by_target.values())
+            previous_total = self.status().get("bytes_reclaimed_total", 0)
+
+            report = {
+                "last_run": datetime.now(timezone.utc).isoformat(),
+                "duration_ms": int((time.time() - start) * 1000),
+                "bytes_reclaimed_last_run": reclaimed,
+                "bytes_reclaimed_total": previous_total + reclaimed,
+                "by_target": by_target,
+                "learned": learned,
+            }
+            tmp = self._state_file().with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp.write_text(json.dumps(report, indent=2), encoding="utf-8")
+                os.replace(tmp, self._state_file())
+            except OSError:
+                pass
+            return report
+        finally:
+            os.close(lock_fd)
+
+    def _due(self) -> bool:
+        """Check whether the persisted last run is older than the interval."""
+        last_run = self.status().get("last_run")
+        if not last_run:
+            return True
+        try:
+            elapsed = datetime.now(timezone.utc) - datetime.fromisoformat(last_run)
+        except ValueError:
+            return True
+        return elapsed.total_seconds() >= self.interval_seconds
+
+    def _loop(self, initial_delay: float) -> None:
+        """Background thread body: wait, run if due, repeat until stopped."""
+        _lower_thread_priority()
+        if self._stop.wait(initial_delay):
+            return
+        while not self._stop.is_set():
+            if self._due():
+                try:
+                    self.run_once()
+                except Exception:
+                    # Maintenance must never take the server down
+                    pass
+            self._stop.wait(self.interval_seconds)
+
+    def start(self, initial_delay: float = INITIAL_DELAY_SECONDS) -> None:
+        """Start the background maintenance thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop,
+            args=(initial_delay,),
+            name="cq-engine-maintenance",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the background thread to exit."""
+        self._stop.set()
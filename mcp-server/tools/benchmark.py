@@ -0,0 +1,774 @@
+"""CQ Benchmark scoring: the 12 sub-metrics and the CQ Score from local data.
+
+``benchmark/spec.md`` and ``benchmark/measures/*.md`` define four axes of
+three sub-metrics each. This module computes them from what CQ Engine
+already records, without model calls:
+
+- Context Health (CH-1..3): ``gate`` signals in the telemetry rollups —
+  the share of selected tokens at relevance 0.3 or more, one minus the
+  contamination risk, and the gate's freshness
+- Decision Quality (DQ-1..3): ``thinktank`` signals — independent
+  perspectives against ``EXPECTED_PERSPECTIVES``, anchoring (passes run
+  in parallel, so 1.0 whenever ThinkTank ran) and how many MutaDoc
+  strategies the panel's lenses cover
+- Document Integrity (DI-1..3): the mutate engine over every document in
+  the project — kill rate, contradictions per section, ambiguous lines
+  per statement line
+- Evolution (EV-1..3): cqlint passes over applicable checks per YAML
+  config, actionable learnings per session, and failure learnings that
+  repeat an earlier one
+
+A project is scanned in one pass. Per-file results live in SQLite under
+~/.cq-engine/benchmark/ and only files whose mtime or size changed are
+re-analyzed; learned stores are folded from the byte offset of the last
+call, and telemetry is already rolled up per day. Each score is recorded
+in the same database, so ``benchmark_trend`` can report how it moves.
+The database holds the only copy of that history, so it is kept outside
+~/.cq-engine/cache/, which maintenance prunes.
+
+Sub-metrics without data are null, as the spec requires, and the
+weights of the rest are renormalized.
+
+Zero-infrastructure: standard library only.
+"""
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from telemetry.collector import TelemetryCollector
+
+from . import learn
+from .cqlint_tool import CQLINT_PATH
+from .document import MappedDocument, read_document
+from .facts import DOCUMENT_SUFFIXES, _prefix_bounds
+from .mutate import run_mutations
+from .response import render
+
+BENCHMARK_DB = Path("~/.cq-engine/benchmark/benchmark.db").expanduser()
+
+# Files checked with cqlint
+CONFIG_SUFFIXES = (".yaml", ".yml")
+# Directories skipped by the scan, besides hidden ones
+SKIP_DIRS = frozenset({"node_modules", "__pycache__"})
+# Directories that satisfy cqlint's project-level CQ005 check
+LEARNING_DIRS = ("memory", "learned", "experience", "knowledge", "learnings", "lp")
+
+AXES = ("context_health", "decision_quality", "document_integrity", "evolution")
+
+# Sub-metric ID -> (axis, name)
+METRICS: dict[str, tuple[str, str]] = {
+    "CH-1": ("context_health", "Information Density"),
+    "CH-2": ("context_health", "Contamination Level"),
+    "CH-3": ("context_health", "Freshness"),
+    "DQ-1": ("decision_quality", "Perspective Diversity"),
+    "DQ-2": ("decision_quality", "Anchoring Elimination"),
+    "DQ-3": ("decision_quality", "Blind-Spot Coverage"),
+    "DI-1": ("document_integrity", "Mutation Kill Rate"),
+    "DI-2": ("document_integrity", "Contradiction Count"),
+    "DI-3": ("document_integrity", "Ambiguity Score"),
+    "EV-1": ("evolution", "Pattern Conformance"),
+    "EV-2": ("evolution", "Learning Accumulation Rate"),
+    "EV-3": ("evolution", "Recurrence Rate"),
+}
+
+# Default weights from spec.md §2.1 and the measures/*.md aggregation sections
+AXIS_WEIGHTS = {"context_health": 0.25, "decision_quality": 0.30, "document_integrity": 0.25, "evolution": 0.20}
+METRIC_WEIGHTS = {
+    "CH-1": 0.40, "CH-2": 0.35, "CH-3": 0.25,
+    "DQ-1": 0.35, "DQ-2": 0.30, "DQ-3": 0.35,
+    "DI-1": 0.45, "DI-2": 0.30, "DI-3": 0.25,
+    "EV-1": 0.30, "EV-2": 0.30, "EV-3": 0.40,
+}
+
+GRADES = ((0.80, "A"), (0.60, "B"), (0.40, "C"), (0.20, "D"), (0.0, "F"))
+
+# Perspectives expected of a medium-complexity decision (DQ-1)
+EXPECTED_PERSPECTIVES = 4
+# Each contradiction per section costs this much of DI-2
+CONTRADICTION_PENALTY = 5.0
+# Learnings per task that score 1.0 on EV-2
+TARGET_LEARNING_RATE = 0.3
+# Learnings below this confidence are not actionable
+ACTIONABLE_CONFIDENCE = 0.5
+# A failure learning this similar to an earlier one is a recurrence
+# (learn's duplicate threshold)
+RECURRENCE_SIMILARITY = 0.6
+# Below these sample sizes EV-2 / EV-3 are marked provisional
+MIN_TASKS = 5
+MIN_FAILURES = 3
+
+# Changed files analyzed between commits, so a pass cut off by its
+# deadline keeps its progress
+COMMIT_EVERY = 200
+CQLINT_WORKERS = 4
+CQLINT_TIMEOUT_SECONDS = 30
+# Weakest documents listed in the result
+WEAKEST_DOCUMENTS = 5
+
+_CQLINT_COUNTS_RE = re.compile(r'"errors":(\d+),"warnings":(\d+),"passes":(\d+)')
+
+# Bump when the schema or a per-file metric changes; cached results are
+# rebuilt, recorded scores are kept
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    metrics TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS streams (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    root TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    cq_score REAL,
+    axes TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    PRIMARY KEY (root, recorded_at)
+) WITHOUT ROWID;
+"""
+
+
+# ============================================================
+# Per-file metrics
+# ============================================================
+def document_metrics(content: "str | MappedDocument") -> dict[str, int]:
+    """Mutation, contradiction and ambiguity counts for one document."""
+    run = run_mutations(content)
+    mutations = run["mutations"]
+    lines = content.split("\n") if isinstance(content, str) else content
+    return {
+        "mutations": len(mutations),
+        "detected": sum(1 for m in mutations if m.get("detected", False)),
+        "contradictions": sum(1 for m in mutations if m["strategy"] == "contradiction"),
+        "sections": max(1, run["sections_analyzed"]),
+        "ambiguous": len({m["location"]["line"] for m in mutations if m["strategy"] == "ambiguity"}),
+        "statements": sum(1 for line in lines if line.strip() and not line.startswith("#")),
+    }
+
+
+def config_metrics(path: str) -> dict[str, int] | None:
+    """cqlint passes and violations for one config file; None if cqlint failed."""
+    try:
+        proc = subprocess.run(
+            ["bash", str(CQLINT_PATH), "check", path, "--format", "json"],
+            capture_output=True, text=True, timeout=CQLINT_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    # The results array is not always valid JSON (messages are not
+    # escaped); the counts that precede it are
+    m = _CQLINT_COUNTS_RE.search(proc.stdout)
+    if m is None:
+        return None
+    errors, warnings, passes = (int(g) for g in m.groups())
+    return {"passes": passes, "violations": errors + warnings}
+
+
+def _has_learning_dir(root: str) -> bool:
+    for name in LEARNING_DIRS:
+        for _, _, filenames in os.walk(os.path.join(root, name)):
+            if filenames:
+                return True
+    return False
+
+
+# ============================================================
+# Learned stores
+# ============================================================
+def _empty_stream() -> dict[str, Any]:
+    # days: date -> [learnings, actionable, failures, recurring]
+    return {"days": {}, "failures": []}
+
+
+def _ordered(tokens: set[str]) -> list[str]:
+    # Longest first: short, common words fall outside the prefix
+    return sorted(tokens, key=lambda t: (-len(t), t))
+
+
+def _prefix(tokens: list[str]) -> list[str]:
+    """Prefix filter: ``_ordered`` token lists with Jaccard >= the
+    recurrence threshold share at least one token of their prefixes."""
+    n = len(tokens)
+    return tokens[:n - math.ceil(RECURRENCE_SIMILARITY * n - 1e-9) + 1]
+
+
+def _similar(a: set[str], b: set[str]) -> bool:
+    """Jaccard similarity above the recurrence threshold (as in learn,
+    with the union size taken from the intersection)."""
+    common = len(a & b)
+    return common > 0 and common / (len(a) + len(b) - common) > RECURRENCE_SIMILARITY
+
+
+def _fold_learnings(path: Path, offset: int, state: dict[str, Any]) -> int:
+    """Fold complete lines after ``offset`` into ``state``; return the new offset.
+
+    Each failure is compared only with the earlier failures that share a
+    prefix token, not with all of them.
+    """
+    failures = [set(tokens) for tokens in state["failures"]]
+    by_prefix: dict[str, list[int]] = {}
+    for i, tokens in enumerate(state["failures"]):
+        for token in _prefix(tokens):
+            by_prefix.setdefault(token, []).append(i)
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Partial line still being written
+                offset += len(raw)
+                try:
+                    entry = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                day = state["days"].setdefault(str(entry.get("timestamp", ""))[:10], [0, 0, 0, 0])
+                day[0] += 1
+                if entry.get("confidence", 0) >= ACTIONABLE_CONFIDENCE:
+                    day[1] += 1
+                if entry.get("category") == "failure":
+                    tokens = _ordered(learn._tokenize(entry.get("observation", "")))
+                    token_set = set(tokens)
+                    day[2] += 1
+                    candidates = {i for token in _prefix(tokens) for i in by_prefix.get(token, ())}
+                    if any(_similar(token_set, failures[i]) for i in candidates):
+                        day[3] += 1
+                    for token in _prefix(tokens):
+                        by_prefix.setdefault(token, []).append(len(failures))
+                    failures.append(token_set)
+                    state["failures"].append(tokens)
+    except OSError:
+        pass
+    return offset
+
+
+# ============================================================
+# Index
+# ============================================================
+class BenchmarkIndex:
+    """Cached per-file metrics, learned-store folds and recorded scores."""
+
+    def __init__(self, db_path: str | Path = BENCHMARK_DB) -> None:
+        self.db_path = Path(db_path).expanduser()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        # Connect on first use so importing the tool creates no files
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS streams;")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def scan(self, project_dir: str | Path) -> dict[str, Any]:
+        """One pass over a project: document and config totals.
+
+        Files whose fingerprint is unchanged contribute their cached
+        metrics; the rest are analyzed (configs by cqlint, in parallel
+        with the document analysis). Files that disappeared are removed
+        from the cache.
+        """
+        root = str(Path(project_dir).resolve())
+        lint = CQLINT_PATH.is_file()
+        totals = dict.fromkeys((
+            "documents", "mutations", "detected", "contradictions", "sections", "ambiguous",
+            "statements", "configs", "rule_passes", "rule_checks",
+        ), 0)
+        counts = {"analyzed": 0, "unchanged": 0, "removed": 0}
+        weakest: list[tuple[int, str, dict[str, int]]] = []
+
+        def add(path: str, metrics: dict[str, int]) -> None:
+            if "mutations" in metrics:
+                totals["documents"] += 1
+                for key in ("mutations", "detected", "contradictions", "sections", "ambiguous", "statements"):
+                    totals[key] += metrics[key]
+                survived = metrics["mutations"] - metrics["detected"]
+                if survived:
+                    item = (survived, os.path.relpath(path, root), metrics)
+                    if len(weakest) < WEAKEST_DOCUMENTS:
+                        heapq.heappush(weakest, item)
+                    else:
+                        heapq.heappushpop(weakest, item)
+            else:
+                totals["configs"] += 1
+                totals["rule_passes"] += metrics["passes"]
+                totals["rule_checks"] += metrics["passes"] + metrics["violations"]
+
+        def store(db: sqlite3.Connection, path: str, fingerprint: tuple[int, int], metrics: dict[str, int]) -> None:
+            db.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, metrics) VALUES (?, ?, ?, ?)",
+                (path, *fingerprint, json.dumps(metrics)),
+            )
+            counts["analyzed"] += 1
+            if counts["analyzed"] % COMMIT_EVERY == 0:
+                db.commit()
+
+        seen: set[str] = set()
+        with self._lock, ThreadPoolExecutor(max_workers=CQLINT_WORKERS) as pool:
+            db = self._db()
+            linting = []
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS]
+                for name in filenames:
+                    is_doc = name.endswith(DOCUMENT_SUFFIXES)
+                    if not is_doc and not (lint and name.endswith(CONFIG_SUFFIXES)):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    seen.add(path)
+                    fingerprint = (st.st_mtime_ns, st.st_size)
+                    row = db.execute("SELECT mtime_ns, size, metrics FROM files WHERE path = ?", (path,)).fetchone()
+                    if row is not None and tuple(row[:2]) == fingerprint:
+                        counts["unchanged"] += 1
+                        add(path, json.loads(row[2]))
+                    elif not is_doc:
+                        linting.append((path, fingerprint, pool.submit(config_metrics, path)))
+                    else:
+                        try:
+                            content = read_document(path)
+                        except (OSError, UnicodeDecodeError):
+                            continue
+                        try:
+                            metrics = document_metrics(content)
+                        finally:
+                            if isinstance(content, MappedDocument):
+                                content.close()
+                        store(db, path, fingerprint, metrics)
+                        add(path, metrics)
+            for path, fingerprint, future in linting:
+                metrics = future.result()
+                if metrics is not None:
+                    store(db, path, fingerprint, metrics)
+                    add(path, metrics)
+
+            low, high = _prefix_bounds(root)
+            for (path,) in db.execute("SELECT path FROM files WHERE path >= ? AND path < ?", (low, high)).fetchall():
+                if path not in seen:
+                    db.execute("DELETE FROM files WHERE path = ?", (path,))
+                    counts["removed"] += 1
+            db.commit()
+
+        if lint:
+            # Project-level CQ005: applies once per project
+            totals["rule_checks"] += 1
+            totals["rule_passes"] += _has_learning_dir(root)
+        return {
+            "root": root,
+            "cqlint": lint,
+            "totals": totals,
+            "files": counts,
+            "weakest_documents": [
+                {"path": rel, "survived": survived, "mutations": metrics["mutations"],
+                 "contradictions": metrics["contradictions"]}
+                for survived, rel, metrics in sorted(weakest, reverse=True)
+            ],
+        }
+
+    def learned_stats(self, paths: list[Path], days: int) -> dict[str, Any]:
+        """Learning counts over the last ``days`` days, folding only new lines."""
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        window = [0, 0, 0, 0]
+        stores = 0
+        with self._lock:
+            db = self._db()
+            for path in paths:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                size = st.st_size
+                stores += 1
+                key = str(path.resolve())
+                row = db.execute("SELECT offset, state FROM streams WHERE path = ?", (key,)).fetchone()
+                offset, state = (row[0], json.loads(row[1])) if row else (0, _empty_stream())
+                if size < offset or state.get("inode", st.st_ino) != st.st_ino:
+                    # Store was truncated or replaced (maintenance moves old
+                    # entries to learned/archive/): fold it again
+                    offset, state = 0, _empty_stream()
+                if size > offset or "inode" not in state:
+                    state["inode"] = st.st_ino
+                    offset = _fold_learnings(path, offset, state)
+                    db.execute(
+                        "INSERT OR REPLACE INTO streams (path, offset, state) VALUES (?, ?, ?)",
+                        (key, offset, json.dumps(state)),
+                    )
+                for day, row_counts in state["days"].items():
+                    if day >= since:
+                        window = [a + b for a, b in zip(window, row_counts)]
+            db.commit()
+        return dict(zip(("learnings", "actionable", "failures", "recurring"), window), stores=stores)
+
+    # --- Time series ---
+
+    def record(self, root: str, cq_score: float | None, axes: dict[str, Any], metrics: dict[str, Any]) -> str:
+        recorded_at = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO scores (root, recorded_at, cq_score, axes, metrics) VALUES (?, ?, ?, ?, ?)",
+                    (root, recorded_at, cq_score, json.dumps(axes), json.dumps(metrics)),
+                )
+        return recorded_at
+
+    def history(self, root: str, limit: int) -> list[dict[str, Any]]:
+        """The last ``limit`` recorded scores of ``root``, oldest first."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT recorded_at, cq_score, axes, metrics FROM scores WHERE root = ? "
+                "ORDER BY recorded_at DESC LIMIT ?",
+                (root, limit),
+            ).fetchall()
+        return [
+            {"recorded_at": at, "cq_score": score, "axes": json.loads(axes), "metrics": json.loads(metrics)}
+            for at, score, axes, metrics in reversed(rows)
+        ]
+
+
+# ============================================================
+# Scoring
+# ============================================================
+def _ratio(numerator: float, denominator: float) -> float | None:
+    return numerator / denominator if denominator else None
+
+
+def _mean(signals: dict[str, dict], name: str) -> float | None:
+    stats = signals.get(name)
+    return stats["mean"] if stats else None
+
+
+def compute_metrics(scan: dict[str, Any], quality: dict[str, Any], learned: dict[str, Any]) -> dict[str, dict]:
+    """The 12 sub-metrics (score in [0, 1] or None) with the counts behind them."""
+    signals = quality["signals"]
+    gate_calls = signals.get("gate.freshness", {}).get("count", 0)
+    thinktank_runs = signals.get("thinktank.strategy_coverage", {}).get("count", 0)
+    t = scan["totals"]
+    contamination = _mean(signals, "gate.contamination_risk")
+    perspectives = _mean(signals, "thinktank.independent_perspectives")
+    kill_rate = _ratio(t["detected"], t["mutations"])
+    density = _ratio(t["contradictions"], t["sections"])
+    ambiguity = _ratio(t["ambiguous"], t["statements"])
+    rate = _ratio(learned["actionable"], quality["sessions"])
+
+    metrics: dict[str, dict] = {
+        "CH-1": {"score": _mean(signals, "gate.relevant_token_share"), "gate_calls": gate_calls},
+        "CH-2": {"score": None if contamination is None else 1.0 - contamination, "gate_calls": gate_calls},
+        "CH-3": {"score": _mean(signals, "gate.freshness"), "gate_calls": gate_calls},
+        "DQ-1": {
+            "score": None if perspectives is None else min(1.0, perspectives / EXPECTED_PERSPECTIVES),
+            "mean_independent_perspectives": perspectives,
+            "expected_perspectives": EXPECTED_PERSPECTIVES,
+        },
+        # ThinkTank's first wave runs every persona on the same input, in
+        # parallel: the spec scores that 1.0 by construction
+        "DQ-2": {"score": 1.0 if thinktank_runs else None, "thinktank_runs": thinktank_runs},
+        "DQ-3": {"score": _mean(signals, "thinktank.strategy_coverage"), "thinktank_runs": thinktank_runs},
+        "DI-1": {
+            # No mutations at all is a perfect kill score, as in mutate
+            "score": None if not t["documents"] else 1.0 if kill_rate is None else kill_rate,
+            "documents": t["documents"],
+            "mutations": t["mutations"],
+            "detected": t["detected"],
+        },
+        "DI-2": {
+            "score": None if density is None else max(0.0, 1.0 - density * CONTRADICTION_PENALTY),
+            "contradictions": t["contradictions"],
+            "sections": t["sections"],
+        },
+        "DI-3": {
+            "score": None if ambiguity is None else 1.0 - ambiguity,
+            "ambiguous_statements": t["ambiguous"],
+            "statements": t["statements"],
+        },
+        "EV-1": {
+            "score": (_ratio(t["rule_passes"], t["rule_checks"]) if t["rule_checks"] else 1.0)
+            if scan["cqlint"] else None,
+            "configs": t["configs"],
+            "passing_checks": t["rule_passes"],
+            "applicable_checks": t["rule_checks"],
+        },
+        "EV-2": {
+            "score": None if rate is None else min(1.0, rate / TARGET_LEARNING_RATE),
+            "actionable_learnings": learned["actionable"],
+            "tasks": quality["sessions"],
+        },
+        "EV-3": {
+            "score": 1.0 - learned["recurring"] / learned["failures"] if learned["failures"] else 1.0,
+            "failures": learned["failures"],
+            "recurring": learned["recurring"],
+        },
+    }
+    if not scan["cqlint"]:
+        metrics["EV-1"]["note"] = "cqlint not installed"
+    if rate is None:
+        metrics["EV-2"]["note"] = "no telemetry sessions in the period"
+    elif quality["sessions"] < MIN_TASKS:
+        metrics["EV-2"]["provisional"] = True
+    if not learned["failures"]:
+        metrics["EV-3"]["note"] = "insufficient failure data"
+    elif learned["failures"] < MIN_FAILURES:
+        metrics["EV-3"]["provisional"] = True
+    for entry in metrics.values():
+        if entry["score"] is not None:
+            entry["score"] = round(entry["score"], 3)
+    return metrics
+
+
+def resolve_weights(weights: dict[str, float] | None) -> tuple[dict[str, float], dict[str, float]]:
+    """Axis and sub-metric weights with ``weights`` applied over the defaults.
+
+    Keys are axis names or sub-metric IDs; weights within a group need not
+    sum to 1.
+
+    Raises:
+        ValueError: For an unknown key or a negative weight.
+    """
+    axis_weights, metric_weights = dict(AXIS_WEIGHTS), dict(METRIC_WEIGHTS)
+    for key, value in (weights or {}).items():
+        if key not in AXIS_WEIGHTS and key not in METRIC_WEIGHTS:
+            raise ValueError(f"Unknown weight '{key}'. Valid: {', '.join((*AXES, *METRICS))}")
+        if not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"Weight '{key}' must be a non-negative number")
+        (axis_weights if key in AXIS_WEIGHTS else metric_weights)[key] = float(value)
+    return axis_weights, metric_weights
+
+
+def _weighted(scores: dict[str, float | None], weights: dict[str, float]) -> float | None:
+    """Weighted mean of the scores that are not None."""
+    total = sum(weights[k] for k, s in scores.items() if s is not None)
+    if not total:
+        return None
+    return sum(weights[k] * s for k, s in scores.items() if s is not None) / total
+
+
+def cq_score(
+    metrics: dict[str, dict], axis_weights: dict[str, float], metric_weights: dict[str, float],
+) -> tuple[float | None, dict[str, float | None]]:
+    """The CQ Score and the axis scores, over the measured sub-metrics."""
+    axes = {
+        axis: _weighted({m: metrics[m]["score"] for m, (a, _) in METRICS.items() if a == axis}, metric_weights)
+        for axis in AXES
+    }
+    axes = {axis: None if s is None else round(s, 3) for axis, s in axes.items()}
+    overall = _weighted(axes, axis_weights)
+    return (None if overall is None else round(overall, 3)), axes
+
+
+def grade(score: float | None) -> str | None:
+    if score is None:
+        return None
+    return next(letter for floor, letter in GRADES if score >= floor)
+
+
+def _slope_per_day(points: list[tuple[float, float]]) -> float | None:
+    """Least-squares slope of (day, value) points."""
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def trend(history: list[dict[str, Any]]) -> dict[str, Any]:
+    """Change since the first record and slope per day, overall and per axis."""
+    def series(get) -> dict[str, float | None]:
+        points = [
+            (datetime.fromisoformat(h["recorded_at"]).timestamp() / 86400, get(h))
+            for h in history if get(h) is not None
+        ]
+        if not points:
+            return {"change": None, "slope_per_day": None}
+        slope = _slope_per_day(points)
+        return {
+            "change": round(points[-1][1] - points[0][1], 3),
+            "slope_per_day": None if slope is None else round(slope, 4),
+        }
+
+    return {
+        "cq_score": series(lambda h: h["cq_score"]),
+        **{axis: series(lambda h, axis=axis: h["axes"].get(axis)) for axis in AXES},
+    }
+
+
+# ============================================================
+# Assessment
+# ============================================================
+_INDEX = BenchmarkIndex()
+_TELEMETRY = TelemetryCollector()
+
+
+def assess(
+    project_dir: str | Path,
+    days: int = 30,
+    weights: dict[str, float] | None = None,
+    project: str = "",
+    record: bool = True,
+) -> dict[str, Any]:
+    """Score a project: scan it, read the signals and learned stores, combine.
+
+    Raises:
+        ValueError: For invalid weights.
+        sqlite3.Error: If the benchmark database cannot be used.
+    """
+    axis_weights, metric_weights = resolve_weights(weights)
+    days = max(1, days)
+    scan = _INDEX.scan(project_dir)
+    quality = _TELEMETRY.get_quality_summary(days)
+    stores = [learn._get_storage_path("")] + ([learn._get_storage_path(project)] if project else [])
+    learned = _INDEX.learned_stats(stores, days)
+
+    metrics = compute_metrics(scan, quality, learned)
+    overall, axes = cq_score(metrics, axis_weights, metric_weights)
+    scores = {m: entry["score"] for m, entry in metrics.items()}
+    previous = _INDEX.history(scan["root"], 1)
+    recorded_at = _INDEX.record(scan["root"], overall, axes, scores) if record else None
+    last = previous[-1]["cq_score"] if previous else None
+
+    return {
+        "project_dir": str(project_dir),
+        "cq_score": overall,
+        "grade": grade(overall),
+        "axes": {
+            axis: {"score": axes[axis], "weight": axis_weights[axis]} for axis in AXES
+        },
+        "metrics": [
+            {"id": m, "axis": axis, "name": name, "weight": metric_weights[m], **metrics[m]}
+            for m, (axis, name) in METRICS.items()
+        ],
+        "coverage": {"measured": sum(1 for s in scores.values() if s is not None), "total": len(METRICS)},
+        "trend": {
+            "previous": last,
+            "change": None if last is None or overall is None else round(overall - last, 3),
+            "recorded_at": recorded_at,
+        },
+        "scan": {**scan["files"], "documents": scan["totals"]["documents"], "configs": scan["totals"]["configs"]},
+        "weakest_documents": scan["weakest_documents"],
+        "period": quality["period"],
+    }
+
+
+# ============================================================
+# Tools
+# ============================================================
+async def benchmark(
+    project_dir: str,
+    days: int = 30,
+    weights: dict[str, float] | None = None,
+    project: str = "",
+    record: bool = True,
+    response_format: str = "pretty",
+) -> str:
+    """Compute the CQ Benchmark score of a project (4 axes, 12 sub-metrics).
+
+    Document Integrity and Pattern Conformance come from one pass over the
+    project (mutation testing of .md/.markdown/.txt files, cqlint on YAML
+    configs), re-analyzing only files changed since the last call. Context
+    Health and Decision Quality come from the telemetry of gate and
+    thinktank calls, learning rates from the learned stores. Sub-metrics
+    without data are null and left out of the weighting. Each score is
+    recorded for benchmark_trend.
+
+    Args:
+        project_dir: Root directory of the project.
+        days: Period of telemetry and learnings to include (default: 30).
+        weights: Optional weights by axis name (context_health,
+            decision_quality, document_integrity, evolution) or sub-metric
+            ID (e.g. "DI-1"), replacing the spec defaults.
+        project: Learned-store project scope to include besides the
+            global store (as in learn).
+        record: Record the score in the time series (default: true).
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact; sub-metric scores only).
+    """
+    start = time.time()
+
+    if not Path(project_dir).is_dir():
+        return json.dumps({"error": f"Not a directory: {project_dir}"}, indent=2)
+    try:
+        result = assess(project_dir, days, weights, project, record)
+    except ValueError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    except sqlite3.Error as e:
+        return json.dumps({"error": f"Benchmark database error: {e}"}, indent=2)
+
+    result["elapsed_ms"] = round((time.time() - start) * 1000, 1)
+    return render(result, response_format, _minimal)
+
+
+async def benchmark_trend(
+    project_dir: str,
+    limit: int = 30,
+    response_format: str = "pretty",
+) -> str:
+    """Show how a project's CQ Benchmark score has moved over its recorded runs.
+
+    Returns the last recorded scores (overall and per axis), the change
+    since the first of them and a least-squares slope per day. Scores are
+    recorded by the benchmark tool.
+
+    Args:
+        project_dir: Root directory of the project, as passed to benchmark.
+        limit: Number of most recent records to include (default: 30).
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact; history without
+            sub-metric scores).
+    """
+    root = str(Path(project_dir).resolve())
+    try:
+        history = _INDEX.history(root, max(1, limit))
+    except sqlite3.Error as e:
+        return json.dumps({"error": f"Benchmark database error: {e}"}, indent=2)
+
+    for entry in history:
+        entry["grade"] = grade(entry["cq_score"])
+    return render({
+        "project_dir": project_dir,
+        "records": len(history),
+        "history": history,
+        "trend": trend(history),
+    }, response_format, _minimal_trend)
+
+
+def _minimal(result: dict[str, Any]) -> dict[str, Any]:
+    """Minimal response: sub-metric scores by ID, without counts or documents."""
+    out = {k: v for k, v in result.items() if k != "weakest_documents"}
+    out["metrics"] = {m["id"]: m["score"] for m in result["metrics"]}
+    return out
+
+
+def _minimal_trend(result: dict[str, Any]) -> dict[str, Any]:
+    """Minimal response: history without sub-metric scores."""
+    out = dict(result)
+    out["history"] = [{k: v for k, v in h.items() if k != "metrics"} for h in result["history"]]
+    return out
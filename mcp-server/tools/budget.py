@@ -0,0 +1,329 @@
+"""Output budgets: tool responses that fit the caller's remaining context.
+
+A ``mutate`` run over a long document, ``gate`` over a large file list or
+``cqlint`` over a whole tree can return more than the agent has room for.
+``OutputBudget.wrap`` gives every tool a ``max_output_tokens`` argument.
+When the response would exceed it:
+
+1. fields that only restate the rest (``formatted``, ``dependency_graph``)
+   are dropped
+2. the tool's main list is ranked (severity first, survivors before
+   killed mutations) and cut to the items that fit, with lists that
+   repeat those items (``surviving_mutations``) cut to match
+3. a ``continuation`` object reports what was left out, counted by
+   severity, kind or rule, and a cursor for the ``page`` tool
+
+The full result stays in a bounded LRU cache in the server process, so
+paging never re-runs the analysis. Tokens are estimated as characters / 4.
+With a budget, ``minimal`` output applies the tool's minimizer without
+its list caps: the budget bounds the response instead, and every item
+stays reachable through ``page``.
+
+Tools without a main list (``persona``, ``benchmark``) return small
+responses of fixed shape; they accept ``max_output_tokens`` and return
+their response whole.
+
+Zero-infrastructure: standard library only.
+"""
+import importlib
+import inspect
+import json
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from .response import dumps_compact, render, uncapped
+
+CHARS_PER_TOKEN = 4
+
+# Tool -> how its response is cut down to a budget:
+# - list: the list paged through
+# - rank: (field, values in order) pairs; items sort by each in turn
+# - group: field counted in the summary of items left out
+# - linked: lists holding some of the same items (matched by "id")
+# - drop: fields removed before paging
+# - ensure_ascii: as the tool renders pretty output
+# - minimal: the tool's minimizer ("module.function" in this package)
+PAGED_LISTS: dict[str, dict[str, Any]] = {
+    "mutate": {
+        "list": "mutations",
+        "rank": (("severity", ("critical", "major", "minor", "info")), ("detected", (False, True))),
+        "group": "severity",
+        "linked": ("surviving_mutations", "surviving_ids"),
+        "minimal": "mutate._minimal",
+    },
+    "conflicts": {
+        "list": "conflicts",
+        "rank": (("severity", ("critical", "major")),),
+        "group": "kind",
+        "minimal": "facts._minimal",
+    },
+    "thinktank": {
+        "list": "findings",
+        "rank": (("severity", ("critical", "major", "minor", "info")),),
+        "group": "severity",
+        "drop": ("waves",),
+        "minimal": "thinktank._minimal",
+    },
+    "cqlint": {
+        "list": "violations",
+        "rank": (("severity", ("error", "warning", "info")),),
+        "group": "rule",
+        "drop": ("formatted",),
+        "minimal": "cqlint_tool._minimal",
+    },
+    "gate": {"list": "excluded_files", "minimal": "gate._minimal"},
+    "decompose": {"list": "subtasks", "drop": ("dependency_graph",), "minimal": "decompose._minimal"},
+    "persona_batch": {"list": "assignments", "group": "persona", "minimal": "persona._minimal_batch"},
+    "search": {"list": "results", "group": "kind", "minimal": "search._minimal"},
+    "learn": {"list": "related_learnings", "ensure_ascii": False},
+    "benchmark_trend": {"list": "history", "minimal": "benchmark._minimal_trend"},
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _item_chars(item: Any, response_format: str, ensure_ascii: bool) -> int:
+    """Characters an item adds to a list one level below the top-level object."""
+    if response_format == "pretty":
+        text = json.dumps(item, indent=2, ensure_ascii=ensure_ascii)
+        # Each line gains two levels of indentation, plus the ",\n" separator
+        return len(text) + 4 * (text.count("\n") + 1) + 2
+    return len(dumps_compact(item)) + 1
+
+
+def _minimizer(spec: dict[str, Any]):
+    """The tool's minimizer named in ``spec``, or None."""
+    if not spec.get("minimal"):
+        return None
+    module, _, name = spec["minimal"].rpartition(".")
+    return getattr(importlib.import_module(f".{module}", __package__), name)
+
+
+def _rank_key(rank: tuple) -> Any:
+    def key(item: dict[str, Any]) -> tuple:
+        return tuple(
+            order.index(item.get(field)) if item.get(field) in order else len(order)
+            for field, order in rank
+        )
+    return key
+
+
+class OutputBudget:
+    """Cuts tool responses to ``max_output_tokens`` and pages through the rest.
+
+    ``max_entries`` and ``max_cached_chars`` bound the cache of truncated
+    results; the least recently paged result is evicted first, and its
+    cursors expire.
+    """
+
+    def __init__(self, max_entries: int = 32, max_cached_chars: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_cached_chars = max_cached_chars
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+        self._cached_chars = 0
+
+    # --- Cache ---
+
+    def _store(self, entry: dict[str, Any]) -> str:
+        token = secrets.token_hex(8)
+        with self._lock:
+            self._entries[token] = entry
+            self._cached_chars += entry["chars"]
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._cached_chars > self.max_cached_chars
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._cached_chars -= evicted["chars"]
+        return token
+
+    def _lookup(self, token: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                self._entries.move_to_end(token)
+            return entry
+
+    def _release(self, token: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(token, None)
+            if entry is not None:
+                self._cached_chars -= entry["chars"]
+
+    def status(self) -> dict[str, int]:
+        with self._lock:
+            return {"cached_results": len(self._entries), "cached_chars": self._cached_chars}
+
+    # --- Pages ---
+
+    def _page(self, entry: dict[str, Any], token: str, offset: int, count: int) -> dict[str, Any]:
+        spec = entry["spec"]
+        items = entry["payload"][spec["list"]]
+        shown = items[offset:offset + count]
+        rest = items[offset + count:]
+        page = dict(entry["payload"])
+        page[spec["list"]] = shown
+        ids = {item.get("id") for item in shown if isinstance(item, dict)}
+        for key in spec.get("linked", ()):
+            if isinstance(page.get(key), list):
+                page[key] = [x for x in page[key] if (x.get("id") if isinstance(x, dict) else x) in ids]
+        continuation: dict[str, Any] = {
+            "cursor": f"{token}:{offset + count}" if rest else None,
+            "offset": offset,
+            "returned": len(shown),
+            "remaining": len(rest),
+            "total": len(items),
+        }
+        if spec.get("group"):
+            counts: dict[str, int] = {}
+            for item in rest:
+                group = str(item.get(spec["group"])) if isinstance(item, dict) else "other"
+                counts[group] = counts.get(group, 0) + 1
+            continuation[f"remaining_by_{spec['group']}"] = counts
+        if entry["dropped"]:
+            continuation["dropped_fields"] = entry["dropped"]
+        page["continuation"] = continuation
+        return page
+
+    def _render_page(self, entry: dict[str, Any], token: str, offset: int, max_output_tokens: int) -> str:
+        """The largest page from ``offset`` within the budget, at least one item."""
+        budget_chars = max_output_tokens * CHARS_PER_TOKEN
+        fmt, ensure_ascii = entry["format"], entry["ensure_ascii"]
+        sizes = entry["sizes"]
+        used = len(render(self._page(entry, token, offset, 0), fmt, ensure_ascii=ensure_ascii))
+        count = 0
+        while offset + count < len(sizes) and (count == 0 or used + sizes[offset + count] <= budget_chars):
+            used += sizes[offset + count]
+            count += 1
+        text = render(self._page(entry, token, offset, count), fmt, ensure_ascii=ensure_ascii)
+        # Sizes are estimates (the continuation grows with the cursor)
+        while count > 1 and len(text) > budget_chars:
+            count -= 1
+            text = render(self._page(entry, token, offset, count), fmt, ensure_ascii=ensure_ascii)
+        if offset + count >= len(sizes):
+            self._release(token)
+        return text
+
+    def fit(self, tool_name: str, result: str, response_format: str, max_output_tokens: int) -> str:
+        """``result`` (JSON from ``tool_name``) re-rendered within ``max_output_tokens``."""
+        spec = PAGED_LISTS[tool_name]
+        ensure_ascii = spec.get("ensure_ascii", True)
+        try:
+            payload = json.loads(result)
+        except ValueError:
+            return result
+        minimal = _minimizer(spec) if response_format == "minimal" else None
+        if not isinstance(payload, dict) or "error" in payload or not isinstance(payload.get(spec["list"]), list):
+            return render(payload, response_format, minimal, ensure_ascii=ensure_ascii)
+        if minimal is not None:
+            # Minimized once, without caps; pages are cut from the whole list
+            with uncapped():
+                payload = minimal(payload)
+        text = render(payload, response_format, ensure_ascii=ensure_ascii)
+        if estimate_tokens(text) <= max_output_tokens:
+            return text
+
+        dropped = [key for key in spec.get("drop", ()) if key in payload]
+        payload = {k: v for k, v in payload.items() if k not in dropped}
+        items = payload[spec["list"]]
+        if spec.get("rank"):
+            items = payload[spec["list"]] = sorted(items, key=_rank_key(spec["rank"]))
+        linked_chars: dict[Any, int] = {}
+        for key in spec.get("linked", ()):
+            for x in payload.get(key) or ():
+                item_id = x.get("id") if isinstance(x, dict) else x
+                linked_chars[item_id] = linked_chars.get(item_id, 0) + _item_chars(x, response_format, ensure_ascii)
+        sizes = [
+            _item_chars(item, response_format, ensure_ascii)
+            + (linked_chars.get(item.get("id"), 0) if isinstance(item, dict) else 0)
+            for item in items
+        ]
+        entry = {
+            "tool": tool_name,
+            "spec": spec,
+            "payload": payload,
+            "format": response_format,
+            "ensure_ascii": ensure_ascii,
+            "max_output_tokens": max_output_tokens,
+            "dropped": dropped,
+            "sizes": sizes,
+            "chars": len(result),
+        }
+        return self._render_page(entry, self._store(entry), 0, max_output_tokens)
+
+    def page(self, cursor: str, max_output_tokens: int = 0) -> str:
+        """The page of a truncated result that ``cursor`` points to."""
+        token, _, offset = cursor.partition(":")
+        entry = self._lookup(token)
+        if entry is None or not offset.isdigit() or int(offset) >= len(entry["sizes"]):
+            return json.dumps({
+                "error": f"Unknown or expired cursor '{cursor}'. Re-run the original call to page again.",
+            }, indent=2)
+        return self._render_page(entry, token, int(offset), max_output_tokens or entry["max_output_tokens"])
+
+    # --- Tool wrapper ---
+
+    def wrap(self, tool_func, tool_name: str):
+        """Add ``max_output_tokens`` (0 = unlimited) to a tool.
+
+        Calls without a budget, and every call to a tool without a
+        ``PAGED_LISTS`` entry, are passed through unchanged.
+        """
+        signature = inspect.signature(tool_func)
+        if "max_output_tokens" in signature.parameters:
+            return tool_func
+        paged = tool_name in PAGED_LISTS
+        budget_param = inspect.Parameter(
+            "max_output_tokens", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=0, annotation=int,
+        )
+        signature = signature.replace(parameters=[*signature.parameters.values(), budget_param])
+
+        async def wrapper(*args, **kwargs):
+            kwargs = signature.bind(*args, **kwargs).arguments
+            max_output_tokens = kwargs.pop("max_output_tokens", 0)
+            if max_output_tokens <= 0 or not paged:
+                return await tool_func(**kwargs)
+            response_format = kwargs.get("response_format", "pretty")
+            if response_format in ("pretty", "minimal"):
+                # Re-rendered here anyway; compact is cheaper to produce and
+                # parse, and keeps the items a minimizer would cap
+                kwargs["response_format"] = "compact"
+            result = await tool_func(**kwargs)
+            return self.fit(tool_name, result, response_format, max_output_tokens)
+
+        wrapper.__name__ = wrapper.__qualname__ = getattr(tool_func, "__name__", tool_name)
+        wrapper.__doc__ = (tool_func.__doc__ or "").rstrip() + (
+            "\n\n        max_output_tokens: Token budget for the response (0 = unlimited). A longer\n"
+            "            response keeps its highest-ranked items and returns a\n"
+            "            continuation cursor; fetch the rest with the page tool.\n"
+            if paged else
+            "\n\n        max_output_tokens: Accepted for uniformity; this tool's response is\n"
+            "            small and always returned whole.\n"
+        )
+        wrapper.__signature__ = signature
+        wrapper.__annotations__ = {**getattr(tool_func, "__annotations__", {}), "max_output_tokens": int}
+        wrapper.__module__ = getattr(tool_func, "__module__", __name__)
+        return wrapper
+
+
+# Shared by the server's tool wrappers and the page tool
+output_budget = OutputBudget()
+
+
+async def page(cursor: str, max_output_tokens: int = 0) -> str:
+    """Fetch the next part of a response that was cut to max_output_tokens.
+
+    Results are kept in the server, so paging does not re-run the tool.
+    Cursors expire when the server evicts the result (least recently used
+    first) or after the last page.
+
+    Args:
+        cursor: The continuation.cursor of the previous response.
+        max_output_tokens: Token budget for this page (0 = the budget of the
+            original call).
+    """
+    return output_budget.page(cursor, max_output_tokens)
@@ -8,6 +8,8 @@ import asyncio
 import json
 from pathlib import Path
 
+from .response import render
+
 CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
 CQLINT_PATH = CQ_ENGINE_ROOT / "cqlint" / "cqlint.sh"
 
@@ -16,6 +18,7 @@ async def cqlint(
     target_path: str,
     rules: str = "all",
     output_format: str = "text",
+    response_format: str = "pretty",
 ) -> str:
     """Run cognitive quality linter on a file or directory.
 
@@ -23,6 +26,9 @@ async def cqlint(
         target_path: Path to the file or directory to lint.
         rules: Comma-separated rule IDs (e.g., "CQ001,CQ003") or "all".
         output_format: Output format — "text", "json", or "markdown".
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact, without the formatted
+            report that repeats the violations).
     """
     # Validate cqlint.sh exists
     if not CQLINT_PATH.is_file():
@@ -135,7 +141,12 @@ async def cqlint(
     elif output_format == "text":
         result["formatted"] = _format_text(violations, result["passed"])
 
-    return json.dumps(result, indent=2)
+    return render(result, response_format, _minimal)
+
+
+def _minimal(result: dict) -> dict:
+    """Minimal response: the violations without their formatted rendering."""
+    return {k: v for k, v in result.items() if k != "formatted"}
 
 
 def _parse_text_output(text: str) -> list[dict]:
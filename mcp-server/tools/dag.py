@@ -0,0 +1,270 @@
+"""Dependency-graph engine for task decomposition.
+
+Builds a DAG over decomposed subtasks and derives a machine-usable
+schedule from it, following CQE Pattern #04 (Wave Scheduler):
+- Dependencies from signal words, shared entities and explicit references
+- Topological order and parallel waves
+- Critical path and peak concurrent token budget
+
+Edges only ever point from an earlier chunk to a later one, so graphs
+built by ``EdgeDetector``/``detect_edges`` are acyclic by construction, and
+chunks can be fed one at a time as they are produced; ``build_schedule``
+still validates graphs supplied by callers.
+"""
+import heapq
+import re
+
+from .text_analysis import DEPENDENCY_SIGNALS, analyze
+
+# Identifiers that name the same artifact wherever they appear
+_IDENTIFIER_RES = (
+    re.compile(r"`([^`\n]+)`"),                                     # `code spans`
+    re.compile(r"(?<![\w/])((?:[\w.-]+/)+[\w.-]+)"),                # paths/with/slashes
+    re.compile(r"\b([\w-]+\.(?:py|md|ts|js|json|ya?ml|sh|sql|toml|txt|csv))\b"),
+    re.compile(r"\b([A-Z][a-z0-9]+(?:[A-Z][a-z0-9]+)+)\b"),          # CamelCase
+    re.compile(r"\b([a-z][a-z0-9]*(?:_[a-z0-9]+)+)\b"),              # snake_case
+)
+
+# Verbs whose object is an artifact later subtasks may consume
+_PRODUCER_VERBS = frozenset({
+    "create", "write", "generate", "build", "produce", "define", "design",
+    "draft", "collect", "compute", "extract", "implement", "add", "prepare",
+})
+_DETERMINERS = frozenset({"a", "an", "the", "new", "some", "all", "each", "its", "our"})
+_STOPWORDS = frozenset({
+    "and", "or", "then", "also", "with", "for", "from", "into", "that",
+    "this", "these", "those", "across", "using", "based", "after", "before",
+    "which", "where", "when", "each", "every", "them", "their", "there",
+})
+
+# Phrases referring back to the previous subtask's output
+_BACK_REFERENCE_RE = re.compile(
+    r"\b(?:the|these|those|its|their)\s+(?:results?|outputs?|findings|changes|"
+    r"above|previous\s+step)\b",
+    re.IGNORECASE,
+)
+# A leading pronoun: only a weak hint, since "This" often opens unrelated text
+_LEADING_PRONOUN_RE = re.compile(r"^(?:it|this|these|those|they|them)\b", re.IGNORECASE)
+# Explicit references to a numbered step ("step 2", "ST-2")
+_STEP_REFERENCE_RE = re.compile(r"\b(?:step\s+|ST-)(\d+)\b", re.IGNORECASE)
+# Step numbers the text assigns itself: "2. ", "2) ", "Step 2: ", "ST-2: "
+# at the start of the chunk or of one of its sentences
+_STEP_MARKER_RE = re.compile(
+    r"(?:^|(?<=[.!?])\s)\s*(?:(?:step\s+|ST-)(\d+)\s*[.):]|(\d+)[.)])\s",
+    re.IGNORECASE,
+)
+_WORD_RE = re.compile(r"[a-z][a-z0-9-]*")
+
+
+def _identifiers(chunk: str) -> set[str]:
+    """Extract code-like identifiers (paths, files, code spans, names)."""
+    found: set[str] = set()
+    for pattern in _IDENTIFIER_RES:
+        found.update(m.group(1).strip() for m in pattern.finditer(chunk))
+    return found
+
+
+def _produced_nouns(words: list[str]) -> set[str]:
+    """Head nouns of objects following producer verbs ("write the schema")."""
+    produced: set[str] = set()
+    for i, word in enumerate(words):
+        if word not in _PRODUCER_VERBS and word[:-1] not in _PRODUCER_VERBS:
+            continue
+        j = i + 1
+        while j < len(words) and words[j] in _DETERMINERS:
+            j += 1
+        head = None
+        # Take up to two modifier/noun words; the last one is the head
+        for candidate in words[j:j + 2]:
+            if candidate in _STOPWORDS or len(candidate) < 4:
+                break
+            head = candidate
+        if head:
+            produced.add(head)
+    return produced
+
+
+class EdgeDetector:
+    """Incremental dependency detection: feed chunks in order with ``add``.
+
+    Rules, each recorded as the edge ``reason``:
+    - ``signal``: the chunk contains a dependency signal word
+      (``DEPENDENCY_SIGNALS``) and depends on the chunk before it.
+    - ``reference``: the chunk refers back to earlier output ("the results"),
+      names a step the text numbered ("step 2" once an item starts with
+      "2." or "Step 2:"), or mentions an artifact an earlier chunk produced
+      ("write the schema" ... "schema"). A leading "it"/"this" counts only
+      if the previous chunk produced an artifact it can refer to.
+    - ``shared_entity``: the chunk touches an identifier (file, path, code
+      span, CamelCase/snake_case name) an earlier chunk also touched, so the
+      two must not run concurrently.
+
+    State is bounded by the number of distinct identifiers, produced nouns
+    and step numbers, not by the number of chunks seen.
+    """
+
+    def __init__(self) -> None:
+        self._count = 0
+        self._last_touch: dict[str, int] = {}   # identifier -> latest chunk touching it
+        self._producer: dict[str, int] = {}     # produced noun -> latest producing chunk
+        self._steps: dict[int, int] = {}        # step number -> latest chunk numbered so
+        self._previous_produced = False
+
+    def add(self, chunk: str) -> list[dict]:
+        """Register the next chunk and return its incoming edges.
+
+        Edges are ``{"from", "to", "reason", "via"}`` with 0-based chunk
+        indices; at most one edge per source chunk, first rule wins.
+        """
+        i = self._count
+        self._count += 1
+        edges: dict[int, dict] = {}
+
+        def link(src: int, reason: str, via: str = "") -> None:
+            if 0 <= src < i and src not in edges:
+                edges[src] = {"from": src, "to": i, "reason": reason, "via": via}
+
+        chunk_lower = chunk.lower()
+        words = _WORD_RE.findall(chunk_lower)
+        word_set = set(words)
+
+        signals = analyze(chunk)["hits"]["dependency"]
+        for signal in DEPENDENCY_SIGNALS:
+            if signal in signals:
+                link(i - 1, "signal", signal)
+                break
+
+        back_ref = _BACK_REFERENCE_RE.search(chunk)
+        if back_ref:
+            link(i - 1, "reference", back_ref.group(0).lower())
+        pronoun = _LEADING_PRONOUN_RE.search(chunk.strip())
+        if pronoun and self._previous_produced:
+            link(i - 1, "reference", pronoun.group(0).lower())
+        # Step numbers map to chunks only where the text numbered its steps;
+        # chunks merge sentences, so "step 2" need not be the second chunk
+        for m in _STEP_REFERENCE_RE.finditer(chunk):
+            src = self._steps.get(int(m.group(1)))
+            if src is not None:
+                link(src, "reference", m.group(0))
+
+        for word in sorted(word_set):
+            noun = word if word in self._producer else word[:-1]
+            if noun in self._producer:
+                link(self._producer[noun], "reference", noun)
+
+        for ident in sorted(_identifiers(chunk)):
+            if ident in self._last_touch:
+                link(self._last_touch[ident], "shared_entity", ident)
+            self._last_touch[ident] = i
+
+        produced = _produced_nouns(words)
+        for noun in produced:
+            self._producer[noun] = i
+        self._previous_produced = bool(produced)
+        for m in _STEP_MARKER_RE.finditer(chunk):
+            self._steps[int(m.group(1) or m.group(2))] = i
+
+        return sorted(edges.values(), key=lambda e: e["from"])
+
+
+def detect_edges(chunks: list[str]) -> list[dict]:
+    """Detect dependency edges between chunks (see ``EdgeDetector``).
+
+    Returns:
+        List of ``{"from", "to", "reason", "via"}`` edges using 0-based chunk
+        indices, ordered by target then source.
+    """
+    detector = EdgeDetector()
+    edges: list[dict] = []
+    for chunk in chunks:
+        edges.extend(detector.add(chunk))
+    return edges
+
+
+def build_schedule(subtasks: list[dict]) -> dict:
+    """Compute a wave schedule for subtasks with ``id``, ``estimated_tokens``
+    and ``dependencies`` (list of ids).
+
+    Waves group subtasks by longest dependency depth, so every subtask in a
+    wave can run in parallel once the previous waves are done. The critical
+    path is the token-heaviest dependency chain.
+
+    Raises:
+        ValueError: On unknown dependency ids or a dependency cycle.
+    """
+    index = {st["id"]: i for i, st in enumerate(subtasks)}
+    successors: list[list[int]] = [[] for _ in subtasks]
+    in_degree = [0] * len(subtasks)
+    for i, st in enumerate(subtasks):
+        for dep in st["dependencies"]:
+            if dep not in index:
+                raise ValueError(f"{st['id']} depends on unknown subtask '{dep}'")
+            successors[index[dep]].append(i)
+            in_degree[i] += 1
+
+    # Kahn's algorithm; the heap keeps ties in original subtask order
+    ready = [i for i, d in enumerate(in_degree) if d == 0]
+    heapq.heapify(ready)
+    order: list[int] = []
+    level = [0] * len(subtasks)
+    path_tokens = [st["estimated_tokens"] for st in subtasks]
+    path_prev: list[int | None] = [None] * len(subtasks)
+    while ready:
+        u = heapq.heappop(ready)
+        order.append(u)
+        for v in successors[u]:
+            level[v] = max(level[v], level[u] + 1)
+            candidate = path_tokens[u] + subtasks[v]["estimated_tokens"]
+            if candidate > path_tokens[v]:
+                path_tokens[v] = candidate
+                path_prev[v] = u
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                heapq.heappush(ready, v)
+
+    if len(order) != len(subtasks):
+        stuck = sorted(subtasks[i]["id"] for i, d in enumerate(in_degree) if d > 0)
+        raise ValueError(f"dependency cycle among: {', '.join(stuck)}")
+
+    waves: list[list[int]] = [[] for _ in range(max(level, default=-1) + 1)]
+    for i in order:
+        waves[level[i]].append(i)
+
+    critical: list[int] = []
+    if subtasks:
+        node: int | None = max(range(len(subtasks)), key=lambda i: (path_tokens[i], -i))
+        while node is not None:
+            critical.append(node)
+            node = path_prev[node]
+        critical.reverse()
+
+    wave_list = [
+        {
+            "wave": w + 1,
+            "subtasks": [subtasks[i]["id"] for i in members],
+            "tokens": sum(subtasks[i]["estimated_tokens"] for i in members),
+        }
+        for w, members in enumerate(waves)
+    ]
+    return {
+        "topological_order": [subtasks[i]["id"] for i in order],
+        "waves": wave_list,
+        "critical_path": {
+            "subtasks": [subtasks[i]["id"] for i in critical],
+            "length": len(critical),
+            "tokens": path_tokens[critical[-1]] if critical else 0,
+        },
+        "max_parallelism": max((len(w["subtasks"]) for w in wave_list), default=0),
+        "peak_concurrent_tokens": max((w["tokens"] for w in wave_list), default=0),
+    }
+
+
+def render_waves(schedule: dict) -> str:
+    """Render a schedule as an ASCII graph, one wave per step."""
+    waves = schedule["waves"]
+    if len(waves) <= 1:
+        ids = waves[0]["subtasks"] if waves else []
+        if len(ids) <= 1:
+            return ids[0] if ids else ""
+        return " | ".join(ids) + "  (all parallel)"
+    return " ──▶ ".join(" | ".join(w["subtasks"]) for w in waves)
@@ -6,47 +6,24 @@ analysis, following CQE Pattern #01 (Attention Budget) principles:
 - Complexity-Proportional Allocation
 - Overflow Prevention via decomposition
 """
+import bisect
+import io
 import json
 import math
 import os
 import re
 import time
+from itertools import accumulate
 from pathlib import Path
+from typing import Iterator, TextIO
+
+from .dag import EdgeDetector, build_schedule, detect_edges, render_waves
+from .response import render
+from .text_analysis import COMPLEXITY_KEYWORDS, analyze
 
 # cq-engine repository root
 CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
 
-# --- Complexity keywords and weights ---
-# Keywords that indicate task complexity, grouped by impact level
-COMPLEXITY_KEYWORDS = {
-    # High complexity indicators (weight: 3)
-    "refactor": 3, "redesign": 3, "migrate": 3, "rewrite": 3,
-    "architect": 3, "integrate": 3, "across": 3, "end-to-end": 3,
-    "cross-cutting": 3, "system-wide": 3, "comprehensive": 3,
-    # Medium complexity indicators (weight: 2)
-    "and": 2, "then": 2, "also": 2, "additionally": 2,
-    "implement": 2, "analyze": 2, "compare": 2, "evaluate": 2,
-    "multiple": 2, "several": 2, "various": 2, "each": 2,
-    "both": 2, "transform": 2, "optimize": 2, "debug": 2,
-    # Low complexity indicators (weight: 1)
-    "update": 1, "fix": 1, "add": 1, "remove": 1,
-    "check": 1, "verify": 1, "test": 1, "review": 1,
-    "rename": 1, "move": 1, "copy": 1, "format": 1,
-}
-
-# Dependency signal keywords
-DEPENDENCY_SIGNALS = {
-    "after": "sequential",
-    "based on": "data_dependency",
-    "using output of": "data_dependency",
-    "depends on": "data_dependency",
-    "requires": "prerequisite",
-    "before": "sequential",
-    "once": "sequential",
-    "following": "sequential",
-    "then": "sequential",
-}
-
 # Budget sizing from Attention Budget pattern (Section: Budget Sizing Heuristic)
 BUDGET_TIERS = [
     (10, "low", 5000, 15000),      # score <= 10: Low complexity
@@ -56,37 +33,36 @@ BUDGET_TIERS = [
 ]
 
 
+def _complexity_level(score: int) -> str:
+    """Map a complexity score to its budget tier level."""
+    for threshold, tier_level, _, _ in BUDGET_TIERS:
+        if score <= threshold:
+            return tier_level
+    return BUDGET_TIERS[-1][1]  # scores beyond the last threshold are critical
+
+
 def _estimate_complexity(description: str) -> dict:
     """Estimate task complexity using keyword heuristics.
 
     Returns a dict with score, level, keyword_hits, and word_count.
     """
-    words = description.lower().split()
-    word_count = len(words)
-    description_lower = description.lower()
+    analysis = analyze(description)
+    word_count = analysis["word_count"]
 
     keyword_hits = {}
     score = 0
 
-    for keyword, weight in COMPLEXITY_KEYWORDS.items():
-        count = description_lower.count(keyword)
-        if count > 0:
-            keyword_hits[keyword] = {"count": count, "weight": weight}
-            score += count * weight
+    for keyword, count in analysis["hits"]["complexity"].items():
+        weight = COMPLEXITY_KEYWORDS[keyword]
+        keyword_hits[keyword] = {"count": count, "weight": weight}
+        score += count * weight
 
     # Base complexity from word count (longer descriptions = more complex)
     score += word_count // 20
 
-    # Determine complexity level
-    level = "low"
-    for threshold, tier_level, _, _ in BUDGET_TIERS:
-        if score <= threshold:
-            level = tier_level
-            break
-
     return {
         "score": score,
-        "level": level,
+        "level": _complexity_level(score),
         "keyword_hits": keyword_hits,
         "word_count": word_count,
     }
@@ -98,10 +74,15 @@ def _estimate_tokens(text: str) -> int:
     return int(math.ceil(word_count * 1.3))
 
 
-def _split_into_chunks(description: str, num_chunks: int) -> list[str]:
-    """Split task description into semantic chunks at sentence boundaries."""
+# Sentence-ending punctuation, except after a list marker ("2.", "12."),
+# so a numbered item stays together with its text
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])(?<!(?<!\S)\d\.)(?<!(?<!\S)\d\d\.)\s+')
+
+
+def _split_sentences(description: str) -> list[str]:
+    """Split text into sentences, or clauses if it is a single sentence."""
     # Split on sentence-ending punctuation
-    sentences = re.split(r'(?<=[.!?])\s+', description.strip())
+    sentences = _SENTENCE_BOUNDARY_RE.split(description.strip())
     sentences = [s.strip() for s in sentences if s.strip()]
 
     if len(sentences) <= 1:
@@ -109,6 +90,12 @@ def _split_into_chunks(description: str, num_chunks: int) -> list[str]:
         parts = re.split(r'\s*(?:;\s*|,?\s+and\s+|,?\s+then\s+|,?\s+also\s+)', description)
         parts = [p.strip() for p in parts if p.strip()]
         sentences = parts if len(parts) > 1 else [description]
+    return sentences
+
+
+def _split_into_chunks(description: str, num_chunks: int) -> list[str]:
+    """Split task description into semantic chunks at sentence boundaries."""
+    sentences = _split_sentences(description)
 
     if len(sentences) <= num_chunks:
         return sentences
@@ -130,72 +117,321 @@ def _split_into_chunks(description: str, num_chunks: int) -> list[str]:
     return chunks
 
 
-def _detect_dependencies(chunks: list[str]) -> list[list[str]]:
+def _split_oversized(text: str, budget: int, scale: float) -> list[str]:
+    """Split a single over-budget sentence at clause boundaries, falling
+    back to fixed word windows sized to fit the budget."""
+    units = _split_sentences(text)
+    if len(units) == 1:
+        words = text.split()
+        window = max(1, int(budget / (1.3 * scale)))
+        units = [" ".join(words[k:k + window]) for k in range(0, len(words), window)]
+    return units
+
+
+# Recursive decomposition never goes deeper than this, whatever max_depth says
+MAX_RECURSION_DEPTH = 8
+
+
+def _decompose_units(
+    units: list[str],
+    word_counts: list[int],
+    budget: int,
+    max_subtasks: int,
+    depth: int,
+    max_depth: int,
+    scale: float,
+    memo: dict,
+    stats: dict,
+) -> dict:
+    """Recursively split a run of sentences until every leaf fits the budget.
+
+    Each level partitions the sentences into token-balanced parts using
+    prefix sums, so one level costs time linear in its text, and identical
+    sub-descriptions at the same depth are decomposed once (memoized).
+
+    Returns an ID-less node: leaves carry ``description`` and
+    ``estimated_tokens``; inner nodes carry ``children``. Every node has
+    ``rolled_up_tokens``.
+    """
+    text = " ".join(units)
+    key = (text, depth)
+    cached = memo.get(key)
+    if cached is not None:
+        stats["memo_hits"] += 1
+        return cached
+
+    tokens = int(math.ceil(sum(word_counts) * 1.3) * scale)
+    if tokens > budget and depth < max_depth and len(units) == 1:
+        units = _split_oversized(units[0], budget, scale)
+        word_counts = [len(u.split()) for u in units]
+
+    if tokens <= budget or depth >= max_depth or len(units) == 1:
+        leaf_tokens = max(tokens, 2000)
+        if tokens <= budget:
+            leaf_tokens = min(leaf_tokens, budget)
+        node: dict = {
+            "description": text,
+            "estimated_tokens": leaf_tokens,
+            "rolled_up_tokens": leaf_tokens,
+        }
+        if tokens > budget:
+            node["needs_further_decomposition"] = True
+    else:
+        # Token-balanced partition at sentence boundaries
+        parts = min(max_subtasks, len(units), max(2, math.ceil(tokens / budget)))
+        prefix = list(accumulate(word_counts))
+        total = prefix[-1]
+        bounds = [0]
+        for j in range(1, parts):
+            cut = bisect.bisect_left(prefix, total * j / parts) + 1
+            cut = min(max(cut, bounds[-1] + 1), len(units) - (parts - j))
+            bounds.append(cut)
+        bounds.append(len(units))
+        children = [
+            _decompose_units(
+                units[lo:hi], word_counts[lo:hi], budget, max_subtasks,
+                depth + 1, max_depth, scale, memo, stats,
+            )
+            for lo, hi in zip(bounds, bounds[1:])
+        ]
+        node = {
+            "rolled_up_tokens": sum(c["rolled_up_tokens"] for c in children),
+            "children": children,
+        }
+
+    memo[key] = node
+    return node
+
+
+def _label_tree(node: dict, node_id: str) -> dict:
+    """Copy a decomposition tree, assigning hierarchical IDs (ST-2.1.3)."""
+    labelled = {"id": node_id, **node}
+    if "children" in node:
+        labelled["children"] = [
+            _label_tree(child, f"{node_id}.{k + 1}")
+            for k, child in enumerate(node["children"])
+        ]
+    return labelled
+
+
+def _largest_unit(subtask: dict) -> int:
+    """Token estimate of the largest leaf under a subtask."""
+    if "children" not in subtask:
+        return subtask["estimated_tokens"]
+    return max(_largest_unit(child) for child in subtask["children"])
+
+
+def _tree_stats(node: dict, depth: int, stats: dict) -> None:
+    """Accumulate leaf count, unresolved leaves and depth for a subtree."""
+    if "children" not in node:
+        stats["leaves"] += 1
+        stats["unresolved"] += bool(node.get("needs_further_decomposition"))
+        stats["depth_reached"] = max(stats["depth_reached"], depth)
+        return
+    for child in node["children"]:
+        _tree_stats(child, depth + 1, stats)
+
+
+def _detect_dependencies(chunks: list[str]) -> tuple[list[list[str]], list[dict]]:
     """Detect dependencies between subtask chunks.
 
-    Returns a list of dependency lists, one per chunk.
-    Each dependency list contains the IDs of chunks this chunk depends on.
+    Returns a list of dependency lists, one per chunk, each holding the
+    IDs of chunks this chunk depends on, plus the underlying edges with
+    the reason each dependency was detected.
     """
+    edges = detect_edges(chunks)
     dependencies = [[] for _ in chunks]
+    for edge in edges:
+        dependencies[edge["to"]].append(f"ST-{edge['from'] + 1}")
+    labelled = [
+        {
+            "from": f"ST-{e['from'] + 1}",
+            "to": f"ST-{e['to'] + 1}",
+            "reason": e["reason"],
+            "via": e["via"],
+        }
+        for e in edges
+    ]
+    return dependencies, labelled
 
-    for i, chunk in enumerate(chunks):
-        chunk_lower = chunk.lower()
-        for signal in DEPENDENCY_SIGNALS:
-            if signal in chunk_lower and i > 0:
-                # Dependency on the previous chunk
-                prev_id = f"ST-{i}"
-                if prev_id not in dependencies[i]:
-                    dependencies[i].append(prev_id)
-                break
-
-    return dependencies
-
-
-def _generate_dependency_graph(subtasks: list[dict]) -> str:
-    """Generate an ASCII dependency graph from subtasks."""
-    if len(subtasks) <= 1:
-        return subtasks[0]["id"] if subtasks else ""
-
-    lines = []
-    # Find independent tasks (no dependencies) and dependent chains
-    independent = [st for st in subtasks if not st["dependencies"]]
-    dependent = [st for st in subtasks if st["dependencies"]]
-
-    if not dependent:
-        # All independent — parallel execution
-        ids = [st["id"] for st in subtasks]
-        return " | ".join(ids) + "  (all parallel)"
-
-    # Build simple chain representation
-    placed = set()
-    for st in subtasks:
-        if st["id"] in placed:
-            continue
-        if not st["dependencies"]:
-            # Start of a chain or standalone
-            chain = [st["id"]]
-            placed.add(st["id"])
-            # Follow the chain forward
-            current_id = st["id"]
-            for other in subtasks:
-                if current_id in other["dependencies"] and other["id"] not in placed:
-                    chain.append(other["id"])
-                    placed.add(other["id"])
-                    current_id = other["id"]
-            lines.append(" ──▶ ".join(chain))
-
-    # Add any remaining unplaced tasks
-    for st in subtasks:
-        if st["id"] not in placed:
-            lines.append(st["id"])
-
-    return "\n".join(lines)
+
+# --- Streaming decomposition ---
+
+STREAM_READ_SIZE = 64 * 1024
+# Text without any sentence boundary is cut at whitespace past this size
+MAX_PENDING_CHARS = 1024 * 1024
+
+
+def _iter_sentences(reader: TextIO) -> Iterator[str]:
+    """Yield sentences from a text stream, reading it block by block.
+
+    Splits where the non-streaming splitter does (sentence-ending
+    punctuation followed by whitespace); only the unfinished tail of the
+    last block is held in memory.
+    """
+    pending = ""
+    while True:
+        block = reader.read(STREAM_READ_SIZE)
+        if not block:
+            break
+        pending += block
+        pos = 0
+        for m in _SENTENCE_BOUNDARY_RE.finditer(pending):
+            sentence = pending[pos:m.start()].strip()
+            if sentence:
+                yield sentence
+            pos = m.end()
+        pending = pending[pos:]
+        if len(pending) > MAX_PENDING_CHARS:
+            cut = pending.rfind(" ", 0, MAX_PENDING_CHARS)
+            cut = cut if cut > 0 else MAX_PENDING_CHARS
+            yield pending[:cut].strip()
+            pending = pending[cut:]
+    tail = pending.strip()
+    if tail:
+        yield tail
+
+
+class _RunningComplexity:
+    """Complexity score maintained with running counters.
+
+    Text is fed in pieces (each finalized chunk) and only the counters are
+    kept. Since no complexity keyword spans more than one word, the totals
+    equal ``_estimate_complexity`` on the full text.
+    """
+
+    def __init__(self) -> None:
+        self.keyword_score = 0
+        self.word_count = 0
+
+    def add(self, text: str) -> None:
+        analysis = analyze(text)
+        for keyword, count in analysis["hits"]["complexity"].items():
+            self.keyword_score += count * COMPLEXITY_KEYWORDS[keyword]
+        self.word_count += analysis["word_count"]
+
+    @property
+    def score(self) -> int:
+        return self.keyword_score + self.word_count // 20
+
+    @property
+    def level(self) -> str:
+        return _complexity_level(self.score)
+
+    @property
+    def scale(self) -> float:
+        return 1.5 if self.level in ("high", "critical") else 1.0
+
+
+def iter_decompose(reader: TextIO, budget: int = 50000) -> Iterator[dict]:
+    """Decompose a text stream incrementally.
+
+    Sentences are packed into a subtask until the next one would push it
+    past ``budget``; the subtask is then yielded at once as
+    ``{"type": "subtask", ...}`` with its dependency edges on earlier
+    subtasks. Token estimates use the complexity level seen so far
+    (running keyword counters, updated per finalized subtask), and
+    over-budget sentences are split at clauses or word windows. A final
+    ``{"type": "summary", ...}`` carries the totals and the wave schedule.
+
+    Memory is bounded by one subtask's text plus a few integers per subtask.
+    """
+    start = time.time()
+    complexity = _RunningComplexity()
+    detector = EdgeDetector()
+    skeleton: list[dict] = []  # id/tokens/dependencies only, for the schedule
+    pending: list[str] = []
+    pending_words = 0
+    total_budget = 0
+
+    def finalize() -> dict:
+        nonlocal pending, pending_words, total_budget
+        chunk = " ".join(pending)
+        complexity.add(chunk)
+        subtask_id = f"ST-{len(skeleton) + 1}"
+        edges = detector.add(chunk)
+        dependencies = [f"ST-{e['from'] + 1}" for e in edges]
+        tokens = int(math.ceil(pending_words * 1.3) * complexity.scale)
+        estimated_tokens = min(max(tokens, 2000), budget)
+        skeleton.append({
+            "id": subtask_id,
+            "estimated_tokens": estimated_tokens,
+            "dependencies": dependencies,
+        })
+        total_budget += estimated_tokens
+        pending, pending_words = [], 0
+        return {
+            "type": "subtask",
+            "id": subtask_id,
+            "description": chunk,
+            "estimated_tokens": estimated_tokens,
+            "dependencies": dependencies,
+            "edges": [
+                {"from": f"ST-{e['from'] + 1}", "reason": e["reason"], "via": e["via"]}
+                for e in edges
+            ],
+            "running_complexity": {"score": complexity.score, "level": complexity.level},
+        }
+
+    for sentence in _iter_sentences(reader):
+        # Packing uses the complexity level of the chunks finalized so far
+        scale = complexity.scale
+        units = [sentence]
+        if math.ceil(len(sentence.split()) * 1.3) * scale > budget:
+            units = _split_oversized(sentence, budget, scale)
+        for unit in units:
+            words = len(unit.split())
+            if pending and math.ceil((pending_words + words) * 1.3) * scale > budget:
+                yield finalize()
+                scale = complexity.scale
+            pending.append(unit)
+            pending_words += words
+    if pending:
+        yield finalize()
+
+    yield {
+        "type": "summary",
+        "subtask_count": len(skeleton),
+        "total_budget": total_budget,
+        "schedule": build_schedule(skeleton),
+        "complexity": {
+            "score": complexity.score,
+            "level": complexity.level,
+            "word_count": complexity.word_count,
+        },
+        "budget_per_subtask": budget,
+        "elapsed_ms": round((time.time() - start) * 1000, 1),
+    }
+
+
+def _stream_decompose(reader: TextIO, budget: int, output_path: str, response_format: str) -> str:
+    """Run iter_decompose and return NDJSON, or write it to output_path."""
+    if not output_path:
+        return "\n".join(json.dumps(event, ensure_ascii=False) for event in iter_decompose(reader, budget))
+
+    out = Path(output_path).expanduser()
+    out.parent.mkdir(parents=True, exist_ok=True)
+    summary: dict = {}
+    with open(out, "w", encoding="utf-8") as f:
+        for event in iter_decompose(reader, budget):
+            # Flush per event so consumers can tail the file as it grows
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            summary = event
+    summary["output_path"] = str(out)
+    return render(summary, response_format)
 
 
 async def decompose(
     task_description: str,
     budget: int = 50000,
     max_subtasks: int = 8,
+    recursive: bool = False,
+    max_depth: int = 3,
+    stream: bool = False,
+    source_path: str = "",
+    output_path: str = "",
+    response_format: str = "pretty",
 ) -> str:
     """Decompose a task into budget-aware subtasks using the Attention Budget pattern.
 
@@ -206,14 +442,41 @@ async def decompose(
         task_description: Natural language description of the task to decompose.
         budget: Maximum token budget per subtask (default: 50000).
         max_subtasks: Maximum number of subtasks to generate (default: 8).
+        recursive: Keep splitting over-budget subtasks into a tree of
+            children until each leaf fits the budget (default: False).
+        max_depth: Maximum nesting depth below top-level subtasks when
+            recursive (default: 3, capped at 8).
+        stream: Decompose incrementally and return newline-delimited JSON:
+            one "subtask" event per subtask as it is finalized, then a
+            "summary" event. Subtasks are packed up to the budget;
+            max_subtasks and recursive do not apply (default: False).
+        source_path: Read the description from this file instead of
+            task_description; implies stream.
+        output_path: With stream, write the events to this file as they
+            are produced and return only the summary.
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact, without the
+            dependency_graph rendering of the schedule).
+            Streamed events are always one compact object per line.
     """
     start = time.time()
 
+    if source_path:
+        try:
+            reader = open(Path(source_path).expanduser(), encoding="utf-8")
+        except OSError as e:
+            return json.dumps({"error": f"cannot read source_path: {e}"}, indent=2)
+        with reader:
+            return _stream_decompose(reader, budget, output_path, response_format)
+
     if not task_description or not task_description.strip():
         return json.dumps({
             "error": "task_description is required and must be non-empty",
         }, indent=2)
 
+    if stream:
+        return _stream_decompose(io.StringIO(task_description), budget, output_path, response_format)
+
     # Step 1: Estimate complexity
     complexity = _estimate_complexity(task_description)
 
@@ -232,16 +495,42 @@ async def decompose(
     num_subtasks = len(chunks)  # Actual number may differ from planned
 
     # Step 4: Detect dependencies
-    dep_lists = _detect_dependencies(chunks)
+    dep_lists, dep_edges = _detect_dependencies(chunks)
 
     # Step 5: Build subtask list with budget estimation
     subtasks = []
     total_budget = 0
 
+    # Complex tasks need more tokens than word count suggests
+    scale = 1.5 if complexity["level"] in ("high", "critical") else 1.0
+    max_depth = max(0, min(max_depth, MAX_RECURSION_DEPTH))
+    memo: dict = {}
+    stats = {"leaves": 0, "unresolved": 0, "memo_hits": 0, "depth_reached": 0}
+
     for i, chunk in enumerate(chunks):
         subtask_id = f"ST-{i + 1}"
         estimated_tokens = _estimate_tokens(chunk)
 
+        if recursive and estimated_tokens * scale > budget:
+            units = _split_sentences(chunk)
+            tree = _label_tree(_decompose_units(
+                units, [len(u.split()) for u in units], budget, max_subtasks,
+                0, max_depth, scale, memo, stats,
+            ), subtask_id)
+            subtask = {
+                "id": subtask_id,
+                "description": chunk,
+                "estimated_tokens": tree["rolled_up_tokens"],
+                "dependencies": dep_lists[i],
+            }
+            if "children" in tree:
+                subtask["children"] = tree["children"]
+            elif tree.get("needs_further_decomposition"):
+                subtask["needs_further_decomposition"] = True
+            subtasks.append(subtask)
+            total_budget += subtask["estimated_tokens"]
+            continue
+
         # Apply budget per-subtask cap
         if estimated_tokens > budget:
             # Mark as needs further decomposition
@@ -249,9 +538,7 @@ async def decompose(
             chunk += " [NOTE: May need further decomposition — exceeds per-subtask budget]"
 
         # Scale estimation based on complexity level
-        if complexity["level"] in ("high", "critical"):
-            # Complex tasks need more tokens than word count suggests
-            estimated_tokens = int(estimated_tokens * 1.5)
+        estimated_tokens = int(estimated_tokens * scale)
 
         # Ensure minimum budget
         estimated_tokens = max(estimated_tokens, 2000)
@@ -265,14 +552,16 @@ async def decompose(
         subtasks.append(subtask)
         total_budget += subtask["estimated_tokens"]
 
-    # Step 6: Generate dependency graph
-    dep_graph = _generate_dependency_graph(subtasks)
+    # Step 6: Schedule the dependency graph into parallel waves
+    schedule = build_schedule(subtasks)
+    schedule["edges"] = dep_edges
+    dep_graph = render_waves(schedule)
 
     # Step 7: Determine overflow strategy
     overflow_strategy = "none"
     if total_budget > budget * max_subtasks:
         overflow_strategy = "checkpoint_and_spawn"
-    elif any(st["estimated_tokens"] >= budget * 0.9 for st in subtasks):
+    elif any(_largest_unit(st) >= budget * 0.9 for st in subtasks):
         overflow_strategy = "summarize_and_continue"
 
     elapsed = time.time() - start
@@ -281,6 +570,7 @@ async def decompose(
         "subtasks": subtasks,
         "total_budget": total_budget,
         "dependency_graph": dep_graph,
+        "schedule": schedule,
         "complexity": {
             "score": complexity["score"],
             "level": complexity["level"],
@@ -291,4 +581,20 @@ async def decompose(
         "elapsed_ms": round(elapsed * 1000, 1),
     }
 
-    return json.dumps(result, indent=2)
+    if recursive:
+        for st in subtasks:
+            _tree_stats(st, 0, stats)
+        result["recursion"] = {
+            "max_depth": max_depth,
+            "depth_reached": stats["depth_reached"],
+            "leaf_count": stats["leaves"],
+            "unresolved_leaves": stats["unresolved"],
+            "memo_hits": stats["memo_hits"],
+        }
+
+    return render(result, response_format, _minimal)
+
+
+def _minimal(result: dict) -> dict:
+    """Minimal response: the schedule without its text rendering."""
+    return {k: v for k, v in result.items() if k != "dependency_graph"}
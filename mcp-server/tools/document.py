@@ -0,0 +1,175 @@
+"""Memory-mapped documents for the mutate engine.
+
+``mutate`` used to read a whole document, split it into a list of lines and
+re-join ranges of it, so a 200 MB export was held three or four times in
+memory. ``MappedDocument`` maps the file instead and keeps only a
+line-offset index (4 bytes per line). It behaves as a read-only sequence
+of lines, decoded on access, so the strategies run over it unchanged.
+Keyword searches run over the mapped bytes first, in lowercased chunks
+(see ``lines_matching`` and ``count_literal``), and only candidate lines
+are decoded. Peak RSS stays near the file size however many strategies
+run.
+
+Small files are still read as text: below ``MMAP_MIN_BYTES`` a list of
+lines is faster and its memory cost does not matter.
+
+Zero-infrastructure: standard library only.
+"""
+import bisect
+import mmap
+import re
+from array import array
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+# Files at least this large are memory-mapped by read_document
+MMAP_MIN_BYTES = 8 * 1024 * 1024
+# Bytes searches copy and lowercase the file this much at a time
+SCAN_CHUNK_BYTES = 4 * 1024 * 1024
+
+_NEWLINE_RE = re.compile(rb"\n")
+# A carriage return not followed by a newline is a line break for
+# read_text's universal newlines, but not for the offset index
+_LONE_CR_RE = re.compile(rb"\r(?!\n)")
+# UTF-8 for the only non-ASCII characters that a case-insensitive str
+# pattern matches against ASCII letters: İ ı ſ and the Kelvin sign. ASCII
+# lowercasing cannot fold them, so documents containing one are searched as text
+_ASCII_FOLD_RE = re.compile(rb"\xc4[\xb0\xb1]|\xc5\xbf|\xe2\x84\xaa")
+
+
+class MappedDocument(Sequence):
+    """A UTF-8 document as a read-only sequence of lines over ``mmap``.
+
+    Lines split on "\\n" without it, and a trailing "\\r" is dropped, the
+    same as ``read_text(encoding="utf-8").split("\\n")`` for files without
+    lone carriage returns (``read_document`` checks for them). Indexing and
+    iteration decode lines on access; slices return lists.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            # mmap keeps its own handle to the file
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self._map)
+        self._starts = array("I" if self.size < 2**32 else "Q", [0])
+        self._starts.extend(m.end() for m in _NEWLINE_RE.finditer(self._map))
+        self.lone_cr = _LONE_CR_RE.search(self._map) is not None
+        self._fold_safe: bool | None = None
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "MappedDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- Sequence of lines ---
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _span(self, i: int) -> tuple[int, int]:
+        """Byte range of line ``i`` without its line break."""
+        start = self._starts[i]
+        end = self._starts[i + 1] - 1 if i + 1 < len(self._starts) else self.size
+        if end > start and self._map[end - 1] == 0x0D:
+            end -= 1
+        return start, end
+
+    def _line(self, i: int) -> str:
+        start, end = self._span(i)
+        return self._map[start:end].decode("utf-8")
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._line(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+        return self._line(index)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self._line(i)
+
+    def line_at(self, offset: int) -> int:
+        """Index of the line containing byte ``offset``."""
+        return bisect.bisect_right(self._starts, offset) - 1
+
+    # --- Searches over the mapped bytes ---
+
+    @property
+    def fold_safe(self) -> bool:
+        """Whether ASCII case folding of the bytes matches str IGNORECASE here."""
+        if self._fold_safe is None:
+            self._fold_safe = _ASCII_FOLD_RE.search(self._map) is None
+        return self._fold_safe
+
+    def _lowered_chunks(self, start: int, end: int) -> Iterator[tuple[int, bytes]]:
+        """Yield (byte offset, ASCII-lowercased bytes) for lines ``start`` to ``end``.
+
+        Chunks hold whole lines and about ``SCAN_CHUNK_BYTES`` each, so a
+        scan never holds more than that copy of the file.
+        """
+        while start < end:
+            lo = self._starts[start]
+            stop = bisect.bisect_right(self._starts, lo + SCAN_CHUNK_BYTES, start + 1, end)
+            hi = self._starts[stop] if stop < len(self._starts) else self.size
+            yield lo, self._map[lo:hi].lower()
+            start = stop
+
+    def lines_matching(self, prefilter: re.Pattern) -> Iterator[tuple[int, str]]:
+        """Yield (index, line) for each line where bytes pattern ``prefilter`` matches.
+
+        The prefilter runs over the ASCII-lowercased bytes, so it is
+        written in lowercase and matches ASCII letters in any case. It must
+        not match across lines. Callers confirm each line with their str
+        pattern, so a prefilter only has to match a superset of the lines
+        the str pattern matches. Documents that are not ``fold_safe`` yield
+        every line.
+        """
+        if not self.fold_safe:
+            yield from enumerate(self)
+            return
+        last = -1
+        for offset, chunk in self._lowered_chunks(0, len(self)):
+            for m in prefilter.finditer(chunk):
+                i = self.line_at(offset + m.start())
+                if i != last:
+                    last = i
+                    yield i, self._line(i)
+
+    def count_literal(self, text: str, start: int, end: int) -> int:
+        """Case-insensitive count of ``text`` in lines ``start`` to ``end``.
+
+        Equal to ``len(re.findall(re.escape(text), "\\n".join(lines[start:end]),
+        re.IGNORECASE))`` for text without a newline. Runs over the mapped
+        bytes when that is exact, otherwise over decoded lines.
+        """
+        if text and text.isascii() and self.fold_safe:
+            needle = text.lower().encode("ascii")
+            return sum(chunk.count(needle) for _, chunk in self._lowered_chunks(start, end))
+        pattern = re.compile(re.escape(text), re.IGNORECASE)
+        # A match never spans a line break, so counts add up per line
+        return sum(len(pattern.findall(self._line(i))) for i in range(start, end))
+
+
+def read_document(path: str | Path) -> "str | MappedDocument":
+    """Content of ``path`` for the mutate engine.
+
+    Returns the text for files under ``MMAP_MIN_BYTES`` (or with lone
+    carriage returns), and a ``MappedDocument`` otherwise; the caller
+    closes it.
+    """
+    path = Path(path)
+    if path.stat().st_size < MMAP_MIN_BYTES:
+        return path.read_text(encoding="utf-8")
+    doc = MappedDocument(path)
+    if doc.lone_cr:
+        doc.close()
+        return path.read_text(encoding="utf-8")
+    return doc
@@ -0,0 +1,354 @@
+"""Server-wide execution layer: keeps tool work off the MCP event loop.
+
+Tools are ``async def`` but most of them compute synchronously, so one
+large ``mutate`` call used to stall every other request, including
+resource reads. ``ToolExecutor.wrap`` routes each call according to the
+tool's policy:
+
+- ``"process"``: a pool of spawned worker processes, for CPU-bound
+  tools. A call past its deadline (or cancelled by the client) kills its
+  worker, which is replaced on demand
+- ``"thread"``: a thread pool, for I/O-bound and short CPU work. Calls
+  still queued at their deadline never start; a running thread cannot be
+  interrupted, so its result is dropped and it keeps its concurrency slot
+  until it finishes
+- ``"loop"``: the event loop itself, for tools that already await I/O
+
+Each tool also has a concurrency limit and a deadline covering queueing
+and execution. ``status()`` reports queue depth, wait times, timeouts and
+pool usage for the health resource.
+
+Zero-infrastructure: standard library only.
+"""
+import asyncio
+import importlib
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Policy applied to tools without an entry of their own
+DEFAULT_POLICY: dict[str, Any] = {"pool": "thread", "max_concurrent": 4, "timeout_seconds": 60}
+POOLS = ("process", "thread", "loop")
+
+# Wait times kept per tool for the percentiles
+WAIT_SAMPLES = 1000
+
+
+def _worker_main(conn, preload: list[str]) -> None:
+    """Worker process loop: run (module, function, kwargs) requests until EOF."""
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            continue
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        module_name, func_name, kwargs = request
+        try:
+            func = getattr(importlib.import_module(module_name), func_name)
+            conn.send(("ok", asyncio.run(func(**kwargs))))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+def _run_coroutine(func: Callable, kwargs: dict[str, Any], on_start: Callable[[], None]) -> Any:
+    """Run a tool coroutine to completion in a worker thread."""
+    on_start()
+    return asyncio.run(func(**kwargs))
+
+
+class _ProcessWorkers:
+    """Fixed-size set of worker processes, one request at a time each.
+
+    Workers are spawned rather than forked because the server runs
+    background threads. Results are awaited in a helper thread per busy
+    worker, so killing a worker just ends that wait with EOFError.
+    """
+
+    def __init__(self, max_workers: int, preload: list[str]) -> None:
+        self.max_workers = max_workers
+        self.preload = preload
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._idle: list[tuple[Any, Any]] = []
+        self._alive = 0
+        self._busy = 0
+        self._slots: asyncio.Semaphore | None = None
+        self._waiters = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cq-proc-wait")
+
+    def _spawn(self) -> tuple[Any, Any]:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child, self.preload), name="cq-tool-worker", daemon=True,
+        )
+        process.start()
+        child.close()
+        self._alive += 1
+        return process, parent
+
+    def prestart(self) -> None:
+        """Start one worker ahead of the first call (it imports ``preload``)."""
+        with self._lock:
+            if self._alive == 0:
+                self._idle.append(self._spawn())
+
+    def _checkout(self) -> tuple[Any, Any]:
+        with self._lock:
+            self._busy += 1
+            return self._idle.pop() if self._idle else self._spawn()
+
+    def _checkin(self, worker: tuple[Any, Any], healthy: bool, wait) -> None:
+        with self._lock:
+            self._busy -= 1
+            if healthy:
+                self._idle.append(worker)
+                return
+            self._alive -= 1
+        process, conn = worker
+        process.kill()
+
+        def reap(_) -> None:
+            # Only once nothing can be reading from the pipe any more
+            process.join()
+            conn.close()
+
+        if wait is None:
+            reap(None)
+        else:
+            wait.add_done_callback(reap)
+
+    async def run(self, module_name: str, func_name: str, kwargs: dict[str, Any], on_start: Callable[[], None]) -> Any:
+        """Run ``module_name.func_name(**kwargs)`` in a worker.
+
+        Calls ``on_start`` once a worker is assigned. Cancellation (and so
+        a deadline) kills the worker.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        async with self._slots:
+            worker = self._checkout()
+            on_start()
+            healthy = False
+            wait = None
+            try:
+                worker[1].send((module_name, func_name, kwargs))
+                wait = self._waiters.submit(worker[1].recv)
+                status, value = await asyncio.wrap_future(wait)
+                healthy = True
+            except (EOFError, OSError) as e:
+                raise RuntimeError(f"worker process exited during {func_name}") from e
+            finally:
+                # Killed on deadline or cancellation: the worker may be mid-call
+                self._checkin(worker, healthy, wait)
+        if status == "error":
+            raise RuntimeError(value)
+        return value
+
+    def status(self) -> dict[str, int]:
+        with self._lock:
+            return {"max": self.max_workers, "alive": self._alive, "busy": self._busy}
+
+
+class _ToolStats:
+    """Queue and latency counters for one tool."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.waits_ms: deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def snapshot(self) -> dict[str, Any]:
+        waits = sorted(self.waits_ms)
+
+        def pct(q: float) -> float | None:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))], 1) if waits else None
+
+        return {
+            "calls": self.calls,
+            "queued": self.queued,
+            "running": self.running,
+            "max_queued": self.max_queued,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "wait_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": round(waits[-1], 1) if waits else None},
+        }
+
+
+class _Call:
+    """One tool call moving from queued to running to done (event loop thread only)."""
+
+    def __init__(self, stats: _ToolStats) -> None:
+        self.stats = stats
+        self.arrived = time.monotonic()
+        self.phase = "queued"
+        # Set once _execute runs and takes over releasing the concurrency slot
+        self.owns_slot = False
+        stats.calls += 1
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+
+    def start(self, at: float | None = None) -> None:
+        if self.phase != "queued":
+            return
+        self.phase = "running"
+        self.stats.queued -= 1
+        self.stats.running += 1
+        self.stats.waits_ms.append(((at or time.monotonic()) - self.arrived) * 1000)
+
+    def finish(self) -> None:
+        if self.phase == "queued":
+            self.stats.queued -= 1
+        elif self.phase == "running":
+            self.stats.running -= 1
+        self.phase = "done"
+
+
+class ToolExecutor:
+    """Routes tool calls to a process pool, a thread pool or the event loop.
+
+    ``policies`` maps tool name to a policy dict:
+
+    - ``pool``: "process", "thread" or "loop"
+    - ``max_concurrent``: calls of this tool running at once; the rest queue
+    - ``timeout_seconds``: deadline from arrival, queueing included
+    - ``thread_when``: for process tools, boolean arguments that send a call
+      to the thread pool instead because it relies on in-process state
+      (e.g. ``mutate``'s incremental mode)
+
+    With ``process_workers=0`` process tools run in the thread pool.
+    """
+
+    def __init__(
+        self,
+        policies: dict[str, dict[str, Any]],
+        process_workers: int | None = None,
+        thread_workers: int | None = None,
+        preload: list[str] | None = None,
+    ) -> None:
+        self.policies = {name: {**DEFAULT_POLICY, **policy} for name, policy in policies.items()}
+        for name, policy in self.policies.items():
+            if policy["pool"] not in POOLS:
+                raise ValueError(f"Unknown pool '{policy['pool']}' for tool '{name}'. Valid: {', '.join(POOLS)}")
+        if process_workers is None:
+            process_workers = int(os.environ.get("CQ_ENGINE_PROCESS_WORKERS", min(4, os.cpu_count() or 1)))
+        self._processes = _ProcessWorkers(process_workers, preload or []) if process_workers > 0 else None
+        self.thread_workers = thread_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="cq-tool")
+        self._stats: dict[str, _ToolStats] = {}
+        self._limits: dict[str, asyncio.Semaphore] = {}
+
+    def policy(self, tool_name: str) -> dict[str, Any]:
+        return self.policies.get(tool_name, DEFAULT_POLICY)
+
+    def prestart(self) -> None:
+        """Start a worker process now so the first process-routed call is warm."""
+        if self._processes is not None:
+            self._processes.prestart()
+
+    def _route(self, policy: dict[str, Any], kwargs: dict[str, Any]) -> str:
+        pool = policy["pool"]
+        if pool == "process" and (
+            self._processes is None or any(kwargs.get(arg) for arg in policy.get("thread_when", ()))
+        ):
+            return "thread"
+        return pool
+
+    async def _execute(
+        self, pool: str, tool_func, module_name: str, tool_name: str,
+        kwargs: dict[str, Any], call: _Call, limit: asyncio.Semaphore,
+    ) -> Any:
+        """Run one call on ``pool`` and release its ``limit`` slot once the work has stopped."""
+        call.owns_slot = True
+        if pool == "thread":
+            loop = asyncio.get_running_loop()
+            future = self._threads.submit(
+                _run_coroutine, tool_func, kwargs,
+                lambda: loop.call_soon_threadsafe(call.start, time.monotonic()),
+            )
+            # A running thread cannot be stopped: it keeps its slot until done
+            future.add_done_callback(lambda _: loop.call_soon_threadsafe(limit.release))
+            # Cancelling the wrapped future cancels a call that has not started
+            return await asyncio.wrap_future(future)
+        try:
+            if pool == "process":
+                return await self._processes.run(module_name, tool_name, kwargs, call.start)
+            call.start()
+            return await tool_func(**kwargs)
+        finally:
+            limit.release()
+
+    def wrap(self, tool_func, tool_name: str, module_name: str):
+        """Wrap a tool coroutine function so its calls go through the executor."""
+        policy = self.policy(tool_name)
+        signature = inspect.signature(tool_func)
+        stats = self._stats.setdefault(tool_name, _ToolStats())
+
+        async def wrapper(*args, **kwargs):
+            kwargs = signature.bind(*args, **kwargs).arguments
+            limit = self._limits.get(tool_name)
+            if limit is None:
+                limit = self._limits[tool_name] = asyncio.Semaphore(policy["max_concurrent"])
+            call = _Call(stats)
+            deadline = call.arrived + policy["timeout_seconds"]
+            acquired = False
+            try:
+                await asyncio.wait_for(limit.acquire(), timeout=deadline - time.monotonic())
+                acquired = True
+                return await asyncio.wait_for(
+                    self._execute(self._route(policy, kwargs), tool_func, module_name, tool_name, kwargs, call, limit),
+                    timeout=deadline - time.monotonic(),
+                )
+            except asyncio.TimeoutError:
+                if call.phase == "queued":
+                    stats.cancelled += 1
+                    detail = " (still queued)"
+                else:
+                    stats.timeouts += 1
+                    detail = ""
+                raise TimeoutError(
+                    f"'{tool_name}' did not finish within its {policy['timeout_seconds']}s deadline{detail}"
+                ) from None
+            except asyncio.CancelledError:
+                stats.cancelled += 1
+                raise
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                # wait_for can cancel _execute before its first step (deadline
+                # already passed, or a client cancel), leaving the slot with us
+                if acquired and not call.owns_slot:
+                    limit.release()
+                call.finish()
+
+        wrapper.__name__ = wrapper.__qualname__ = getattr(tool_func, "__name__", tool_name)
+        wrapper.__doc__ = tool_func.__doc__
+        wrapper.__signature__ = signature
+        wrapper.__annotations__ = dict(getattr(tool_func, "__annotations__", {}))
+        wrapper.__module__ = getattr(tool_func, "__module__", module_name)
+        return wrapper
+
+    def status(self) -> dict[str, Any]:
+        """Pool usage and per-tool queue metrics, for the health resource."""
+        return {
+            "process_workers": self._processes.status() if self._processes else {"max": 0, "alive": 0, "busy": 0},
+            "thread_workers": self.thread_workers,
+            "tools": {
+                name: {"pool": self.policy(name)["pool"], **stats.snapshot()}
+                for name, stats in self._stats.items()
+            },
+        }
@@ -0,0 +1,395 @@
+"""Cross-document contradiction detection over a corpus of documents.
+
+``mutate``'s contradiction strategy compares clauses within one file. This
+module keeps a persistent fact index over a whole corpus so one document
+can be checked against all others without comparing documents pairwise:
+
+- Facts are extracted with the mutate engine's patterns: numeric
+  parameters (``NUMERIC_PARAM_RE``), ranges (``RANGE_RE``) and modal
+  obligations ("X shall" / "X shall not")
+- Each fact is bucketed by kind and key: subject and unit for numeric
+  parameters, subject for ranges and obligations. The subject is the
+  first content word of the sentence, which is the grammatical subject
+  in the clause style specs and contracts are written in
+- The index lives in SQLite under ~/.cq-engine/cache/ and is updated per
+  file: only files whose mtime or size changed are re-extracted
+- A conflict query looks up each of the document's facts in its bucket,
+  so it costs time proportional to the matching bucket sizes (and stops
+  at the result limit), not to the corpus size
+
+Zero-infrastructure: standard library only.
+"""
+import bisect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .mutate import NUMERIC_PARAM_RE, RANGE_RE, _modal_clauses, _parse_sections
+from .response import render
+from .text_analysis import tokenize
+
+FACTS_DB = Path("~/.cq-engine/cache/facts.db").expanduser()
+
+# Files indexed when a corpus directory is scanned
+DOCUMENT_SUFFIXES = (".md", ".markdown", ".txt")
+
+# Words that cannot be the subject of a fact
+_SUBJECT_STOPWORDS = frozenset({
+    "the", "a", "an", "all", "any", "each", "every", "this", "that", "these",
+    "those", "its", "their", "our", "your", "shall", "must", "will", "should",
+    "may", "can", "be", "is", "are", "was", "were", "been", "not", "no", "at",
+    "least", "most", "within", "after", "before", "for", "of", "to", "in",
+    "on", "by", "with", "from", "up", "than", "per", "more", "less",
+    "between", "and", "or", "if", "when", "unless", "it", "there", "either",
+    "neither", "both",
+})
+# Sentence boundaries; a period between digits ("99.9") is not one
+_SENTENCE_END_RE = re.compile(r"(?<!\d)[.;!?](?!\d)|[.;!?](?=\s|$)")
+
+# Bump when the schema or extraction changes; older indexes are rebuilt
+SCHEMA_VERSION = 1
+
+# One row per distinct (kind, key, value) in a document, holding its first
+# occurrence. Rows of a bucket are stored in (doc, value) order, so a
+# conflict lookup streams from the primary key and stops at its limit.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS facts (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    doc TEXT NOT NULL,
+    value TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    section TEXT NOT NULL,
+    text TEXT NOT NULL,
+    occurrences INTEGER NOT NULL,
+    PRIMARY KEY (kind, key, doc, value)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS facts_doc ON facts (doc);
+"""
+
+_BUCKET_SQL = """
+SELECT doc, value, line, section, text, occurrences
+FROM facts
+WHERE kind = ? AND key = ? AND doc >= ? AND doc < ? AND doc != ? AND value != ?
+ORDER BY kind, key, doc, value
+LIMIT ?
+"""
+
+
+def _subject(sentence: str) -> str:
+    """First content word of a sentence, plural "s" folded."""
+    for token in tokenize(sentence):
+        if token in _SUBJECT_STOPWORDS or any(c.isdigit() for c in token):
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        return token
+    return ""
+
+
+def _sentence_at(line: str, pos: int) -> str:
+    """The sentence of ``line`` that contains character offset ``pos``."""
+    start = 0
+    for m in _SENTENCE_END_RE.finditer(line):
+        if m.start() >= pos:
+            return line[start:m.start()]
+        start = m.end()
+    return line[start:]
+
+
+def extract_facts(content: str) -> list[tuple[str, str, str, int, str, str]]:
+    """Extract (kind, key, value, line, section, text) facts from a document.
+
+    Kinds are ``numeric`` (key "subject|unit", value the number),
+    ``range`` (key subject, value "low-high") and ``obligation`` (key
+    subject, value "shall" or "shall_not"). Facts without a subject are
+    skipped, as they cannot be compared across documents.
+    """
+    lines = content.split("\n")
+    sections = _parse_sections(content)
+    starts = [s["start_line"] for s in sections]
+
+    def section_for(line_num: int) -> str:
+        idx = bisect.bisect_right(starts, line_num) - 1
+        return sections[idx]["name"] if idx >= 0 else "Document"
+
+    facts: list[tuple[str, str, str, int, str, str]] = []
+    for i, line in enumerate(lines):
+        if line.startswith("#"):
+            continue
+        line_num = i + 1
+        for m in NUMERIC_PARAM_RE.finditer(line):
+            subject = _subject(_sentence_at(line, m.start()))
+            if not subject:
+                continue
+            unit = " ".join(m.group(2).lower().split()).rstrip("s")
+            if unit in ("%", "percent"):
+                unit = "percent"
+            facts.append(("numeric", f"{subject}|{unit}", f"{float(m.group(1)):g}",
+                          line_num, section_for(line_num), line.strip()))
+        for m in RANGE_RE.finditer(line):
+            subject = _subject(_sentence_at(line, m.start()))
+            if not subject:
+                continue
+            value = f"{float(m.group(1)):g}-{float(m.group(2)):g}"
+            facts.append(("range", subject, value, line_num, section_for(line_num), line.strip()))
+
+    shall_lines, shall_not_lines = _modal_clauses(lines)
+    for polarity, clauses in (("shall", shall_lines), ("shall_not", shall_not_lines)):
+        for line_num, subject, text in clauses:
+            facts.append(("obligation", subject, polarity, line_num, section_for(line_num), text))
+    return facts
+
+
+class FactIndex:
+    """Persistent fact index over documents, updated per file."""
+
+    def __init__(self, db_path: str | Path = FACTS_DB) -> None:
+        self.db_path = Path(db_path).expanduser()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        # Connect on first use so importing the tool creates no files
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.executescript(
+                    "DROP TABLE IF EXISTS facts; DROP TABLE IF EXISTS documents;"
+                )
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _index_file(self, db: sqlite3.Connection, path: str, fingerprint: tuple[int, int]) -> bool:
+        """Re-extract ``path`` if its fingerprint changed. Returns True if it did."""
+        row = db.execute("SELECT mtime_ns, size FROM documents WHERE path = ?", (path,)).fetchone()
+        if row is not None and tuple(row) == fingerprint:
+            return False
+        try:
+            content = Path(path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return False
+        first: dict[tuple[str, str, str], list] = {}
+        for kind, key, value, line, section, text in extract_facts(content):
+            row = first.get((kind, key, value))
+            if row is None:
+                first[(kind, key, value)] = [kind, key, path, value, line, section, text, 1]
+            else:
+                row[-1] += 1
+        db.execute("DELETE FROM facts WHERE doc = ?", (path,))
+        db.executemany(
+            "INSERT INTO facts (kind, key, doc, value, line, section, text, occurrences) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            first.values(),
+        )
+        db.execute(
+            "INSERT OR REPLACE INTO documents (path, mtime_ns, size) VALUES (?, ?, ?)",
+            (path, *fingerprint),
+        )
+        return True
+
+    def update(self, corpus_dir: str | Path, extra_files: tuple[str, ...] = ()) -> dict[str, int]:
+        """Bring the index up to date with ``corpus_dir`` (recursively).
+
+        ``extra_files`` outside the corpus are indexed too. Documents that
+        disappeared from the corpus are removed.
+
+        Returns:
+            Counts of ``indexed``, ``unchanged`` and ``removed`` files.
+        """
+        root = str(Path(corpus_dir).resolve())
+        found: dict[str, tuple[int, int]] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if name.endswith(DOCUMENT_SUFFIXES):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    found[path] = (st.st_mtime_ns, st.st_size)
+        for path in extra_files:
+            st = os.stat(path)
+            found[str(Path(path).resolve())] = (st.st_mtime_ns, st.st_size)
+
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        with self._lock:
+            db = self._db()
+            with db:
+                low, high = _prefix_bounds(root)
+                known = [r[0] for r in db.execute(
+                    "SELECT path FROM documents WHERE path >= ? AND path < ?", (low, high),
+                )]
+                for path in known:
+                    if path not in found:
+                        db.execute("DELETE FROM facts WHERE doc = ?", (path,))
+                        db.execute("DELETE FROM documents WHERE path = ?", (path,))
+                        counts["removed"] += 1
+                for path, fingerprint in found.items():
+                    if self._index_file(db, path, fingerprint):
+                        counts["indexed"] += 1
+                    else:
+                        counts["unchanged"] += 1
+        return counts
+
+    def conflicts(self, target_path: str | Path, corpus_dir: str | Path, limit: int = 100) -> list[dict[str, Any]]:
+        """Facts of ``target_path`` that conflict with other corpus documents.
+
+        Each distinct fact of the target (first occurrence) is reported
+        once per other document and conflicting value, in line order. The
+        index must be up to date (see ``update``).
+        """
+        target = str(Path(target_path).resolve())
+        root = str(Path(corpus_dir).resolve())
+        low, high = _prefix_bounds(root)
+        results: list[dict[str, Any]] = []
+        with self._lock:
+            db = self._db()
+            own = db.execute(
+                "SELECT kind, key, value, line, section, text FROM facts WHERE doc = ? ORDER BY line, kind, key",
+                (target,),
+            ).fetchall()
+            for kind, key, value, line, section, text in own:
+                if len(results) >= limit:
+                    break
+                rows = db.execute(
+                    _BUCKET_SQL, (kind, key, low, high, target, value, limit - len(results)),
+                ).fetchall()
+                for o_doc, o_value, o_line, o_section, o_text, o_count in rows:
+                    results.append(_conflict(
+                        kind, key, value, line, section, text,
+                        os.path.relpath(o_doc, root), o_value, o_line, o_section, o_text, o_count,
+                    ))
+        return results
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            db = self._db()
+            return {
+                "documents": db.execute("SELECT COUNT(*) FROM documents").fetchone()[0],
+                "facts": db.execute("SELECT COUNT(*) FROM facts").fetchone()[0],
+            }
+
+
+def _conflict(kind, key, value, line, section, text, other, o_value, o_line, o_section, o_text, o_count) -> dict[str, Any]:
+    subject, _, unit = key.partition("|")
+    if kind == "obligation":
+        severity = "critical"
+        description = (
+            f"'{subject}' {'shall not' if value == 'shall_not' else 'shall'} here, "
+            f"but {'shall not' if o_value == 'shall_not' else 'shall'} in {other}"
+        )
+    else:
+        severity = "major"
+        shown, o_shown = (f"{value} {unit}", f"{o_value} {unit}") if unit else (value, o_value)
+        description = f"'{subject}' is {shown} here but {o_shown} in {other}"
+    return {
+        "kind": kind,
+        "subject": subject,
+        "unit": unit or None,
+        "severity": severity,
+        "location": {"line": line, "section": section},
+        "statement": text,
+        "value": value,
+        "other": {
+            "document": other,
+            "line": o_line,
+            "section": o_section,
+            "statement": o_text,
+            "value": o_value,
+            "occurrences": o_count,
+        },
+        "description": description,
+    }
+
+
+def _prefix_bounds(root: str) -> tuple[str, str]:
+    """String range covering every path under directory ``root``."""
+    prefix = root.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+_INDEX = FactIndex()
+
+
+async def conflicts(
+    target_path: str,
+    corpus_dir: str,
+    max_results: int = 100,
+    response_format: str = "pretty",
+) -> str:
+    """Find contradictions between a document and the other documents in a corpus.
+
+    Compares the numeric parameters, ranges and shall/shall-not obligations
+    of the target with those of every document under corpus_dir, using a
+    persistent fact index that is updated incrementally (only changed files
+    are re-read). Complements mutate, whose contradiction strategy checks
+    a single document.
+
+    Args:
+        target_path: Path to the document to check.
+        corpus_dir: Directory of related documents (searched recursively
+            for .md, .markdown and .txt files). The target may be inside it.
+        max_results: Maximum number of conflicts to return (default: 100).
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact, without the index
+            statistics and the descriptions restating each conflict).
+    """
+    start = time.time()
+
+    target = Path(target_path)
+    if not target.is_file():
+        return json.dumps({"error": f"File not found: {target_path}"}, indent=2)
+    if not Path(corpus_dir).is_dir():
+        return json.dumps({"error": f"Not a directory: {corpus_dir}"}, indent=2)
+
+    try:
+        update = _INDEX.update(corpus_dir, extra_files=(str(target),))
+        # One more than returned tells whether any were left out
+        found = _INDEX.conflicts(target, corpus_dir, limit=max(1, max_results) + 1)
+        stats = _INDEX.stats()
+    except sqlite3.Error as e:
+        return json.dumps({"error": f"Fact index error: {e}"}, indent=2)
+    truncated = len(found) > max(1, max_results)
+    found = found[:max(1, max_results)]
+
+    by_kind: dict[str, int] = {}
+    for c in found:
+        by_kind[c["kind"]] = by_kind.get(c["kind"], 0) + 1
+
+    return render({
+        "target": str(target_path),
+        "corpus_dir": str(corpus_dir),
+        "conflicts": found,
+        "summary": {
+            "total": len(found),
+            "by_kind": by_kind,
+            "documents_involved": len({c["other"]["document"] for c in found}),
+            "truncated": truncated,
+        },
+        "index": {**stats, **update},
+        "elapsed_ms": round((time.time() - start) * 1000, 1),
+    }, response_format, _minimal)
+
+
+def _minimal(result: dict[str, Any]) -> dict[str, Any]:
+    """Minimal response: conflicts without descriptions, no index statistics."""
+    out = {k: v for k, v in result.items() if k != "index"}
+    out["conflicts"] = [{k: v for k, v in c.items() if k != "description"} for c in result["conflicts"]]
+    return out
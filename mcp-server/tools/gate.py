@@ -13,6 +13,9 @@ import os
 import time
 from pathlib import Path
 
+from .response import cap, render
+from .text_analysis import TASK_DOMAIN_KEYWORDS, analyze
+
 # cq-engine repository root
 CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
 
@@ -45,22 +48,12 @@ LOW_RELEVANCE_PATHS = {
     "coverage", ".coverage", ".nyc_output",
 }
 
-# Keywords extracted from common task descriptions for relevance scoring
-TASK_DOMAIN_KEYWORDS = {
-    "auth": ["auth", "login", "session", "token", "jwt", "oauth", "credential", "password"],
-    "api": ["api", "endpoint", "route", "handler", "request", "response", "rest", "graphql"],
-    "database": ["database", "db", "model", "schema", "migration", "query", "sql", "orm"],
-    "test": ["test", "spec", "fixture", "mock", "assert", "expect", "coverage"],
-    "ui": ["component", "view", "template", "style", "css", "layout", "render", "ui", "frontend"],
-    "config": ["config", "setting", "env", "environment", "deploy", "ci", "docker"],
-    "docs": ["doc", "readme", "guide", "tutorial", "changelog", "license"],
-}
-
+# Excluded paths kept in minimal responses
+MINIMAL_EXCLUDED = 20
 
 def _extract_task_keywords(task_description: str) -> set[str]:
     """Extract meaningful keywords from a task description."""
-    # Normalize and split
-    words = set(task_description.lower().split())
+    words = analyze(task_description)["tokens"]
     # Remove very short words and common stop words
     stop_words = {"the", "a", "an", "is", "are", "was", "were", "be", "been",
                   "to", "of", "in", "for", "on", "with", "at", "by", "from",
@@ -115,7 +108,21 @@ def _file_modified_days_ago(filepath: str) -> float:
         return 365.0  # Default to 1 year if inaccessible
 
 
-def _score_file(filepath: str, task_keywords: set[str]) -> dict:
+def _task_domains(task_description: str) -> list[frozenset[str]]:
+    """Return the keyword sets of the domains the task description mentions."""
+    hits = analyze(task_description)["hits"]["domain"]
+    return [
+        frozenset(keywords)
+        for keywords in TASK_DOMAIN_KEYWORDS.values()
+        if any(kw in hits for kw in keywords)
+    ]
+
+
+def _score_file(
+    filepath: str,
+    task_keywords: set[str],
+    task_domains: list[frozenset[str]],
+) -> dict:
     """Score a file's relevance to the task.
 
     Returns a dict with relevance_score (0.0–1.0) and component scores.
@@ -142,11 +149,8 @@ def _score_file(filepath: str, task_keywords: set[str]) -> dict:
 
     # Component 3: Domain keyword boost
     domain_boost = 0.0
-    for domain, domain_keywords in TASK_DOMAIN_KEYWORDS.items():
-        task_domain_overlap = task_keywords & set(domain_keywords)
-        path_domain_overlap = path_segs & set(domain_keywords)
-        if task_domain_overlap and path_domain_overlap:
-            domain_boost = max(domain_boost, 0.2)
+    if any(not path_segs.isdisjoint(keywords) for keywords in task_domains):
+        domain_boost = 0.2
 
     # Combined relevance score (weighted average)
     relevance = (
@@ -168,6 +172,7 @@ async def gate(
     available_files: list[str],
     max_files: int = 5,
     max_tokens: int = 30000,
+    response_format: str = "pretty",
 ) -> str:
     """Filter and rank files by relevance to a task using the Context Gate pattern.
 
@@ -179,6 +184,9 @@ async def gate(
         available_files: List of file paths available for context.
         max_files: Maximum number of files to include (default: 5).
         max_tokens: Maximum total tokens for selected context (default: 30000).
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact; excluded files as
+            paths only, nearest misses first, capped).
     """
     start = time.time()
 
@@ -194,11 +202,12 @@ async def gate(
 
     # Step 1: Extract task keywords
     task_keywords = _extract_task_keywords(task_description)
+    task_domains = _task_domains(task_description)
 
     # Step 2: Score all files
     scored_files = []
     for filepath in available_files:
-        score_info = _score_file(filepath, task_keywords)
+        score_info = _score_file(filepath, task_keywords, task_domains)
         estimated_tokens = _estimate_file_tokens(filepath)
         days_ago = _file_modified_days_ago(filepath)
 
@@ -292,4 +301,12 @@ async def gate(
         "elapsed_ms": round(elapsed * 1000, 1),
     }
 
-    return json.dumps(result, indent=2)
+    return render(result, response_format, _minimal)
+
+
+def _minimal(result: dict) -> dict:
+    """Minimal response: excluded files as a capped list of paths."""
+    out = dict(result)
+    out["excluded_files"] = [f["path"] for f in result["excluded_files"]]
+    cap(out, "excluded_files", MINIMAL_EXCLUDED)
+    return out
@@ -0,0 +1,135 @@
+"""Lazy tool loading for fast server startup.
+
+Every Claude Code session spawns a fresh server, so import time lands on
+every session. ``lazy_tool`` returns a stub with the tool's real name,
+signature and docstring, read from the module source without importing
+it, so the server can register its tool schema. The module is imported
+on the first call (or earlier by ``warm_load``) and the stub delegates
+to the real function from then on.
+"""
+import ast
+import builtins
+import importlib
+import inspect
+import re
+import threading
+import typing
+from pathlib import Path
+
+_TOOLS_DIR = Path(__file__).resolve().parent
+_import_lock = threading.Lock()
+
+# Names tool annotations may use
+_ANNOTATION_NAMESPACE = {"__builtins__": builtins, **{n: getattr(typing, n) for n in typing.__all__}}
+
+
+def _load(module_name: str, func_name: str):
+    """Import ``module_name`` (once) and return ``func_name`` from it."""
+    with _import_lock:
+        module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+def _read_signature(module_name: str, func_name: str) -> tuple[inspect.Signature, str] | None:
+    """Extract a coroutine function's signature and docstring from source.
+
+    Only the ``async def`` header and docstring are parsed, not the whole
+    module. Returns None if they cannot be found or evaluated.
+    """
+    path = _TOOLS_DIR / f"{module_name.rsplit('.', 1)[-1]}.py"
+    try:
+        source = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    m = re.search(
+        rf'^async def {re.escape(func_name)}\(.*?\)\s*(?:->\s*[^:\n]+)?:\s*\n(\s+)(""".*?""")',
+        source,
+        re.MULTILINE | re.DOTALL,
+    )
+    if not m:
+        return None
+    try:
+        node = ast.parse(f"{m.group(0)}\n{m.group(1)}pass").body[0]
+        args = node.args
+        positional = args.posonlyargs + args.args
+        defaults = [inspect.Parameter.empty] * (len(positional) - len(args.defaults))
+        defaults += [ast.literal_eval(d) for d in args.defaults]
+
+        def annotation(arg: ast.arg):
+            if arg.annotation is None:
+                return inspect.Parameter.empty
+            return eval(ast.unparse(arg.annotation), _ANNOTATION_NAMESPACE)
+
+        params = [
+            inspect.Parameter(
+                arg.arg, inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=default, annotation=annotation(arg),
+            )
+            for arg, default in zip(positional, defaults)
+        ]
+        params += [
+            inspect.Parameter(
+                arg.arg, inspect.Parameter.KEYWORD_ONLY,
+                default=(inspect.Parameter.empty if d is None else ast.literal_eval(d)),
+                annotation=annotation(arg),
+            )
+            for arg, d in zip(args.kwonlyargs, args.kw_defaults)
+        ]
+        returns = (
+            eval(ast.unparse(node.returns), _ANNOTATION_NAMESPACE)
+            if node.returns is not None else inspect.Signature.empty
+        )
+        return inspect.Signature(params, return_annotation=returns), ast.get_docstring(node) or ""
+    except (SyntaxError, ValueError, NameError, TypeError, IndexError):
+        return None
+
+
+def lazy_tool(module_name: str, func_name: str):
+    """Return a stub for ``module_name.func_name`` that imports it on first call.
+
+    Falls back to importing the module immediately if the signature cannot
+    be read from source.
+    """
+    extracted = _read_signature(module_name, func_name)
+    if extracted is None:
+        return _load(module_name, func_name)
+    signature, doc = extracted
+    real = None
+
+    async def stub(*args, **kwargs):
+        nonlocal real
+        if real is None:
+            real = _load(module_name, func_name)
+        return await real(*args, **kwargs)
+
+    stub.__name__ = stub.__qualname__ = func_name
+    stub.__module__ = module_name
+    stub.__doc__ = doc
+    stub.__signature__ = signature
+    stub.__annotations__ = {
+        p.name: p.annotation for p in signature.parameters.values()
+        if p.annotation is not inspect.Parameter.empty
+    }
+    if signature.return_annotation is not inspect.Signature.empty:
+        stub.__annotations__["return"] = signature.return_annotation
+    return stub
+
+
+def warm_load(module_names: list[str], hooks: list[tuple[str, str]] = ()) -> None:
+    """Import tool modules ahead of their first call (run in a thread).
+
+    ``hooks`` are ``(module, function)`` pairs called with no arguments
+    after the imports, e.g. to build an index. Errors are left for the
+    first real call to report.
+    """
+    for name in module_names:
+        try:
+            with _import_lock:
+                importlib.import_module(name)
+        except Exception:
+            continue
+    for module_name, func_name in hooks:
+        try:
+            _load(module_name, func_name)()
+        except Exception:
+            continue
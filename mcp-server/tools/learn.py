@@ -10,33 +10,13 @@ import random
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .response import render
+from .text_analysis import PATTERN_KEYWORD_MAP, analyze
+
 CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
 
 VALID_CATEGORIES = ("pattern_usage", "failure", "preference", "optimization")
 
-PATTERN_KEYWORD_MAP: dict[str, str] = {
-    "attention": "Pattern 01: Attention Budget",
-    "budget": "Pattern 01: Attention Budget",
-    "token": "Pattern 01: Attention Budget",
-    "context": "Pattern 02: Context Gate",
-    "filter": "Pattern 02: Context Gate",
-    "gate": "Pattern 02: Context Gate",
-    "persona": "Pattern 03: Cognitive Profile",
-    "role": "Pattern 03: Cognitive Profile",
-    "profile": "Pattern 03: Cognitive Profile",
-    "mutation": "Pattern 05: Assumption Mutation",
-    "test": "Pattern 05: Assumption Mutation",
-    "assumption": "Pattern 05: Assumption Mutation",
-    "learn": "Pattern 06: Experience Distillation",
-    "experience": "Pattern 06: Experience Distillation",
-    "distill": "Pattern 06: Experience Distillation",
-    "file": "Pattern 07: File-Based I/O",
-    "io": "Pattern 07: File-Based I/O",
-    "output": "Pattern 07: File-Based I/O",
-    "template": "Pattern 08: Template-Driven Role",
-    "driven": "Pattern 08: Template-Driven Role",
-}
-
 LEARNED_BASE = Path("~/.cq-engine/learned").expanduser()
 
 
@@ -83,13 +63,12 @@ def _load_existing(path: Path) -> list[dict]:
     return entries
 
 
-def _find_pattern_suggestion(tokens: set[str]) -> str:
-    """Map observation tokens to a CQE Pattern suggestion."""
+def _find_pattern_suggestion(keywords: list[str]) -> str:
+    """Map matched pattern keywords to a CQE Pattern suggestion."""
     pattern_scores: dict[str, int] = {}
-    for token in tokens:
-        pattern = PATTERN_KEYWORD_MAP.get(token)
-        if pattern:
-            pattern_scores[pattern] = pattern_scores.get(pattern, 0) + 1
+    for keyword in keywords:
+        pattern = PATTERN_KEYWORD_MAP[keyword]
+        pattern_scores[pattern] = pattern_scores.get(pattern, 0) + 1
     if not pattern_scores:
         return ""
     best = max(pattern_scores, key=lambda k: pattern_scores[k])
@@ -101,6 +80,7 @@ async def learn(
     category: str,
     confidence: float = 0.5,
     project: str = "",
+    response_format: str = "pretty",
 ) -> str:
     """Record a learning observation from agent execution.
 
@@ -109,6 +89,8 @@ async def learn(
         category: One of "pattern_usage", "failure", "preference", "optimization".
         confidence: Confidence level 0.0-1.0.
         project: Project scope (empty string for global).
+        response_format: "pretty" (indented JSON), "compact" or "minimal"
+            (both without whitespace).
     """
     # Validate category
     if category not in VALID_CATEGORIES:
@@ -164,10 +146,11 @@ async def learn(
     related_learnings = related_learnings[:5]
 
     # Pattern suggestion
-    pattern_suggestion = _find_pattern_suggestion(obs_tokens)
+    pattern_keywords = sorted(analyze(observation)["hits"]["pattern"])
+    pattern_suggestion = _find_pattern_suggestion(pattern_keywords)
 
     # Extract keyword tags
-    tags = sorted(obs_tokens & set(PATTERN_KEYWORD_MAP.keys()))
+    tags = pattern_keywords
     if not tags:
         # Use top frequency words (3+ chars) as tags, up to 5
         tags = sorted([t for t in obs_tokens if len(t) >= 4])[:5]
@@ -197,4 +180,4 @@ async def learn(
         "duplicate_warning": duplicate_warning,
     }
 
-    return json.dumps(result, indent=2, ensure_ascii=False)
+    return render(result, response_format, ensure_ascii=False)
@@ -6,17 +6,26 @@ different document types (contract, API spec, academic paper, policy).
 
 Zero-infrastructure: standard library only, no LLM API calls.
 """
+import bisect
+import hashlib
 import json
 import re
+import threading
 import time
+from collections import Counter, OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Sequence
+
+from .document import MappedDocument, read_document
+from .response import cap, render
 
 CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
 
 # ============================================================
 # Vague modifier catalog (Ambiguity strategy)
 # ============================================================
+# A superset of the catalog in mutadoc.sh: every shell modifier is here,
+# so both CLIs report the same ambiguity findings on the same document
 VAGUE_MODIFIERS: list[str] = [
     "appropriate", "reasonable", "sufficient", "timely", "adequate",
     "significant", "substantial", "promptly", "approximately", "generally",
@@ -25,6 +34,8 @@ VAGUE_MODIFIERS: list[str] = [
     "best efforts", "commercially reasonable", "good faith", "material",
     "immaterial", "de minimis", "nominal", "undue", "excessive", "unreasonable",
     "satisfactory", "acceptable", "moderate", "suitable", "proper",
+    "periodically", "regularly", "as soon as possible", "industry standard",
+    "state of the art", "including but not limited to", "primarily", "fair",
 ]
 
 # ============================================================
@@ -40,12 +51,14 @@ CLAIM_INDICATORS: list[str] = [
 # ============================================================
 # Obligation keywords for severity escalation
 # ============================================================
+# Stems (obligat, defin, includ, condition) match any ending, as in
+# mutadoc.sh: "obligations", "defined", "includes", "conditions"
 OBLIGATION_KEYWORDS = re.compile(
-    r"\b(shall|must|obligat|required|entitled|rights?|deadline|within\s+\d+\s*days?)\b",
+    r"\b(shall|must|obligat\w*|required|entitled|rights?|deadline|within\s+\d+\s*days?)\b",
     re.IGNORECASE,
 )
 SCOPE_KEYWORDS = re.compile(
-    r"\b(scope|defin|means|includ|condition|criteria)\b",
+    r"\b(scope|defin\w*|means|includ\w*|condition\w*|criteria)\b",
     re.IGNORECASE,
 )
 STRONG_OBLIGATION_KEYWORDS = re.compile(
@@ -83,16 +96,21 @@ RANGE_RE = re.compile(
 
 # Section heading pattern
 SECTION_RE = re.compile(r"^(#{1,4})\s+(.+)$", re.MULTILINE)
+# Lines that may be headings, searched over a MappedDocument's bytes
+_HEADING_PREFILTER = re.compile(rb"(?m)^#")
 
 # Severity ordering
 SEVERITY_ORDER = {"critical": 0, "major": 1, "minor": 2, "info": 3}
 
+# Findings kept in minimal responses, most severe first
+MINIMAL_MUTATIONS = 50
+
 
-def _parse_sections(content: str) -> list[dict[str, Any]]:
-    """Parse markdown into sections with line numbers."""
-    lines = content.split("\n")
+def _parse_sections(content: str | Sequence[str]) -> list[dict[str, Any]]:
+    """Parse markdown (text or a sequence of lines) into sections with line numbers."""
+    lines = content.split("\n") if isinstance(content, str) else content
     sections: list[dict[str, Any]] = []
-    for i, line in enumerate(lines):
+    for i, line in _candidate_lines(lines, _HEADING_PREFILTER):
         m = re.match(r"^(#{1,4})\s+(.+)$", line)
         if m:
             sections.append({
@@ -110,12 +128,40 @@ def _parse_sections(content: str) -> list[dict[str, Any]]:
     return sections
 
 
+def _candidate_lines(lines: Sequence[str], prefilter: re.Pattern | None) -> Iterable[tuple[int, str]]:
+    """(index, line) pairs a line-by-line search has to look at.
+
+    Every line, except on a ``MappedDocument``, where the lowercase bytes
+    pattern ``prefilter`` (a superset of the caller's str pattern, see
+    ``MappedDocument.lines_matching``) selects the candidates.
+    """
+    if prefilter is not None and isinstance(lines, MappedDocument):
+        return lines.lines_matching(prefilter)
+    return enumerate(lines)
+
+
+def _keyword_patterns(keywords: list[str]) -> tuple[re.Pattern, re.Pattern | None]:
+    """Case-insensitive whole-word pattern for any of ``keywords``, and its bytes prefilter."""
+    alternation = "|".join(re.escape(k) for k in keywords)
+    prefilter = None
+    if alternation.isascii():
+        prefilter = re.compile(rb"\b(?:" + alternation.lower().encode("ascii") + rb")\b")
+    return re.compile(r"\b(?:" + alternation + r")\b", re.IGNORECASE), prefilter
+
+
+def _count_refs(lines: Sequence[str], name: str, start: int, end: int) -> int:
+    """Case-insensitive occurrences of ``name`` in lines ``start`` to ``end`` (0-based)."""
+    if isinstance(lines, MappedDocument):
+        return lines.count_literal(name, start, end)
+    return len(re.findall(re.escape(name), "\n".join(lines[start:end]), re.IGNORECASE))
+
+
 def _get_section_text(lines: list[str], start: int, end: int) -> str:
     """Get text between line numbers (1-indexed)."""
     return "\n".join(lines[start - 1:end])
 
 
-def _get_context(lines: list[str], line_num: int, window: int = 5) -> str:
+def _get_context(lines: Sequence[str], line_num: int, window: int = 5) -> str:
     """Get context lines around a line number (1-indexed)."""
     start = max(0, line_num - 1 - window)
     end = min(len(lines), line_num + window)
@@ -124,10 +170,8 @@ def _get_context(lines: list[str], line_num: int, window: int = 5) -> str:
 
 def _find_section_for_line(sections: list[dict[str, Any]], line_num: int) -> str:
     """Find which section a line belongs to."""
-    for sec in reversed(sections):
-        if line_num >= sec["start_line"]:
-            return sec["name"]
-    return "Document"
+    idx = bisect.bisect_right(sections, line_num, key=lambda sec: sec["start_line"])
+    return sections[idx - 1]["name"] if idx else "Document"
 
 
 def _load_preset(preset_name: str) -> dict[str, Any]:
@@ -145,6 +189,7 @@ def _load_preset(preset_name: str) -> dict[str, Any]:
     config: dict[str, Any] = {}
     config["strategies"] = {}
     config["severity_overrides"] = {}
+    config["domain_terminology"] = []
     current_block = ""
     for line in front_matter.split("\n"):
         stripped = line.strip()
@@ -172,6 +217,8 @@ def _load_preset(preset_name: str) -> dict[str, Any]:
         elif current_block == "severity_overrides" and ":" in stripped:
             key, val = stripped.split(":", 1)
             config["severity_overrides"][key.strip().strip("- ")] = val.strip().strip('"')
+        elif current_block == "domain_terminology" and stripped.startswith("- "):
+            config["domain_terminology"].append(stripped[2:].strip().strip('"'))
     return config
 
 
@@ -183,24 +230,58 @@ def _severity_meets_threshold(severity: str, threshold: str) -> bool:
 # ============================================================
 # Strategy: Contradiction
 # ============================================================
-def _run_contradiction(lines: list[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Detect cross-section contradictions via numeric and modal verb analysis."""
-    mutations: list[dict[str, Any]] = []
-    content = "\n".join(lines)
+_SHALL_RE = re.compile(r"(\w+)\s+shall\b(?!\s+not\b)", re.IGNORECASE)
+_SHALL_NOT_RE = re.compile(r"(\w+)\s+(?:shall\s+not|shall\s+never|must\s+not)\b", re.IGNORECASE)
+_MODAL_PREFILTER = re.compile(rb"shall|must")
+# NUMERIC_PARAM_RE and RANGE_RE need a digit; \d also matches non-ASCII digits
+_NUMERIC_PREFILTER = re.compile(rb"[0-9\x80-\xff]")
 
-    # 1. Numeric contradiction: same unit, different values across sections
-    seen_values: dict[str, list[tuple[str, int, str]]] = {}
-    for i, line in enumerate(lines):
+
+def _numeric_values(lines: Sequence[str]) -> list[tuple[str, str, int]]:
+    """Extract (unit, value, line) for every numeric parameter, in document order."""
+    values: list[tuple[str, str, int]] = []
+    for i, line in _candidate_lines(lines, _NUMERIC_PREFILTER):
         for m in NUMERIC_PARAM_RE.finditer(line):
-            val = m.group(1)
             unit = m.group(2).lower().rstrip("s")
             # Normalize units
             if unit in ("%", "percent"):
                 unit = "percent"
-            key = unit
-            section_name = _find_section_for_line(sections, i + 1)
-            seen_values.setdefault(key, []).append((val, i + 1, section_name))
+            values.append((unit, m.group(1), i + 1))
+    return values
+
+
+def _modal_clauses(lines: Sequence[str]) -> tuple[list[tuple[int, str, str]], list[tuple[int, str, str]]]:
+    """Extract (line, subject, text) for "shall" and "shall not" clauses."""
+    shall_lines: list[tuple[int, str, str]] = []
+    shall_not_lines: list[tuple[int, str, str]] = []
+    for i, line in _candidate_lines(lines, _MODAL_PREFILTER):
+        # Cheap substring test first; most lines have no modal verb.
+        # casefold, not lower: the patterns also match "ſhall"
+        folded = line.casefold()
+        has_shall = "shall" in folded
+        if not has_shall and "must" not in folded:
+            continue
+        if has_shall:
+            for m in _SHALL_RE.finditer(line):
+                shall_lines.append((i + 1, m.group(1).lower(), line.strip()))
+        for m in _SHALL_NOT_RE.finditer(line):
+            shall_not_lines.append((i + 1, m.group(1).lower(), line.strip()))
+    return shall_lines, shall_not_lines
 
+
+def _pair_contradictions(
+    seen_values: dict[str, list[tuple[str, int, str]]],
+    shall_lines: list[tuple[int, str, str, str]],
+    shall_not_lines: list[tuple[int, str, str, str]],
+) -> list[dict[str, Any]]:
+    """Pair conflicting numeric values and modal clauses into mutations.
+
+    ``seen_values`` maps unit -> (value, line, section) in document order;
+    the clause lists hold (line, subject, text, section).
+    """
+    mutations: list[dict[str, Any]] = []
+
+    # 1. Numeric contradiction: same unit, different values across sections
     reported_pairs: set[tuple[str, str]] = set()
     for unit, occurrences in seen_values.items():
         if len(occurrences) < 2:
@@ -229,24 +310,16 @@ def _run_contradiction(lines: list[str], sections: list[dict[str, Any]]) -> list
                 })
 
     # 2. Modal verb contradiction: "shall" vs "shall not" for same subject
-    shall_lines: list[tuple[int, str, str]] = []
-    shall_not_lines: list[tuple[int, str, str]] = []
-    shall_re = re.compile(r"(\w+)\s+shall\b(?!\s+not\b)", re.IGNORECASE)
-    shall_not_re = re.compile(r"(\w+)\s+(?:shall\s+not|shall\s+never|must\s+not)\b", re.IGNORECASE)
-
-    for i, line in enumerate(lines):
-        for m in shall_re.finditer(line):
-            shall_lines.append((i + 1, m.group(1).lower(), line.strip()))
-        for m in shall_not_re.finditer(line):
-            shall_not_lines.append((i + 1, m.group(1).lower(), line.strip()))
-
-    for pos_line, pos_subj, pos_text in shall_lines:
-        for neg_line, neg_subj, neg_text in shall_not_lines:
-            if pos_subj == neg_subj and pos_line != neg_line:
+    negatives: dict[str, list[int]] = {}
+    for neg_line, neg_subj, _, _ in shall_not_lines:
+        negatives.setdefault(neg_subj, []).append(neg_line)
+    for pos_line, pos_subj, pos_text, pos_sec in shall_lines:
+        for neg_line in negatives.get(pos_subj, ()):
+            if pos_line != neg_line:
                 mutations.append({
                     "id": "",
                     "strategy": "contradiction",
-                    "location": {"line": pos_line, "section": _find_section_for_line(sections, pos_line)},
+                    "location": {"line": pos_line, "section": pos_sec},
                     "original": pos_text,
                     "mutated": f"'{pos_subj}' has both affirmative (line {pos_line}) and negative (line {neg_line}) obligations",
                     "severity": "critical",
@@ -257,16 +330,36 @@ def _run_contradiction(lines: list[str], sections: list[dict[str, Any]]) -> list
     return mutations
 
 
+def _run_contradiction(lines: Sequence[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Detect cross-section contradictions via numeric and modal verb analysis."""
+    seen_values: dict[str, list[tuple[str, int, str]]] = {}
+    for unit, val, line_num in _numeric_values(lines):
+        seen_values.setdefault(unit, []).append(
+            (val, line_num, _find_section_for_line(sections, line_num))
+        )
+    shall_lines, shall_not_lines = _modal_clauses(lines)
+    return _pair_contradictions(
+        seen_values,
+        [(n, subj, text, _find_section_for_line(sections, n)) for n, subj, text in shall_lines],
+        [(n, subj, text, "") for n, subj, text in shall_not_lines],
+    )
+
+
 # ============================================================
 # Strategy: Ambiguity
 # ============================================================
-def _run_ambiguity(lines: list[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
+_VAGUE_ANY_RE, _VAGUE_PREFILTER = _keyword_patterns(VAGUE_MODIFIERS)
+
+
+def _run_ambiguity(lines: Sequence[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Detect vague modifiers and assess severity based on context."""
     mutations: list[dict[str, Any]] = []
+    # One pass finds the lines with any modifier; each modifier scans only those
+    candidates = [(i, line) for i, line in _candidate_lines(lines, _VAGUE_PREFILTER) if _VAGUE_ANY_RE.search(line)]
 
-    for modifier in VAGUE_MODIFIERS:
+    for rank, modifier in enumerate(VAGUE_MODIFIERS):
         pattern = re.compile(r"\b" + re.escape(modifier) + r"\b", re.IGNORECASE)
-        for i, line in enumerate(lines):
+        for i, line in candidates:
             if pattern.search(line):
                 line_num = i + 1
                 severity = "minor"
@@ -287,6 +380,7 @@ def _run_ambiguity(lines: list[str], sections: list[dict[str, Any]]) -> list[dic
                     "severity": severity,
                     "detected": False,
                     "_desc": f"Vague modifier '{modifier}' — meaning is undefined and open to interpretation",
+                    "_rank": rank,
                 })
 
     return mutations
@@ -295,29 +389,22 @@ def _run_ambiguity(lines: list[str], sections: list[dict[str, Any]]) -> list[dic
 # ============================================================
 # Strategy: Deletion
 # ============================================================
-def _run_deletion(lines: list[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _run_deletion(lines: Sequence[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Find dead clauses via cross-reference counting."""
     mutations: list[dict[str, Any]] = []
-    full_text = "\n".join(lines)
+    totals: dict[str, int] = {}
 
     for i, sec in enumerate(sections):
         name = sec["name"]
         start = sec["start_line"]
         end = sec["end_line"]
 
-        # Count references to this section name from outside the section
-        name_escaped = re.escape(name)
-        ref_count = 0
-
-        # Text before section
-        if start > 1:
-            before_text = "\n".join(lines[:start - 1])
-            ref_count += len(re.findall(name_escaped, before_text, re.IGNORECASE))
-
-        # Text after section
-        if end < len(lines):
-            after_text = "\n".join(lines[end:])
-            ref_count += len(re.findall(name_escaped, after_text, re.IGNORECASE))
+        # Count references to this section name from outside the section.
+        # A match never spans lines, so that is the document total (one
+        # scan per distinct name) minus the matches inside the section
+        if name not in totals:
+            totals[name] = _count_refs(lines, name, 0, len(lines))
+        ref_count = totals[name] - _count_refs(lines, name, start - 1, end)
 
         if ref_count == 0:
             mutations.append({
@@ -348,13 +435,17 @@ def _run_deletion(lines: list[str], sections: list[dict[str, Any]]) -> list[dict
 # ============================================================
 # Strategy: Inversion
 # ============================================================
-def _run_inversion(lines: list[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
+_CLAIM_ANY_RE, _CLAIM_PREFILTER = _keyword_patterns(CLAIM_INDICATORS)
+
+
+def _run_inversion(lines: Sequence[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Detect unsupported claims vulnerable to inversion."""
     mutations: list[dict[str, Any]] = []
+    candidates = [(i, line) for i, line in _candidate_lines(lines, _CLAIM_PREFILTER) if _CLAIM_ANY_RE.search(line)]
 
-    for indicator in CLAIM_INDICATORS:
+    for rank, indicator in enumerate(CLAIM_INDICATORS):
         pattern = re.compile(r"\b" + re.escape(indicator) + r"\b", re.IGNORECASE)
-        for i, line in enumerate(lines):
+        for i, line in candidates:
             if pattern.search(line):
                 line_num = i + 1
                 context = _get_context(lines, line_num, window=3)
@@ -375,6 +466,7 @@ def _run_inversion(lines: list[str], sections: list[dict[str, Any]]) -> list[dic
                         "severity": severity,
                         "detected": False,
                         "_desc": f"Claim '{indicator}...' has no supporting evidence — vulnerable to inversion",
+                        "_rank": rank,
                     })
 
     return mutations
@@ -383,11 +475,11 @@ def _run_inversion(lines: list[str], sections: list[dict[str, Any]]) -> list[dic
 # ============================================================
 # Strategy: Boundary
 # ============================================================
-def _run_boundary(lines: list[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _run_boundary(lines: Sequence[str], sections: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Analyze numeric parameter sensitivity at boundaries."""
     mutations: list[dict[str, Any]] = []
 
-    for i, line in enumerate(lines):
+    for i, line in _candidate_lines(lines, _NUMERIC_PREFILTER):
         for m in NUMERIC_PARAM_RE.finditer(line):
             val_str = m.group(1)
             unit = m.group(2)
@@ -461,63 +553,41 @@ def _calculate_kill_score(mutations: list[dict[str, Any]]) -> float:
 
 
 # ============================================================
-# Main tool function
+# Engine (shared by the MCP tool and the MutaDoc CLI)
 # ============================================================
-async def mutate(
-    target_path: str,
-    strategies: str = "all",
-    severity_threshold: str = "minor",
-    preset: str = "",
-) -> str:
-    """Run mutation testing on a document to detect hidden vulnerabilities.
+ALL_STRATEGIES: list[str] = ["contradiction", "ambiguity", "deletion", "inversion", "boundary"]
 
-    Applies 5 mutation strategies (contradiction, ambiguity, deletion, inversion,
-    boundary) to identify unverified assumptions, vague language, contradictions,
-    dead clauses, and fragile numeric parameters.
+STRATEGY_RUNNERS = {
+    "contradiction": _run_contradiction,
+    "ambiguity": _run_ambiguity,
+    "deletion": _run_deletion,
+    "inversion": _run_inversion,
+    "boundary": _run_boundary,
+}
 
-    Args:
-        target_path: Path to the document file to test (Markdown or plain text).
-        strategies: Comma-separated strategy names or "all". Options:
-            contradiction, ambiguity, deletion, inversion, boundary.
-        severity_threshold: Minimum severity to include in results.
-            Options: info, minor, major, critical.
-        preset: Optional document type preset. Options:
-            contract, api_spec, academic_paper, policy.
 
-    Returns:
-        JSON string with mutation results including findings, kill score, and summary.
-    """
-    start_time = time.time()
-
-    # Validate target file
-    target = Path(target_path)
-    if not target.exists():
-        return json.dumps({"error": f"File not found: {target_path}"}, indent=2)
-    if not target.is_file():
-        return json.dumps({"error": f"Not a file: {target_path}"}, indent=2)
-
-    content = target.read_text(encoding="utf-8")
-    lines = content.split("\n")
-    sections = _parse_sections(content)
+def _resolve_strategies(strategies: str, preset: str) -> tuple[list[str], dict[str, Any]]:
+    """Return the active strategies and the preset configuration.
 
+    Raises:
+        ValueError: If the preset is not found or a strategy is unknown.
+    """
     # Load preset if specified
     preset_config: dict[str, Any] = {}
     if preset:
         preset_config = _load_preset(preset)
         if not preset_config:
-            return json.dumps({"error": f"Preset not found: {preset}"}, indent=2)
+            raise ValueError(f"Preset not found: {preset}")
 
     # Determine active strategies
-    all_strategies = ["contradiction", "ambiguity", "deletion", "inversion", "boundary"]
     if strategies == "all":
-        active_strategies = all_strategies[:]
+        active_strategies = ALL_STRATEGIES[:]
     else:
         active_strategies = [s.strip().lower() for s in strategies.split(",")]
-        invalid = [s for s in active_strategies if s not in all_strategies]
+        invalid = [s for s in active_strategies if s not in ALL_STRATEGIES]
         if invalid:
-            return json.dumps(
-                {"error": f"Unknown strategies: {', '.join(invalid)}. Valid: {', '.join(all_strategies)}"},
-                indent=2,
+            raise ValueError(
+                f"Unknown strategies: {', '.join(invalid)}. Valid: {', '.join(ALL_STRATEGIES)}"
             )
 
     # Filter by preset-enabled strategies
@@ -526,28 +596,19 @@ async def mutate(
             s for s in active_strategies
             if preset_config["strategies"].get(s, {}).get("enabled", True)
         ]
+    return active_strategies, preset_config
 
-    # Run strategies
-    all_mutations: list[dict[str, Any]] = []
-
-    strategy_runners = {
-        "contradiction": _run_contradiction,
-        "ambiguity": _run_ambiguity,
-        "deletion": _run_deletion,
-        "inversion": _run_inversion,
-        "boundary": _run_boundary,
-    }
-
-    for strat_name in active_strategies:
-        runner = strategy_runners.get(strat_name)
-        if runner:
-            strat_mutations = runner(lines, sections)
-            all_mutations.extend(strat_mutations)
 
+def _finalize(
+    mutations: list[dict[str, Any]],
+    preset_config: dict[str, Any],
+    severity_threshold: str,
+) -> list[dict[str, Any]]:
+    """Apply preset severity overrides and the threshold, then assign IDs."""
     # Apply severity overrides from preset
     if preset_config.get("severity_overrides"):
         overrides = preset_config["severity_overrides"]
-        for mut in all_mutations:
+        for mut in mutations:
             if mut["strategy"] == "ambiguity" and OBLIGATION_KEYWORDS.search(mut.get("original", "")):
                 if "ambiguity_in_obligation" in overrides:
                     mut["severity"] = overrides["ambiguity_in_obligation"].lower()
@@ -556,14 +617,378 @@ async def mutate(
                     mut["severity"] = overrides["contradictory_clauses"].lower()
 
     # Filter by severity threshold
-    all_mutations = [
-        m for m in all_mutations
+    mutations = [
+        m for m in mutations
         if _severity_meets_threshold(m["severity"], severity_threshold)
     ]
 
     # Assign IDs
-    for idx, mut in enumerate(all_mutations):
+    for idx, mut in enumerate(mutations):
         mut["id"] = f"M{idx + 1:03d}"
+    return mutations
+
+
+def run_mutations(
+    content: str | MappedDocument,
+    strategies: str = "all",
+    severity_threshold: str = "minor",
+    preset: str = "",
+) -> dict[str, Any]:
+    """Run the mutation strategies over document text or a ``MappedDocument``.
+
+    Returns:
+        Dict with ``mutations`` (records with IDs assigned, including the
+        internal ``_desc`` field), ``strategies_applied``, ``sections_analyzed``
+        and ``lines_analyzed``.
+
+    Raises:
+        ValueError: If the preset is not found or a strategy is unknown.
+    """
+    lines = content.split("\n") if isinstance(content, str) else content
+    sections = _parse_sections(lines)
+    active_strategies, preset_config = _resolve_strategies(strategies, preset)
+
+    all_mutations: list[dict[str, Any]] = []
+    for strat_name in active_strategies:
+        all_mutations.extend(STRATEGY_RUNNERS[strat_name](lines, sections))
+
+    return {
+        "mutations": _finalize(all_mutations, preset_config, severity_threshold),
+        "strategies_applied": active_strategies,
+        "sections_analyzed": len(sections),
+        "lines_analyzed": len(lines),
+    }
+
+
+# ============================================================
+# Incremental mode
+# ============================================================
+# Strategies whose findings for a line depend only on nearby lines
+LOCAL_STRATEGIES = ("ambiguity", "inversion", "boundary")
+# Inversion looks this many lines either side of a claim for evidence
+CONTEXT_LINES = 3
+
+_LINE_REF_RE = re.compile(r"\blines? \d+")
+
+
+def _segments(lines: list[str], sections: list[dict[str, Any]]) -> list[tuple[int, int, str]]:
+    """Split a document into (start_line, end_line, section name) segments.
+
+    Lines before the first heading form a "Document" segment, matching
+    ``_find_section_for_line``.
+    """
+    segments = []
+    first = sections[0]["start_line"] if sections else len(lines) + 1
+    if first > 1:
+        segments.append((1, first - 1, "Document"))
+    segments.extend((s["start_line"], s["end_line"], s["name"]) for s in sections)
+    return segments
+
+
+def _finding_key(mut: dict[str, Any]) -> tuple[str, ...]:
+    """Identity of a finding across edits: line numbers are left out."""
+    original = "" if mut["strategy"] == "deletion" else _LINE_REF_RE.sub("line", mut["original"])
+    return (mut["strategy"], mut["location"]["section"], mut["_desc"], original)
+
+
+class IncrementalMutator:
+    """Re-runs mutation strategies only on the sections of a document that changed.
+
+    A document is split into heading-delimited segments, each fingerprinted
+    with ``CONTEXT_LINES`` of its neighbours (what inversion can see). Per
+    segment, a content-addressed record holds the local strategies' findings
+    with segment-relative line numbers, and the extracted numeric values,
+    modal clauses and section-name counts that feed the cross-section
+    strategies. Contradiction pairs are rebuilt from those indexes, and
+    deletion's reference totals are updated by the segments that were added
+    or removed since the previous run of the same document. The merged
+    report is identical to a full ``run_mutations`` run.
+    """
+
+    def __init__(self, max_documents: int = 64, max_segments: int = 20000) -> None:
+        self.max_documents = max_documents
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._documents: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+        self._records: "OrderedDict[bytes, dict[str, Any]]" = OrderedDict()
+
+    def _record(self, fingerprint: bytes, stats: dict[str, int]) -> dict[str, Any]:
+        record = self._records.get(fingerprint)
+        if record is None:
+            record = {"local": {}, "names": {}}
+            self._records[fingerprint] = record
+            if len(self._records) > self.max_segments:
+                self._records.popitem(last=False)
+            stats["sections_reanalyzed"] += 1
+        else:
+            self._records.move_to_end(fingerprint)
+            stats["sections_reused"] += 1
+        return record
+
+    @staticmethod
+    def _fill(record: dict[str, Any], lines: list[str], start: int, end: int, strategies: list[str]) -> None:
+        """Compute whatever ``strategies`` need that the record lacks."""
+        lo = max(0, start - 1 - CONTEXT_LINES)
+        before = start - 1 - lo
+        length = end - start + 1
+        for strat in strategies:
+            if strat in LOCAL_STRATEGIES and strat not in record["local"]:
+                chunk = lines[lo:min(len(lines), end + CONTEXT_LINES)]
+                found = []
+                for mut in STRATEGY_RUNNERS[strat](chunk, []):
+                    rel = mut["location"]["line"] - before
+                    if 1 <= rel <= length:
+                        mut["location"]["line"] = rel
+                        found.append(mut)
+                record["local"][strat] = found
+        own = lines[start - 1:end]
+        if "contradiction" in strategies and "values" not in record:
+            record["values"] = _numeric_values(own)
+            record["shall"], record["shall_not"] = _modal_clauses(own)
+        if "deletion" in strategies and "text" not in record:
+            record["text"] = "\n".join(own)
+
+    @staticmethod
+    def _name_count(record: dict[str, Any], name: str) -> int:
+        count = record["names"].get(name)
+        if count is None:
+            count = len(re.findall(re.escape(name), record["text"], re.IGNORECASE))
+            record["names"][name] = count
+        return count
+
+    def _deletion(
+        self,
+        previous: dict[str, Any] | None,
+        sections: list[dict[str, Any]],
+        segments: list[tuple[int, int, str]],
+        records: list[dict[str, Any]],
+        fingerprints: list[bytes],
+    ) -> tuple[list[dict[str, Any]], dict[str, int]]:
+        """Deletion findings, with reference totals updated by segment delta."""
+        old_totals = previous["name_totals"] if previous else {}
+        added: Counter = Counter()
+        removed: Counter = Counter()
+        if previous:
+            added = Counter(fingerprints) - previous["fingerprints"]
+            removed = previous["fingerprints"] - Counter(fingerprints)
+        by_fp = dict(zip(fingerprints, records))
+        old_by_fp = previous["records"] if previous else {}
+
+        totals: dict[str, int] = {}
+        mutations: list[dict[str, Any]] = []
+        skip = len(segments) - len(sections)  # Preamble segment, not a section
+        for (start, end, name), record in zip(segments[skip:], records[skip:]):
+            if name not in totals:
+                if name in old_totals and all(
+                    name in old_by_fp[fp]["names"] for fp in removed
+                ):
+                    totals[name] = (
+                        old_totals[name]
+                        + sum(self._name_count(by_fp[fp], name) * n for fp, n in added.items())
+                        - sum(old_by_fp[fp]["names"][name] * n for fp, n in removed.items())
+                    )
+                else:
+                    totals[name] = sum(self._name_count(r, name) for r in records)
+            ref_count = totals[name] - self._name_count(record, name)
+            if ref_count == 0:
+                mutations.append({
+                    "id": "",
+                    "strategy": "deletion",
+                    "location": {"line": start, "section": name},
+                    "original": f"Section '{name}' ({end - start + 1} lines)",
+                    "mutated": f"Remove section '{name}' and observe: zero structural impact",
+                    "severity": "minor",
+                    "detected": True,
+                    "_desc": f"Dead clause — no other section references '{name}' (impact score: 0)",
+                })
+            elif ref_count >= 3:
+                mutations.append({
+                    "id": "",
+                    "strategy": "deletion",
+                    "location": {"line": start, "section": name},
+                    "original": f"Section '{name}' ({end - start + 1} lines)",
+                    "mutated": f"Remove section '{name}': {ref_count} sections would lose a dependency",
+                    "severity": "major",
+                    "detected": True,
+                    "_desc": f"Critical dependency — {ref_count} other sections reference '{name}'",
+                })
+        return mutations, totals
+
+    def run(
+        self,
+        key: str,
+        content: str,
+        strategies: str = "all",
+        severity_threshold: str = "minor",
+        preset: str = "",
+    ) -> dict[str, Any]:
+        """Mutation-test ``content``, reusing state from the last run under ``key``.
+
+        Returns the ``run_mutations`` result with each mutation tagged
+        ``change`` ("new" or "unchanged" relative to the previous run with
+        the same settings), plus ``resolved`` (previous findings that are
+        gone) and ``incremental`` statistics.
+
+        Raises:
+            ValueError: If the preset is not found or a strategy is unknown.
+        """
+        active_strategies, preset_config = _resolve_strategies(strategies, preset)
+        lines = content.split("\n")
+        sections = _parse_sections(content)
+        segments = _segments(lines, sections)
+        stats = {"sections_reanalyzed": 0, "sections_reused": 0}
+
+        with self._lock:
+            previous = self._documents.get(key)
+            fingerprints: list[bytes] = []
+            records: list[dict[str, Any]] = []
+            for start, end, _ in segments:
+                lo = max(0, start - 1 - CONTEXT_LINES)
+                window = "\n".join(lines[lo:min(len(lines), end + CONTEXT_LINES)])
+                fingerprint = hashlib.blake2b(
+                    f"{start - 1 - lo}:{end - start + 1}\n{window}".encode("utf-8", "surrogatepass"),
+                    digest_size=16,
+                ).digest()
+                record = self._record(fingerprint, stats)
+                self._fill(record, lines, start, end, active_strategies)
+                fingerprints.append(fingerprint)
+                records.append(record)
+
+            all_mutations: list[dict[str, Any]] = []
+            name_totals: dict[str, int] = {}
+            for strat in active_strategies:
+                if strat in LOCAL_STRATEGIES:
+                    merged = []
+                    for (start, _, name), record in zip(segments, records):
+                        for mut in record["local"][strat]:
+                            merged.append({
+                                **mut,
+                                "location": {"line": start + mut["location"]["line"] - 1, "section": name},
+                            })
+                    # Full runs order ambiguity and inversion by keyword, then line
+                    merged.sort(key=lambda m: (m.get("_rank", 0), m["location"]["line"]))
+                    all_mutations.extend(merged)
+                elif strat == "contradiction":
+                    seen_values: dict[str, list[tuple[str, int, str]]] = {}
+                    shall_lines: list[tuple[int, str, str, str]] = []
+                    shall_not_lines: list[tuple[int, str, str, str]] = []
+                    for (start, _, name), record in zip(segments, records):
+                        offset = start - 1
+                        for unit, val, n in record["values"]:
+                            seen_values.setdefault(unit, []).append((val, n + offset, name))
+                        shall_lines.extend((n + offset, subj, text, name) for n, subj, text in record["shall"])
+                        shall_not_lines.extend((n + offset, subj, text, name) for n, subj, text in record["shall_not"])
+                    all_mutations.extend(_pair_contradictions(seen_values, shall_lines, shall_not_lines))
+                elif strat == "deletion":
+                    found, name_totals = self._deletion(previous, sections, segments, records, fingerprints)
+                    all_mutations.extend(found)
+
+            mutations = _finalize(all_mutations, preset_config, severity_threshold)
+
+            # Tag findings against the previous run with the same settings
+            settings = (tuple(active_strategies), severity_threshold.lower(), preset)
+            prior: dict[tuple, dict[str, Any]] = {}
+            if previous and previous["settings"] == settings:
+                prior = previous["findings"]
+            findings: dict[tuple, dict[str, Any]] = {}
+            seen: Counter = Counter()
+            for mut in mutations:
+                base = _finding_key(mut)
+                seen[base] += 1
+                finding_key = (*base, seen[base])
+                mut["change"] = "unchanged" if finding_key in prior else "new"
+                findings[finding_key] = mut
+            resolved = [m for k, m in prior.items() if k not in findings]
+
+            self._documents[key] = {
+                "settings": settings,
+                "findings": findings,
+                "fingerprints": Counter(fingerprints),
+                "records": dict(zip(fingerprints, records)),
+                "name_totals": name_totals,
+            }
+            self._documents.move_to_end(key)
+            if len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+        return {
+            "mutations": mutations,
+            "resolved": resolved,
+            "strategies_applied": active_strategies,
+            "sections_analyzed": len(sections),
+            "lines_analyzed": len(lines),
+            "incremental": {
+                **stats,
+                "sections_total": len(segments),
+                "previous_run": previous is not None,
+            },
+        }
+
+
+_INCREMENTAL = IncrementalMutator()
+
+
+# ============================================================
+# Main tool function
+# ============================================================
+async def mutate(
+    target_path: str,
+    strategies: str = "all",
+    severity_threshold: str = "minor",
+    preset: str = "",
+    incremental: bool = False,
+    response_format: str = "pretty",
+) -> str:
+    """Run mutation testing on a document to detect hidden vulnerabilities.
+
+    Applies 5 mutation strategies (contradiction, ambiguity, deletion, inversion,
+    boundary) to identify unverified assumptions, vague language, contradictions,
+    dead clauses, and fragile numeric parameters.
+
+    Args:
+        target_path: Path to the document file to test (Markdown or plain text).
+        strategies: Comma-separated strategy names or "all". Options:
+            contradiction, ambiguity, deletion, inversion, boundary.
+        severity_threshold: Minimum severity to include in results.
+            Options: info, minor, major, critical.
+        preset: Optional document type preset. Options:
+            contract, api_spec, academic_paper, policy.
+        incremental: Re-analyze only the sections that changed since the
+            last incremental run on this file, and tag each finding as
+            "new" or "unchanged"; findings that disappeared are listed in
+            resolved_mutations.
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact; the most severe findings
+            only, survivors as IDs instead of repeated objects).
+
+    Returns:
+        JSON string with mutation results including findings, kill score, and summary.
+    """
+    start_time = time.time()
+
+    # Validate target file
+    target = Path(target_path)
+    if not target.exists():
+        return json.dumps({"error": f"File not found: {target_path}"}, indent=2)
+    if not target.is_file():
+        return json.dumps({"error": f"Not a file: {target_path}"}, indent=2)
+
+    # Large files are memory-mapped rather than read; incremental mode
+    # keeps per-section text anyway
+    content = target.read_text(encoding="utf-8") if incremental else read_document(target)
+    try:
+        if incremental:
+            run = _INCREMENTAL.run(
+                str(target.resolve()), content, strategies, severity_threshold, preset,
+            )
+        else:
+            run = run_mutations(content, strategies, severity_threshold, preset)
+    except ValueError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    finally:
+        if isinstance(content, MappedDocument):
+            content.close()
+    all_mutations = run["mutations"]
 
     # Separate surviving vs killed
     surviving = [m for m in all_mutations if not m.get("detected", False)]
@@ -598,6 +1023,8 @@ async def mutate(
             "severity": m["severity"],
             "detected": m["detected"],
         }
+        if incremental:
+            out["change"] = m["change"]
         output_mutations.append(out)
 
     surviving_output = [
@@ -625,13 +1052,42 @@ async def mutate(
         },
         "metadata": {
             "target": str(target_path),
-            "strategies_applied": active_strategies,
+            "strategies_applied": run["strategies_applied"],
             "severity_threshold": severity_threshold,
             "preset": preset if preset else None,
-            "sections_analyzed": len(sections),
-            "lines_analyzed": len(lines),
+            "sections_analyzed": run["sections_analyzed"],
+            "lines_analyzed": run["lines_analyzed"],
             "elapsed_seconds": elapsed,
         },
     }
 
-    return json.dumps(result, indent=2)
+    if incremental:
+        result["resolved_mutations"] = [
+            {
+                "id": m["id"],
+                "strategy": m["strategy"],
+                "location": m["location"],
+                "original": m["original"],
+                "severity": m["severity"],
+                "change": "resolved",
+            }
+            for m in run["resolved"]
+        ]
+        result["summary"]["new"] = sum(1 for m in all_mutations if m["change"] == "new")
+        result["summary"]["resolved"] = len(run["resolved"])
+        result["metadata"]["incremental"] = run["incremental"]
+
+    return render(result, response_format, _minimal)
+
+
+def _minimal(result: dict[str, Any]) -> dict[str, Any]:
+    """Minimal response: capped findings, survivors by ID, resolved findings capped."""
+    out = dict(result)
+    out["mutations"] = sorted(result["mutations"], key=lambda m: SEVERITY_ORDER.get(m["severity"], 9))
+    cap(out, "mutations", MINIMAL_MUTATIONS)
+    # From the full survivor list, so survivors cut from "mutations" still count
+    survivors = sorted(out.pop("surviving_mutations"), key=lambda m: SEVERITY_ORDER.get(m["severity"], 9))
+    out["surviving_ids"] = [m["id"] for m in survivors]
+    cap(out, "surviving_ids", MINIMAL_MUTATIONS)
+    cap(out, "resolved_mutations", MINIMAL_MUTATIONS)
+    return out
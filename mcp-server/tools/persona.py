@@ -3,13 +3,29 @@
 Selects the best-fit persona for a given task based on CQE Pattern 03
 (Cognitive Profile). Supports built-in personas and custom persona
 directories (e.g., mutadoc/personas/).
+
+Custom persona directories are loaded once into a process-wide registry
+and re-parsed only when a file's mtime or size changes. All persona
+keywords are compiled into one Aho-Corasick automaton, so scoring a task
+description against every persona is a single pass over the text.
+``persona_batch`` applies the same scoring to a whole list of tasks, such
+as the subtasks returned by decompose, in one call.
 """
 
+import heapq
 import json
+import math
+import os
 import re
+import time
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
+from .response import render
+from .text_analysis import TASK_TYPE_KEYWORDS, analyze
+
 CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
 
 # --- Built-in Persona Registry ---
@@ -115,51 +131,204 @@ PERSONAS = {
     },
 }
 
-# Task type keyword mappings for auto-detection
-TASK_TYPE_KEYWORDS = {
-    "code": [
-        "code", "implement", "refactor", "debug", "build", "compile",
-        "function", "class", "test", "fix", "bug", "deploy",
-    ],
-    "document": [
-        "document", "write", "readme", "spec", "guide", "manual",
-        "tutorial", "describe", "explain",
-    ],
-    "analysis": [
-        "analyze", "data", "model", "statistics", "evaluate", "benchmark",
-        "metric", "experiment", "hypothesis",
-    ],
-    "review": [
-        "review", "audit", "check", "inspect", "assess", "validate",
-        "security", "compliance", "contract", "legal",
-    ],
-}
-
-
 def _detect_task_type(task_description: str) -> str:
     """Detect task type from description using keyword frequency."""
-    desc_lower = task_description.lower()
+    hits = analyze(task_description)["hits"]["task_type"]
     scores: dict[str, int] = {}
     for task_type, keywords in TASK_TYPE_KEYWORDS.items():
-        scores[task_type] = sum(1 for kw in keywords if kw in desc_lower)
+        scores[task_type] = sum(1 for kw in keywords if kw in hits)
     best = max(scores, key=lambda k: scores[k])
     if scores[best] == 0:
         return "code"  # default
     return best
 
 
-def _compute_fit_score(persona: dict, task_description: str) -> float:
-    """Compute fit score (0.0-1.0) based on keyword overlap."""
-    desc_lower = task_description.lower()
-    keywords = persona["keywords"]
-    if not keywords:
+def _fit_score(matches: int, keyword_count: int) -> float:
+    """Compute fit score (0.0-1.0) from the number of matched keywords."""
+    if not keyword_count:
         return 0.0
-    matches = sum(1 for kw in keywords if kw in desc_lower)
     # Normalize: cap at 1.0, weight toward partial matches
-    raw = matches / max(len(keywords) * 0.3, 1)
+    raw = matches / max(keyword_count * 0.3, 1)
     return round(min(raw, 1.0), 2)
 
 
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which keywords occur in a text.
+
+    Matching is substring-based and case-sensitive on the input; callers
+    pass lowercased text, mirroring ``keyword in text.lower()``.
+    """
+
+    def __init__(self, keywords) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+        for keyword in keywords:
+            if keyword:
+                self._add(keyword)
+        self._link()
+
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if keyword not in self._out[state]:
+            self._out[state].append(keyword)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target
+                self._out[nxt] = self._out[nxt] + self._out[target]
+
+    def find(self, text: str) -> set[str]:
+        """Return the set of distinct keywords occurring in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class PersonaRegistry:
+    """Built-in plus custom personas with cached loading and keyword index."""
+
+    def __init__(self, builtin: dict) -> None:
+        self._builtin = builtin
+        # dir -> {file name: ((mtime_ns, size), persona)}
+        self._files: dict[str, dict[str, tuple[tuple[int, int], dict]]] = {}
+        # dir -> (version, personas, index, automaton)
+        self._indexes: dict[str, tuple] = {}
+
+    def _scan_dir(self, custom_dir: str) -> None:
+        """Re-parse only the .md files whose mtime or size changed."""
+        cached = self._files.get(custom_dir, {})
+        fresh: dict[str, tuple[tuple[int, int], dict]] = {}
+        try:
+            entries = sorted(
+                (e for e in os.scandir(custom_dir) if e.name.endswith(".md") and e.is_file()),
+                key=lambda e: e.name,
+            )
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            hit = cached.get(entry.name)
+            if hit is not None and hit[0] == stamp:
+                fresh[entry.name] = hit
+                continue
+            fresh[entry.name] = (stamp, _parse_persona_file(Path(entry.path)))
+        self._files[custom_dir] = fresh
+
+    def custom_personas(self, custom_dir: str) -> dict:
+        """Return custom personas in a directory, keyed by file stem."""
+        if not Path(custom_dir).is_dir():
+            self._files.pop(custom_dir, None)
+            return {}
+        self._scan_dir(custom_dir)
+        return {
+            name[:-len(".md")]: persona_data
+            for name, (_, persona_data) in self._files[custom_dir].items()
+        }
+
+    def _index(self, custom_dir: str) -> tuple:
+        """Return (version, personas, keyword index, automaton), rebuilt on change."""
+        custom = self.custom_personas(custom_dir) if custom_dir else {}
+        version = tuple(
+            (name, stamp) for name, (stamp, _) in self._files.get(custom_dir, {}).items()
+        )
+        cached = self._indexes.get(custom_dir)
+        if cached is not None and cached[0] == version:
+            return cached
+
+        all_personas = dict(self._builtin)
+        all_personas.update(custom)
+
+        # keyword -> {persona name: multiplicity in its keyword list}
+        index: dict[str, dict[str, int]] = {}
+        for name, p in all_personas.items():
+            for kw in p["keywords"]:
+                per_kw = index.setdefault(kw, {})
+                per_kw[name] = per_kw.get(name, 0) + 1
+
+        built = (version, all_personas, index, KeywordAutomaton(index))
+        self._indexes[custom_dir] = built
+        return built
+
+    def score_batch(self, descriptions: list[str], custom_dir: str = "") -> tuple[dict, list[dict[str, float]]]:
+        """Score many task descriptions against the registry in one sweep.
+
+        Each description is run through the automaton once (a sparse
+        task x keyword row) and multiplied by the keyword x persona index.
+        Identical descriptions are scored once.
+
+        Returns:
+            ``(all_personas, fits)`` where ``fits[i]`` maps persona name to
+            fit score for description ``i``, holding non-zero fits only.
+        """
+        _, all_personas, index, automaton = self._index(custom_dir)
+        memo: dict[str, dict[str, float]] = {}
+        fits: list[dict[str, float]] = []
+        for description in descriptions:
+            text = description.lower()
+            row = memo.get(text)
+            if row is None:
+                matches: dict[str, int] = {}
+                for kw in automaton.find(text):
+                    for name, multiplicity in index[kw].items():
+                        matches[name] = matches.get(name, 0) + multiplicity
+                row = {}
+                for name, count in matches.items():
+                    fit = _fit_score(count, len(all_personas[name]["keywords"]))
+                    if fit > 0:
+                        row[name] = fit
+                memo[text] = row
+            fits.append(row)
+        return all_personas, fits
+
+    def rank(self, task_description: str, custom_dir: str = "", top_k: int = 3) -> list[tuple[str, float, dict]]:
+        """Score every persona in one pass; return the top-k ``(name, fit, persona)``.
+
+        Ties keep registry order (built-ins first, then custom by file name).
+        """
+        _, all_personas, index, automaton = self._index(custom_dir)
+        matches: dict[str, int] = {}
+        for kw in automaton.find(task_description.lower()):
+            for name, multiplicity in index[kw].items():
+                matches[name] = matches.get(name, 0) + multiplicity
+        return heapq.nlargest(
+            top_k,
+            (
+                (name, _fit_score(matches.get(name, 0), len(p["keywords"])), p)
+                for name, p in all_personas.items()
+            ),
+            key=lambda item: item[1],
+        )
+
+
 def _check_cq003(task_description: str) -> Optional[str]:
     """Check for CQ003 violation: generic or too-brief task description."""
     words = task_description.strip().split()
@@ -179,40 +348,49 @@ def _check_cq003(task_description: str) -> Optional[str]:
     return None
 
 
-async def _load_custom_personas(custom_dir: str) -> dict:
-    """Load custom personas from .md files in the given directory."""
-    custom = {}
-    dir_path = Path(custom_dir)
-    if not dir_path.is_dir():
-        return custom
-    for md_file in sorted(dir_path.glob("*.md")):
-        content = md_file.read_text(encoding="utf-8")
-        # Extract persona name from H1
-        name_match = re.search(r"^#\s+Persona:\s*(.+)$", content, re.MULTILINE)
-        name = name_match.group(1).strip() if name_match else md_file.stem
-        # Extract role description from first paragraph after ## Role Description
-        role_match = re.search(
-            r"##\s+Role Description\s*\n+(.+?)(?:\n\n|\n##)",
-            content,
-            re.DOTALL,
-        )
-        role = role_match.group(1).strip() if role_match else ""
-        # Extract keywords from cognitive traits or role text
-        keywords = re.findall(r"\b\w{4,}\b", role.lower())[:20]
-        custom[md_file.stem] = {
-            "expertise": role[:120] if role else f"Custom persona: {name}",
-            "cognitive_style": "custom",
-            "keywords": keywords,
-            "prompt": f"You are {name}. {role[:500]}",
-            "source": str(md_file),
-        }
-    return custom
+_PERSONA_NAME_RE = re.compile(r"^#\s+Persona:\s*(.+)$", re.MULTILINE)
+_ROLE_DESCRIPTION_RE = re.compile(r"##\s+Role Description\s*\n+(.+?)(?:\n\n|\n##)", re.DOTALL)
+_KEYWORD_RE = re.compile(r"\b\w{4,}\b")
+# Rows of a "## Strategy Affinity" table: | **Ambiguity** | **Primary** | ... |
+_AFFINITY_RE = re.compile(
+    r"^\|\s*\**(\w+)\**\s*\|\s*\**(Primary|Secondary|Low)\**\s*\|", re.MULTILINE | re.IGNORECASE,
+)
+
+
+def _parse_persona_file(md_file: Path) -> dict:
+    """Parse one custom persona .md file into a registry entry."""
+    content = md_file.read_text(encoding="utf-8")
+    # Extract persona name from H1
+    name_match = _PERSONA_NAME_RE.search(content)
+    name = name_match.group(1).strip() if name_match else md_file.stem
+    # Extract role description from first paragraph after ## Role Description
+    role_match = _ROLE_DESCRIPTION_RE.search(content)
+    role = role_match.group(1).strip() if role_match else ""
+    # Extract keywords from cognitive traits or role text
+    keywords = _KEYWORD_RE.findall(role.lower())[:20]
+    persona_data = {
+        "expertise": role[:120] if role else f"Custom persona: {name}",
+        "cognitive_style": "custom",
+        "keywords": keywords,
+        "prompt": f"You are {name}. {role[:500]}",
+        "source": str(md_file),
+    }
+    # MutaDoc strategy -> "primary" / "secondary" / "low", used by thinktank
+    affinity = {m.group(1).lower(): m.group(2).lower() for m in _AFFINITY_RE.finditer(content)}
+    if affinity:
+        persona_data["strategy_affinity"] = affinity
+    return persona_data
+
+
+_REGISTRY = PersonaRegistry(PERSONAS)
+_BATCH_ALTERNATIVES = 2
 
 
 async def persona(
     task_description: str,
     task_type: str = "auto",
     custom_persona_dir: str = "",
+    response_format: str = "pretty",
 ) -> str:
     """Select the best-fit cognitive persona for a task.
 
@@ -222,6 +400,8 @@ async def persona(
             "review", or "auto" for automatic detection.
         custom_persona_dir: Optional path to a directory containing
             custom persona .md files (e.g., mutadoc/personas/).
+        response_format: "pretty" (indented JSON), "compact" or "minimal"
+            (both without whitespace).
     """
     # CQ003 check
     cq003_warning = _check_cq003(task_description)
@@ -231,19 +411,8 @@ async def persona(
     if task_type == "auto":
         detected_type = _detect_task_type(task_description)
 
-    # Build combined persona registry
-    all_personas = dict(PERSONAS)
-    if custom_persona_dir:
-        custom = await _load_custom_personas(custom_persona_dir)
-        all_personas.update(custom)
-
-    # Score all personas
-    scored = []
-    for name, p in all_personas.items():
-        fit = _compute_fit_score(p, task_description)
-        scored.append((name, fit, p))
-
-    scored.sort(key=lambda x: x[1], reverse=True)
+    # Score all personas (built-in + cached custom) in one pass, top 3
+    scored = _REGISTRY.rank(task_description, custom_persona_dir, top_k=3)
 
     # Best match
     best_name, best_score, best_persona = scored[0]
@@ -273,4 +442,146 @@ async def persona(
     if custom_persona_dir and "source" in best_persona:
         result["selected_persona"]["source"] = best_persona["source"]
 
-    return json.dumps(result, indent=2)
+    return render(result, response_format)
+
+
+def _ranked_candidates(fits: dict[str, float], order: dict[str, int]):
+    """Yield persona names by descending fit; ties and zero fits in registry order."""
+    yield from sorted(fits, key=lambda name: (-fits[name], order[name]))
+    for name in order:
+        if name not in fits:
+            yield name
+
+
+async def persona_batch(
+    tasks: list,
+    task_type: str = "auto",
+    custom_persona_dir: str = "",
+    max_per_persona: int = 0,
+    response_format: str = "pretty",
+) -> str:
+    """Assign a cognitive persona to every task in a batch.
+
+    Scores all tasks against the persona registry in one pass, so a whole
+    decomposition costs one call and one custom-persona load.
+
+    Args:
+        tasks: Task descriptions — strings, or objects with a "description"
+            (and optional "id"), e.g. the "subtasks" array from decompose.
+        task_type: Task category applied to every task, or "auto" to detect
+            it per task.
+        custom_persona_dir: Optional path to a directory containing
+            custom persona .md files (e.g., mutadoc/personas/).
+        max_per_persona: Diversity constraint — the most tasks any single
+            persona may be assigned (0 = unconstrained). Raised to the
+            smallest feasible value if too low for the batch size.
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact, without the
+            per-task alternatives).
+    """
+    start = time.time()
+
+    if not tasks:
+        return json.dumps({"error": "tasks must be a non-empty list"}, indent=2)
+
+    ids: list[str] = []
+    descriptions: list[str] = []
+    for i, task in enumerate(tasks):
+        if isinstance(task, dict):
+            description = task.get("description")
+            task_id = str(task.get("id") or f"T-{i + 1}")
+        else:
+            description, task_id = task, f"T-{i + 1}"
+        if not isinstance(description, str) or not description.strip():
+            return json.dumps({
+                "error": f"task {i} has no description",
+            }, indent=2)
+        ids.append(task_id)
+        descriptions.append(description)
+
+    all_personas, fits = _REGISTRY.score_batch(descriptions, custom_persona_dir)
+    order = {name: i for i, name in enumerate(all_personas)}
+
+    # Diversity: assign the most confident tasks first, each to its best
+    # persona that still has capacity
+    cap = 0
+    if max_per_persona > 0:
+        cap = max(max_per_persona, math.ceil(len(tasks) / len(all_personas)))
+    best = [next(_ranked_candidates(row, order)) for row in fits]
+    chosen = list(best)
+    if cap:
+        counts: dict[str, int] = {}
+        by_confidence = sorted(range(len(tasks)), key=lambda i: -fits[i].get(best[i], 0.0))
+        for i in by_confidence:
+            for name in _ranked_candidates(fits[i], order):
+                if counts.get(name, 0) < cap:
+                    chosen[i] = name
+                    counts[name] = counts.get(name, 0) + 1
+                    break
+
+    assignments = []
+    assigned: dict[str, int] = {}
+    for i, (task_id, description, row) in enumerate(zip(ids, descriptions, fits)):
+        name = chosen[i]
+        assigned[name] = assigned.get(name, 0) + 1
+        alternatives = [
+            {"name": alt, "fit_score": row[alt]}
+            for alt in islice(
+                (n for n in _ranked_candidates(row, order) if n != name and n in row),
+                _BATCH_ALTERNATIVES,
+            )
+        ]
+        assignment: dict = {
+            "task_id": task_id,
+            "persona": name,
+            "fit_score": row.get(name, 0.0),
+            "alternatives": alternatives,
+            "detected_task_type": (
+                _detect_task_type(description) if task_type == "auto" else task_type
+            ),
+        }
+        if name != best[i]:
+            assignment["preferred_persona"] = best[i]
+        cq003_warning = _check_cq003(description)
+        if cq003_warning:
+            assignment["warning"] = cq003_warning
+        assignments.append(assignment)
+
+    # Persona details once per persona rather than once per task
+    personas: dict[str, dict] = {}
+    for name, count in assigned.items():
+        p = all_personas[name]
+        personas[name] = {
+            "expertise": p["expertise"],
+            "cognitive_style": p["cognitive_style"],
+            "persona_prompt": p["prompt"],
+            "assigned_tasks": count,
+        }
+        if "source" in p:
+            personas[name]["source"] = p["source"]
+
+    elapsed = time.time() - start
+
+    result: dict = {
+        "assignments": assignments,
+        "personas": personas,
+        "task_count": len(tasks),
+        "distinct_personas": len(personas),
+        "elapsed_ms": round(elapsed * 1000, 1),
+    }
+    if cap:
+        result["diversity"] = {
+            "max_per_persona": cap,
+            "reassigned": sum(1 for a, b in zip(chosen, best) if a != b),
+        }
+
+    return render(result, response_format, _minimal_batch)
+
+
+def _minimal_batch(result: dict) -> dict:
+    """Minimal persona_batch response: assignments without alternatives."""
+    out = dict(result)
+    out["assignments"] = [
+        {k: v for k, v in a.items() if k != "alternatives"} for a in result["assignments"]
+    ]
+    return out
@@ -0,0 +1,85 @@
+"""Response serialization shared by all tools.
+
+Tool results go straight into the agent's context window, so every tool
+takes a ``response_format``:
+
+- ``"pretty"`` (default): indented JSON, as tools have always returned
+- ``"compact"``: the same document without whitespace, and with non-ASCII
+  text written as is rather than as ``\\uXXXX`` escapes
+- ``"minimal"``: compact, after the tool's minimizer has dropped arrays
+  that repeat other fields, replaced repeated objects with ID references
+  and capped long lists (``<key>_omitted`` holds the count left out)
+
+Compact and minimal output use orjson when it is installed; the output
+is the same JSON either way.
+"""
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+try:
+    import orjson
+except ImportError:  # Optional: faster serialization when installed
+    orjson = None
+
+RESPONSE_FORMATS = ("pretty", "compact", "minimal")
+
+
+def json_backend() -> str:
+    """Name of the library used for compact and minimal output."""
+    return "orjson" if orjson is not None else "json"
+
+
+# Off while a minimizer runs under an output budget (see tools/budget.py),
+# which pages through the whole list instead
+_CAPS_ENABLED: ContextVar[bool] = ContextVar("caps_enabled", default=True)
+
+
+@contextmanager
+def uncapped() -> Iterator[None]:
+    """Run minimizers without ``cap`` cutting their lists."""
+    token = _CAPS_ENABLED.set(False)
+    try:
+        yield
+    finally:
+        _CAPS_ENABLED.reset(token)
+
+
+def cap(payload: dict[str, Any], key: str, limit: int) -> None:
+    """Keep the first ``limit`` items of ``payload[key]``; record how many were dropped."""
+    if not _CAPS_ENABLED.get():
+        return
+    items = payload.get(key)
+    if isinstance(items, list) and len(items) > limit:
+        payload[key] = items[:limit]
+        payload[f"{key}_omitted"] = len(items) - limit
+
+
+def dumps_compact(payload: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+def render(
+    payload: dict[str, Any],
+    response_format: str = "pretty",
+    minimal: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    ensure_ascii: bool = True,
+) -> str:
+    """Serialize a tool result in ``response_format``.
+
+    ``minimal`` builds the minimal form of ``payload`` (without modifying
+    it); tools with nothing to drop pass None. ``ensure_ascii`` applies to
+    pretty output only. An unknown format yields an error result.
+    """
+    if response_format == "pretty":
+        return json.dumps(payload, indent=2, ensure_ascii=ensure_ascii)
+    if response_format == "compact":
+        return dumps_compact(payload)
+    if response_format == "minimal":
+        return dumps_compact(minimal(payload) if minimal else payload)
+    return json.dumps({
+        "error": f"Invalid response_format '{response_format}'. Valid: {', '.join(RESPONSE_FORMATS)}",
+    }, indent=2)
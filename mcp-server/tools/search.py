@@ -0,0 +1,316 @@
+"""Full-text search over the CQ Engine knowledge base.
+
+Indexes CQE patterns, anti-patterns, MutaDoc strategies, personas and
+repair templates, and cqlint rules at the level of markdown sections, and
+ranks sections against a query with BM25. Agents get the few sections
+they need, with snippets, inside a token budget instead of loading whole
+catalogs (CQE Pattern #02, Context Gate).
+
+The index lives in memory for the life of the server. Every query stats
+the source files and re-indexes only those whose mtime or size changed,
+so edits are picked up without a full rebuild.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from .response import render
+from .text_analysis import tokenize
+
+# cq-engine repository root
+CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Source kind -> directory (relative to the repository root)
+SOURCES = {
+    "pattern": "patterns",
+    "anti_pattern": "patterns/anti-patterns",
+    "strategy": "mutadoc/strategies",
+    "persona": "mutadoc/personas",
+    "repair_template": "mutadoc/repair/templates",
+    "cqlint_rule": "cqlint/rules",
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SNIPPET_WORDS = 40
+_HEADING_RE = re.compile(r"^(#{1,3})\s+(.+?)\s*#*\s*$")
+_STOPWORDS = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "be", "to", "of", "in",
+    "for", "on", "with", "at", "by", "from", "it", "its", "this", "that",
+    "and", "or", "but", "not", "as", "if", "so", "do", "does", "how", "what",
+})
+
+
+def _terms(text: str) -> list[str]:
+    """Index terms: word tokens without stopwords, plural "s" folded."""
+    terms = []
+    for token in tokenize(text):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+def _split_sections(content: str) -> list[tuple[str, str]]:
+    """Split markdown into (heading path, body) sections at #, ## and ### headings."""
+    sections: list[tuple[str, str]] = []
+    path: list[str] = []
+    body: list[str] = []
+    in_code = False
+
+    def flush() -> None:
+        text = "\n".join(body).strip()
+        if text or path:
+            sections.append((" > ".join(path), text))
+
+    for line in content.splitlines():
+        if line.startswith("```"):
+            in_code = not in_code
+        m = None if in_code else _HEADING_RE.match(line)
+        if m:
+            flush()
+            level = len(m.group(1))
+            path = path[:level - 1] + [m.group(2)]
+            body = []
+        else:
+            body.append(line)
+    flush()
+    return sections
+
+
+def _snippet(body: str, query_terms: set[str], words: int = SNIPPET_WORDS) -> str:
+    """Return the ``words``-word window of ``body`` with the most query terms."""
+    tokens = body.split()
+    if len(tokens) <= words:
+        return " ".join(tokens)
+    hits = [
+        1 if any(t in query_terms for t in _terms(token)) else 0
+        for token in tokens
+    ]
+    current = best = sum(hits[:words])
+    best_start = 0
+    for start in range(1, len(tokens) - words + 1):
+        current += hits[start + words - 1] - hits[start - 1]
+        if current > best:
+            best_start, best = start, current
+    snippet = " ".join(tokens[best_start:best_start + words])
+    prefix = "..." if best_start else ""
+    suffix = "..." if best_start + words < len(tokens) else ""
+    return f"{prefix}{snippet}{suffix}"
+
+
+class SearchIndex:
+    """In-memory inverted index over markdown sections, updated per file."""
+
+    def __init__(self, root: Path = CQ_ENGINE_ROOT, sources: dict[str, str] = SOURCES) -> None:
+        self.root = root
+        self.sources = sources
+        self._lock = threading.Lock()
+        self._files: dict[str, tuple[int, int]] = {}     # rel path -> (mtime_ns, size)
+        self._file_docs: dict[str, list[int]] = {}       # rel path -> doc ids
+        self._docs: dict[int, dict] = {}                 # doc id -> section record
+        self._postings: dict[str, dict[int, int]] = {}   # term -> {doc id: tf}
+        self._total_length = 0
+        self._next_id = 0
+
+    def _scan(self) -> dict[str, tuple[str, tuple[int, int]]]:
+        """Stat every source file: rel path -> (kind, (mtime_ns, size))."""
+        found = {}
+        for kind, rel_dir in self.sources.items():
+            try:
+                with os.scandir(self.root / rel_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith(".md") and entry.is_file():
+                            st = entry.stat()
+                            found[f"{rel_dir}/{entry.name}"] = (kind, (st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+        return found
+
+    def _remove_file(self, rel: str) -> None:
+        for doc_id in self._file_docs.pop(rel, []):
+            doc = self._docs.pop(doc_id)
+            self._total_length -= doc["length"]
+            for term in doc["terms"]:
+                postings = self._postings[term]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[term]
+        self._files.pop(rel, None)
+
+    def _add_file(self, rel: str, kind: str, fingerprint: tuple[int, int]) -> None:
+        try:
+            content = (self.root / rel).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return
+        doc_ids = []
+        title = ""
+        for heading, body in _split_sections(content):
+            title = title or heading
+            terms = _terms(f"{heading}\n{body}")
+            if not terms:
+                continue
+            tf: dict[str, int] = {}
+            for term in terms:
+                tf[term] = tf.get(term, 0) + 1
+            doc_id = self._next_id
+            self._next_id += 1
+            self._docs[doc_id] = {
+                "file": rel,
+                "kind": kind,
+                "section": heading or title,
+                "body": body,
+                "length": len(terms),
+                "terms": tuple(tf),
+            }
+            for term, count in tf.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+            self._total_length += len(terms)
+            doc_ids.append(doc_id)
+        self._file_docs[rel] = doc_ids
+        self._files[rel] = fingerprint
+
+    def refresh(self) -> dict:
+        """Bring the index up to date; return counts of changed files."""
+        found = self._scan()
+        with self._lock:
+            removed = [rel for rel in self._files if rel not in found]
+            changed = [
+                rel for rel, (_, fp) in found.items() if self._files.get(rel) != fp
+            ]
+            for rel in removed:
+                self._remove_file(rel)
+            for rel in changed:
+                self._remove_file(rel)
+                kind, fp = found[rel]
+                self._add_file(rel, kind, fp)
+        return {"indexed": len(changed), "removed": len(removed)}
+
+    def search(self, query: str, top_k: int = 5, kinds: list[str] | None = None) -> list[dict]:
+        """Rank sections against ``query`` with BM25.
+
+        Returns up to ``top_k`` hits with file, kind, section, score and the
+        section body (callers build snippets from it).
+        """
+        self.refresh()
+        query_terms = list(dict.fromkeys(_terms(query)))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs or not query_terms:
+                return []
+            avg_length = self._total_length / n_docs
+            scores: dict[int, float] = {}
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length = self._docs[doc_id]["length"]
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            hits = []
+            for doc_id, score in ranked:
+                doc = self._docs[doc_id]
+                if kinds and doc["kind"] not in kinds:
+                    continue
+                hits.append({**doc, "score": round(score, 3)})
+                if len(hits) >= top_k:
+                    break
+        return hits
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "sections": len(self._docs),
+                "terms": len(self._postings),
+            }
+
+
+_INDEX = SearchIndex()
+
+
+def warm_index() -> dict:
+    """Build the search index ahead of the first query."""
+    return _INDEX.refresh()
+
+
+async def search(
+    query: str,
+    top_k: int = 5,
+    max_tokens: int = 2000,
+    kinds: list[str] | None = None,
+    response_format: str = "pretty",
+) -> str:
+    """Search CQE patterns, anti-patterns, MutaDoc strategies, personas,
+    repair templates and cqlint rules.
+
+    Returns the best-matching sections (BM25 ranking) with a snippet
+    around the query terms, stopping before the results exceed the token
+    budget.
+
+    Args:
+        query: Free-text query, e.g. "token budget overflow".
+        top_k: Maximum number of sections to return (default: 5).
+        max_tokens: Token budget for all returned snippets (default: 2000).
+        kinds: Optional filter — any of "pattern", "anti_pattern",
+            "strategy", "persona", "repair_template", "cqlint_rule".
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact, without the index
+            statistics).
+    """
+    start = time.time()
+
+    if not query or not query.strip():
+        return json.dumps({"error": "query is required and must be non-empty"}, indent=2)
+    unknown = sorted(set(kinds or []) - set(SOURCES))
+    if unknown:
+        return json.dumps({
+            "error": f"Unknown kinds: {', '.join(unknown)}",
+            "valid_kinds": list(SOURCES),
+        }, indent=2)
+
+    query_terms = set(_terms(query))
+    results = []
+    used_tokens = 0
+    truncated = False
+    for hit in _INDEX.search(query, top_k=max(1, top_k), kinds=kinds):
+        snippet = _snippet(hit["body"], query_terms)
+        tokens = int(math.ceil(len(snippet.split()) * 1.3))
+        if results and used_tokens + tokens > max_tokens:
+            truncated = True
+            break
+        used_tokens += tokens
+        results.append({
+            "file": hit["file"],
+            "kind": hit["kind"],
+            "section": hit["section"],
+            "score": hit["score"],
+            "snippet": snippet,
+        })
+
+    return render({
+        "query": query,
+        "results": results,
+        "total_results": len(results),
+        "estimated_tokens": used_tokens,
+        "truncated_by_budget": truncated,
+        "index": _INDEX.stats,
+        "elapsed_ms": round((time.time() - start) * 1000, 1),
+    }, response_format, _minimal)
+
+
+def _minimal(result: dict) -> dict:
+    """Minimal response: the results without index statistics."""
+    return {k: v for k, v in result.items() if k != "index"}
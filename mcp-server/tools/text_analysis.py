@@ -0,0 +1,219 @@
+"""Shared text analysis for the CQ Engine tools.
+
+Holds the keyword tables the tools score text against and matches all of
+them in one pass over the text:
+- The text is lowercased and tokenized once
+- Every table is compiled into a single token trie, so each keyword or
+  multi-word phrase ("based on") is matched at word boundaries
+  ("test" matches "tests" and "testing", not "latest")
+- Results are memoized by a hash of the text, so tools that analyze the
+  same description (e.g., decompose then persona) pay for it once
+
+Results are shared between callers and must be treated as read-only.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+# --- Keyword tables ---
+
+# decompose: keywords that indicate task complexity, grouped by impact level
+COMPLEXITY_KEYWORDS = {
+    # High complexity indicators (weight: 3)
+    "refactor": 3, "redesign": 3, "migrate": 3, "rewrite": 3,
+    "architect": 3, "integrate": 3, "across": 3, "end-to-end": 3,
+    "cross-cutting": 3, "system-wide": 3, "comprehensive": 3,
+    # Medium complexity indicators (weight: 2)
+    "and": 2, "then": 2, "also": 2, "additionally": 2,
+    "implement": 2, "analyze": 2, "compare": 2, "evaluate": 2,
+    "multiple": 2, "several": 2, "various": 2, "each": 2,
+    "both": 2, "transform": 2, "optimize": 2, "debug": 2,
+    # Low complexity indicators (weight: 1)
+    "update": 1, "fix": 1, "add": 1, "remove": 1,
+    "check": 1, "verify": 1, "test": 1, "review": 1,
+    "rename": 1, "move": 1, "copy": 1, "format": 1,
+}
+
+# decompose: dependency signal keywords
+DEPENDENCY_SIGNALS = {
+    "after": "sequential",
+    "based on": "data_dependency",
+    "using output of": "data_dependency",
+    "depends on": "data_dependency",
+    "requires": "prerequisite",
+    "before": "sequential",
+    "once": "sequential",
+    "following": "sequential",
+    "then": "sequential",
+}
+
+# persona: task type keyword mappings for auto-detection
+TASK_TYPE_KEYWORDS = {
+    "code": [
+        "code", "implement", "refactor", "debug", "build", "compile",
+        "function", "class", "test", "fix", "bug", "deploy",
+    ],
+    "document": [
+        "document", "write", "readme", "spec", "guide", "manual",
+        "tutorial", "describe", "explain",
+    ],
+    "analysis": [
+        "analyze", "data", "model", "statistics", "evaluate", "benchmark",
+        "metric", "experiment", "hypothesis",
+    ],
+    "review": [
+        "review", "audit", "check", "inspect", "assess", "validate",
+        "security", "compliance", "contract", "legal",
+    ],
+}
+
+# gate: keywords extracted from common task descriptions for relevance scoring
+TASK_DOMAIN_KEYWORDS = {
+    "auth": ["auth", "login", "session", "token", "jwt", "oauth", "credential", "password"],
+    "api": ["api", "endpoint", "route", "handler", "request", "response", "rest", "graphql"],
+    "database": ["database", "db", "model", "schema", "migration", "query", "sql", "orm"],
+    "test": ["test", "spec", "fixture", "mock", "assert", "expect", "coverage"],
+    "ui": ["component", "view", "template", "style", "css", "layout", "render", "ui", "frontend"],
+    "config": ["config", "setting", "env", "environment", "deploy", "ci", "docker"],
+    "docs": ["doc", "readme", "guide", "tutorial", "changelog", "license"],
+}
+
+# learn: observation keywords mapped to CQE Patterns
+PATTERN_KEYWORD_MAP: dict[str, str] = {
+    "attention": "Pattern 01: Attention Budget",
+    "budget": "Pattern 01: Attention Budget",
+    "token": "Pattern 01: Attention Budget",
+    "context": "Pattern 02: Context Gate",
+    "filter": "Pattern 02: Context Gate",
+    "gate": "Pattern 02: Context Gate",
+    "persona": "Pattern 03: Cognitive Profile",
+    "role": "Pattern 03: Cognitive Profile",
+    "profile": "Pattern 03: Cognitive Profile",
+    "mutation": "Pattern 05: Assumption Mutation",
+    "test": "Pattern 05: Assumption Mutation",
+    "assumption": "Pattern 05: Assumption Mutation",
+    "learn": "Pattern 06: Experience Distillation",
+    "experience": "Pattern 06: Experience Distillation",
+    "distill": "Pattern 06: Experience Distillation",
+    "file": "Pattern 07: File-Based I/O",
+    "io": "Pattern 07: File-Based I/O",
+    "output": "Pattern 07: File-Based I/O",
+    "template": "Pattern 08: Template-Driven Role",
+    "driven": "Pattern 08: Template-Driven Role",
+}
+
+# Table name -> keywords matched by analyze()
+TABLES: dict[str, list[str]] = {
+    "complexity": list(COMPLEXITY_KEYWORDS),
+    "dependency": list(DEPENDENCY_SIGNALS),
+    "task_type": sorted({kw for kws in TASK_TYPE_KEYWORDS.values() for kw in kws}),
+    "domain": sorted({kw for kws in TASK_DOMAIN_KEYWORDS.values() for kw in kws}),
+    "pattern": list(PATTERN_KEYWORD_MAP),
+}
+
+# --- Tokenization ---
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+# Inflectional endings stripped when matching ("tests", "refactoring",
+# "analyzed", "implementation"); longest first
+_SUFFIXES = ("ation", "ing", "ers", "ies", "ed", "er", "es", "s")
+_MEMO_SIZE = 256
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase and split text into word tokens (hyphenated words stay whole)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def _variants(token: str) -> tuple[str, ...]:
+    """Return the token plus its candidate base forms."""
+    forms = [token]
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            base = token[:-len(suffix)]
+            if suffix == "ies":
+                forms.append(base + "y")
+                continue
+            forms.append(base)
+            forms.append(base + "e")                 # analyzing -> analyze
+            if suffix == "ation":
+                forms.append(base + "ate")           # migration -> migrate
+            if len(base) > 2 and base[-1] == base[-2]:
+                forms.append(base[:-1])              # debugging -> debug
+    return tuple(dict.fromkeys(forms))
+
+
+def _build_trie() -> dict:
+    """Compile every table into one token trie.
+
+    Each node maps a token to its child node; the ``None`` key holds the
+    ``(table, keyword)`` pairs ending at that node.
+    """
+    root: dict = {}
+    for table, keywords in TABLES.items():
+        for keyword in keywords:
+            node = root
+            for token in tokenize(keyword):
+                node = node.setdefault(token, {})
+            node.setdefault(None, []).append((table, keyword))
+    return root
+
+
+_TRIE = _build_trie()
+_memo: "OrderedDict[bytes, dict]" = OrderedDict()
+_memo_lock = threading.Lock()  # tools call analyze() from the thread pool
+
+
+def _match(tokens: list[str]) -> dict[str, dict[str, int]]:
+    """Count keyword matches for every table in one pass over the tokens."""
+    hits: dict[str, dict[str, int]] = {table: {} for table in TABLES}
+    n = len(tokens)
+    for i in range(n):
+        matched: set[tuple[str, str]] = set()
+        frontier = [_TRIE]
+        j = i
+        while frontier and j < n:
+            step = []
+            for node in frontier:
+                for form in _variants(tokens[j]):
+                    child = node.get(form)
+                    if child is not None:
+                        step.append(child)
+                        matched.update(child.get(None, ()))
+            frontier = step
+            j += 1
+        for table, keyword in matched:
+            counts = hits[table]
+            counts[keyword] = counts.get(keyword, 0) + 1
+    return hits
+
+
+def analyze(text: str) -> dict:
+    """Tokenize ``text`` once and match every keyword table.
+
+    Returns:
+        Dict with ``word_count`` (whitespace-separated words), ``tokens``
+        (frozenset of word tokens) and ``hits`` (table name -> keyword ->
+        number of occurrences). Memoized by a hash of the text.
+    """
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _memo_lock:
+        cached = _memo.get(key)
+        if cached is not None:
+            _memo.move_to_end(key)
+            return cached
+
+    tokens = tokenize(text)
+    result = {
+        "word_count": len(text.split()),
+        "tokens": frozenset(tokens),
+        "hits": _match(tokens),
+    }
+    with _memo_lock:
+        _memo[key] = result
+        if len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    return result
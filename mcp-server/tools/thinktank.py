@@ -0,0 +1,419 @@
+"""ThinkTank: multi-persona review of a document or decision.
+
+Phase 4 of the roadmap, on rule-based lenses instead of model calls, so a
+run is deterministic and takes milliseconds. Each persona is a lens over
+the MutaDoc strategies (see ``mutate.py``):
+
+- built-in personas have the strategies in ``BUILTIN_LENSES``; MutaDoc
+  personas (``mutadoc/personas/*.md``) declare theirs in a "Strategy
+  Affinity" table
+- a primary strategy reports findings at their own severity, a secondary
+  one a level lower; "low" strategies are not run
+- built-in personas escalate a finding one level when its line contains
+  one of their keywords (custom personas' keywords are extracted from
+  prose, so they do not)
+
+The personas run as the roadmap's three waves on ``WaveScheduler``:
+
+1. independent passes, one per persona, run concurrently. Each strategy
+   runs once per document and its findings are shared by every persona
+   using it
+2. cross-critique: each persona compares its severities with the
+   consensus and notes critical findings its lens misses
+3. synthesis: findings are merged (one entry per finding, with the
+   severity each persona gave it) and ranked, and the contradiction
+   heatmap is built
+
+The heatmap is a sparse section x persona matrix: the number of findings
+in the section on which the persona disagrees with the consensus
+severity. Sections and personas without dissent are left out.
+
+Waves are bounded by a token budget as they would be with model calls:
+a pass costs its persona prompt plus its input (the document for wave 1,
+the structured summaries for waves 2 and 3).
+"""
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+from scheduler import CallableExecutor, WaveScheduler
+
+from .document import MappedDocument, read_document
+from .mutate import SEVERITY_ORDER, STRATEGY_RUNNERS, _find_section_for_line, _parse_sections
+from .persona import PERSONAS, _REGISTRY, KeywordAutomaton
+from .response import cap, render
+
+CQ_ENGINE_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_PERSONA_DIR = CQ_ENGINE_ROOT / "mutadoc" / "personas"
+
+# Built-in persona -> MutaDoc strategy -> "primary" / "secondary"
+BUILTIN_LENSES: dict[str, dict[str, str]] = {
+    "senior_engineer": {"boundary": "primary", "inversion": "primary", "deletion": "secondary"},
+    "legal_analyst": {"contradiction": "primary", "ambiguity": "primary", "deletion": "secondary"},
+    "security_auditor": {"boundary": "primary", "ambiguity": "secondary", "inversion": "secondary"},
+    "technical_writer": {"ambiguity": "primary", "deletion": "primary"},
+    "data_scientist": {"inversion": "primary", "contradiction": "secondary", "boundary": "secondary"},
+    "project_manager": {"deletion": "primary", "contradiction": "primary", "boundary": "secondary"},
+}
+# Lens for custom personas without a Strategy Affinity table
+DEFAULT_LENS = {"ambiguity": "primary", "inversion": "secondary"}
+
+SEVERITIES = ("critical", "major", "minor", "info")
+# Structured summaries passed between waves, relative to the document
+SUMMARY_RATIO = 0.25
+# Personas whose findings overlap less than this (Jaccard) are independent
+# perspectives (CQ Benchmark DQ-1)
+INDEPENDENCE_THRESHOLD = 0.65
+# Lens weight of a strategy when scoring how many concerns a panel covers
+COVERAGE = {"primary": 1.0, "secondary": 0.5}
+MINIMAL_FINDINGS = 50
+
+
+def _estimate_tokens(text: str) -> int:
+    """Estimate token count from text (words * 1.3 approximation)."""
+    return int(math.ceil(len(text.split()) * 1.3))
+
+
+def _shift(severity: str, levels: int) -> str:
+    index = SEVERITY_ORDER.get(severity, len(SEVERITIES) - 1) + levels
+    return SEVERITIES[max(0, min(len(SEVERITIES) - 1, index))]
+
+
+def _consensus(severities: Sequence[str]) -> str:
+    """Most common severity; ties go to the more severe."""
+    counts: dict[str, int] = {}
+    for s in severities:
+        counts[s] = counts.get(s, 0) + 1
+    return min(counts, key=lambda s: (-counts[s], SEVERITY_ORDER.get(s, len(SEVERITIES))))
+
+
+class _SharedStrategies:
+    """Strategy findings for one document, computed once whichever persona asks first."""
+
+    def __init__(self, lines: Sequence[str], sections: list[dict[str, Any]]) -> None:
+        self.lines = lines
+        self.sections = sections
+        self._locks = {name: threading.Lock() for name in STRATEGY_RUNNERS}
+        self._findings: dict[str, list[dict[str, Any]]] = {}
+
+    def findings(self, strategy: str) -> list[dict[str, Any]]:
+        with self._locks[strategy]:
+            if strategy not in self._findings:
+                self._findings[strategy] = STRATEGY_RUNNERS[strategy](self.lines, self.sections)
+            return self._findings[strategy]
+
+    def runs(self) -> int:
+        return len(self._findings)
+
+
+def _lens(name: str, persona: dict[str, Any]) -> dict[str, str]:
+    if name in BUILTIN_LENSES:
+        return BUILTIN_LENSES[name]
+    affinity = persona.get("strategy_affinity")
+    if not affinity:
+        return DEFAULT_LENS
+    return {s: a for s, a in affinity.items() if s in STRATEGY_RUNNERS and a in ("primary", "secondary")}
+
+
+def _finding_key(finding: dict[str, Any]) -> tuple[str, int, str]:
+    return (finding["strategy"], finding["location"]["line"], finding["_desc"])
+
+
+# ============================================================
+# Waves
+# ============================================================
+def _independent_pass(shared: _SharedStrategies, lens: dict[str, str], focus: KeywordAutomaton | None) -> dict:
+    """Wave 1: one persona's findings, keyed by finding, with its severity."""
+    rated: dict[tuple, str] = {}
+    for strategy, affinity in lens.items():
+        for finding in shared.findings(strategy):
+            severity = finding["severity"] if affinity == "primary" else _shift(finding["severity"], 1)
+            line = shared.lines[finding["location"]["line"] - 1]
+            if focus is not None and focus.find(line.lower()):
+                severity = _shift(severity, -1)
+            rated[_finding_key(finding)] = severity
+    return rated
+
+
+def _cross_critique(name: str, lens: dict[str, str], passes: dict[str, dict]) -> dict:
+    """Wave 2: where one persona departs from the consensus, and what its lens misses."""
+    raisers: dict[tuple, list[str]] = {}
+    for ratings in passes.values():
+        for key, severity in ratings.items():
+            raisers.setdefault(key, []).append(severity)
+    own = passes[name]
+    dissents = []
+    blind_spots = []
+    for key, severities in raisers.items():
+        consensus = _consensus(severities)
+        if key in own:
+            if own[key] != consensus:
+                dissents.append((key, own[key], consensus))
+        elif consensus == "critical" and key[0] not in lens:
+            blind_spots.append(key)
+    return {"dissents": dissents, "blind_spots": blind_spots, "agreements": len(own) - len(dissents)}
+
+
+def _synthesize(
+    shared: _SharedStrategies,
+    passes: dict[str, dict],
+    critiques: dict[str, dict],
+) -> dict[str, Any]:
+    """Wave 3: merged, ranked findings and the sparse contradiction heatmap."""
+    by_key: dict[tuple, dict[str, Any]] = {}
+    for strategy in {key[0] for ratings in passes.values() for key in ratings}:
+        for finding in shared.findings(strategy):
+            by_key.setdefault(_finding_key(finding), finding)
+
+    merged = []
+    for key, finding in by_key.items():
+        raised_by = {name: ratings[key] for name, ratings in passes.items() if key in ratings}
+        if not raised_by:
+            continue
+        merged.append({
+            "key": key,
+            "strategy": finding["strategy"],
+            "location": finding["location"],
+            "original": finding["original"],
+            "description": finding["_desc"],
+            "severity": _consensus(list(raised_by.values())),
+            "raised_by": raised_by,
+        })
+    merged.sort(key=lambda f: (
+        SEVERITY_ORDER.get(f["severity"], len(SEVERITIES)), -len(f["raised_by"]), f["location"]["line"],
+    ))
+    ids = {}
+    for i, finding in enumerate(merged):
+        ids[finding["key"]] = finding["id"] = f"TT{i + 1:03d}"
+
+    heatmap: dict[str, dict[str, int]] = {}
+    by_persona: dict[str, int] = {}
+    missed_by: dict[tuple, list[str]] = {}
+    for name, critique in critiques.items():
+        for key, _, _ in critique["dissents"]:
+            section = _find_section_for_line(shared.sections, key[1])
+            row = heatmap.setdefault(section, {})
+            row[name] = row.get(name, 0) + 1
+            by_persona[name] = by_persona.get(name, 0) + 1
+        for key in critique["blind_spots"]:
+            missed_by.setdefault(key, []).append(name)
+
+    findings = []
+    for finding in merged:
+        key = finding.pop("key")
+        if key in missed_by:
+            finding["missed_by"] = missed_by[key]
+        findings.append({"id": finding.pop("id"), **finding})
+    return {
+        "findings": findings,
+        "heatmap": {
+            "sections": heatmap,
+            "by_persona": by_persona,
+            "cells": sum(len(row) for row in heatmap.values()),
+        },
+        "blind_spots": {name: len(c["blind_spots"]) for name, c in critiques.items() if c["blind_spots"]},
+    }
+
+
+def _independent_perspectives(findings: list[dict[str, Any]], names: Sequence[str]) -> int:
+    """Personas (in order) whose findings overlap no earlier kept persona's."""
+    kept: list[set[str]] = []
+    for name in names:
+        raised = {f["id"] for f in findings if name in f["raised_by"]}
+        if raised and all(len(raised & other) / len(raised | other) < INDEPENDENCE_THRESHOLD for other in kept):
+            kept.append(raised)
+    return len(kept)
+
+
+def _strategy_coverage(lenses: dict[str, dict[str, str]]) -> float:
+    """Mean over all strategies of the best lens weight any persona gives it."""
+    return sum(
+        max((COVERAGE.get(lens.get(s, ""), 0.0) for lens in lenses.values()), default=0.0)
+        for s in STRATEGY_RUNNERS
+    ) / len(STRATEGY_RUNNERS)
+
+
+# ============================================================
+# Tool
+# ============================================================
+def _select_personas(names: list[str] | None, custom_dir: str) -> tuple[dict[str, dict], list[str]]:
+    """Requested personas (all by default) and any unknown names."""
+    available = dict(PERSONAS)
+    available.update(_REGISTRY.custom_personas(custom_dir))
+    if not names:
+        return available, []
+    unknown = [n for n in names if n not in available]
+    return {n: available[n] for n in names if n in available}, unknown
+
+
+async def run_thinktank(
+    content: "str | MappedDocument",
+    personas: dict[str, dict],
+    token_budget: int = 50000,
+    max_concurrent: int = 4,
+) -> dict[str, Any]:
+    """Run the three waves over document text (or a ``MappedDocument``).
+
+    Returns:
+        Dict with ``findings``, ``heatmap``, ``blind_spots``, ``lenses``,
+        ``waves`` (per-wave scheduler reports) and counts.
+
+    Raises:
+        RuntimeError: If a pass fails.
+    """
+    lines = content.split("\n") if isinstance(content, str) else content
+    sections = _parse_sections(lines)
+    shared = _SharedStrategies(lines, sections)
+    lenses = {name: _lens(name, p) for name, p in personas.items()}
+    focus = {name: KeywordAutomaton(p["keywords"]) if name in PERSONAS else None for name, p in personas.items()}
+
+    doc_tokens = (len(content) if isinstance(content, str) else content.size) // 4
+    summary_tokens = int(doc_tokens * SUMMARY_RATIO)
+    prompt_tokens = {name: _estimate_tokens(p["prompt"]) for name, p in personas.items()}
+    wave1 = [f"W1-{name}" for name in personas]
+    wave2 = [f"W2-{name}" for name in personas]
+    subtasks = (
+        [
+            {"id": f"W1-{name}", "persona": name, "dependencies": [],
+             "estimated_tokens": prompt_tokens[name] + doc_tokens}
+            for name in personas
+        ]
+        + [
+            {"id": f"W2-{name}", "persona": name, "dependencies": wave1,
+             "estimated_tokens": prompt_tokens[name] + summary_tokens}
+            for name in personas
+        ]
+        + [{"id": "W3-synthesis", "dependencies": wave2, "estimated_tokens": 2 * summary_tokens}]
+    )
+
+    def run(subtask: dict, inputs: dict[str, Any]) -> Any:
+        wave, name = subtask["id"][:2], subtask.get("persona")
+        # Inputs are keyed by subtask ID: "W1-<persona>" or "W2-<persona>"
+        by_persona = {sid[3:]: output for sid, output in inputs.items()}
+        if wave == "W1":
+            return _independent_pass(shared, lenses[name], focus[name])
+        if wave == "W2":
+            return _cross_critique(name, lenses[name], by_persona)
+        return by_persona
+
+    scheduler = WaveScheduler(
+        CallableExecutor(run), max_concurrency=max_concurrent, token_budget=token_budget, max_retries=0,
+    )
+    report = await scheduler.run(subtasks)
+    failed = [r for r in report["subtasks"] if r["status"] != "completed"]
+    if failed:
+        raise RuntimeError(f"{failed[0]['task_id']} {failed[0]['status']}: {failed[0].get('error', '')}")
+    outputs = {r["task_id"]: r["output"] for r in report["subtasks"]}
+    passes = {sid[3:]: outputs[sid] for sid in wave1}
+    critiques = outputs["W3-synthesis"]
+
+    result = _synthesize(shared, passes, critiques)
+    result["lenses"] = lenses
+    result["raw_findings"] = sum(len(rated) for rated in passes.values())
+    result["strategies_run"] = shared.runs()
+    result["sections_analyzed"] = len(sections)
+    result["waves"] = [
+        {k: w[k] for k in ("wave", "duration_ms", "peak_concurrency", "peak_tokens_in_flight")}
+        for w in report["waves"]
+    ]
+    return result
+
+
+async def thinktank(
+    target_path: str = "",
+    decision: str = "",
+    personas: list[str] | None = None,
+    custom_persona_dir: str = "",
+    token_budget: int = 50000,
+    max_concurrent: int = 4,
+    response_format: str = "pretty",
+) -> str:
+    """Review a document or decision through several personas at once (ThinkTank).
+
+    Every persona reads the text independently through its own lens of
+    MutaDoc strategies, then critiques the consensus; the findings are
+    merged with duplicates removed and ranked. Returns each finding with
+    the severity every persona gave it, and a contradiction heatmap of
+    sections x personas where a persona disagrees with the consensus.
+
+    Args:
+        target_path: Path to the document to review.
+        decision: The text to review instead of a file, e.g. a decision
+            and its rationale.
+        personas: Persona names to use (default: all built-in personas
+            plus those in custom_persona_dir). At least 2.
+        custom_persona_dir: Directory of persona .md files (default:
+            mutadoc/personas/).
+        token_budget: Most estimated tokens in flight within a wave
+            (default: 50000). A pass larger than the budget runs alone.
+        max_concurrent: Most persona passes running at once (default: 4).
+        response_format: "pretty" (indented JSON), "compact" (no
+            whitespace) or "minimal" (compact; the most severe findings
+            only, without wave reports).
+    """
+    start = time.time()
+
+    if bool(target_path) == bool(decision and decision.strip()):
+        return json.dumps({"error": "Provide exactly one of target_path or decision"}, indent=2)
+    if target_path and not Path(target_path).is_file():
+        return json.dumps({"error": f"File not found: {target_path}"}, indent=2)
+
+    selected, unknown = _select_personas(personas, custom_persona_dir or str(DEFAULT_PERSONA_DIR))
+    if unknown:
+        return json.dumps({"error": f"Unknown personas: {', '.join(unknown)}"}, indent=2)
+    if len(selected) < 2:
+        return json.dumps({"error": "ThinkTank needs at least 2 personas"}, indent=2)
+
+    content = read_document(target_path) if target_path else decision
+    try:
+        run = await run_thinktank(content, selected, token_budget, max(1, max_concurrent))
+    except (RuntimeError, ValueError) as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    finally:
+        if isinstance(content, MappedDocument):
+            content.close()
+
+    findings = run["findings"]
+    by_severity: dict[str, int] = {}
+    for f in findings:
+        by_severity[f["severity"]] = by_severity.get(f["severity"], 0) + 1
+
+    result = {
+        "target": target_path or None,
+        "personas": {
+            name: {
+                "lens": run["lenses"][name],
+                "findings": sum(1 for f in findings if name in f["raised_by"]),
+                **({"source": p["source"]} if "source" in p else {}),
+            }
+            for name, p in selected.items()
+        },
+        "findings": findings,
+        "heatmap": run["heatmap"],
+        "blind_spots": run["blind_spots"],
+        "summary": {
+            "total": len(findings),
+            "raw_findings": run["raw_findings"],
+            "duplicates_merged": run["raw_findings"] - len(findings),
+            "by_severity": by_severity,
+            "contested": sum(1 for f in findings if len(set(f["raised_by"].values())) > 1),
+            "sections_analyzed": run["sections_analyzed"],
+            "strategies_run": run["strategies_run"],
+            "independent_perspectives": _independent_perspectives(findings, list(selected)),
+            "strategy_coverage": round(_strategy_coverage(run["lenses"]), 3),
+        },
+        "waves": run["waves"],
+        "elapsed_ms": round((time.time() - start) * 1000, 1),
+    }
+
+    return render(result, response_format, _minimal)
+
+
+def _minimal(result: dict[str, Any]) -> dict[str, Any]:
+    """Minimal response: the most severe findings, no wave reports."""
+    out = {k: v for k, v in result.items() if k != "waves"}
+    cap(out, "findings", MINIMAL_FINDINGS)
+    return out
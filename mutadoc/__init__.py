@@ -0,0 +1,7 @@
+"""MutaDoc — Mutation Testing for Documents.
+
+Python CLI (``python -m mutadoc``) on the same engine as the MCP
+``mutate`` tool. See README.md.
+"""
+
+__version__ = "0.1.0"
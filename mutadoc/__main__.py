@@ -0,0 +1,5 @@
+import sys
+
+from mutadoc.cli import main
+
+sys.exit(main())
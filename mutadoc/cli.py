@@ -0,0 +1,406 @@
+"""MutaDoc command-line interface on the shared mutate engine.
+
+Python counterpart of ``mutadoc.sh`` with the same subcommands, options,
+report formats and exit codes. Findings come from the engine behind the
+MCP ``mutate`` tool (``mcp-server/tools/mutate.py``), so the CLI, the MCP
+server and the hook daemon report the same mutations and kill score.
+Unlike the shell script, it accepts several documents and tests them in
+parallel worker processes.
+
+Usage:
+    python -m mutadoc test contract.md --preset contract --repair
+    python -m mutadoc quick docs/*.md --jobs 4
+    python -m mutadoc score spec.md --format json
+
+Exit codes: 0 no Critical/Major findings, 1 Critical/Major findings,
+2 argument error or file not found.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp-server"))
+
+from tools.document import MappedDocument, read_document  # noqa: E402
+from tools.mutate import ALL_STRATEGIES, _calculate_kill_score, _load_preset, run_mutations  # noqa: E402
+
+from mutadoc import __version__  # noqa: E402
+
+# --- Colors ---
+RED = "\033[0;31m"
+YELLOW = "\033[0;33m"
+GREEN = "\033[0;32m"
+CYAN = "\033[0;36m"
+GRAY = "\033[0;90m"
+BOLD = "\033[1m"
+NC = "\033[0m"
+
+SEVERITY_LABELS = {"critical": "Critical", "major": "Major", "minor": "Minor", "info": "Info"}
+
+# Persona lens: strategies whose Minor findings the persona escalates to Major
+PERSONA_ESCALATIONS: dict[str, set[str]] = {
+    "opposing_counsel": {"ambiguity", "contradiction"},
+    "naive_implementer": {"ambiguity", "boundary"},
+    "adversarial_reader": {"inversion"},
+}
+
+IMPACTS = {
+    "contradiction": "Cross-section inconsistency",
+    "deletion": "Structural impact of removing the section",
+    "inversion": "Unsupported assertion",
+    "boundary": "Parameter sensitivity — how robust is the document if this number changes?",
+}
+
+REPAIRS = {
+    "contradiction": "Reconcile the clauses — standardize to a single value or state which one takes precedence",
+    "ambiguity": "Replace the vague modifier with a specific, measurable term",
+    "deletion": "Consider removing this section or documenting why it exists independently",
+    "inversion": "Add supporting evidence, or qualify the claim with conditions",
+    "boundary": "Document the rationale for this value, or define the acceptable range",
+}
+
+
+# ============================================================
+# Analysis
+# ============================================================
+def _finding(mutation: dict[str, Any]) -> dict[str, str]:
+    """Convert an engine mutation record into a report finding."""
+    strategy = mutation["strategy"]
+    severity = mutation["severity"]
+    location = mutation["location"]
+    impact = IMPACTS.get(strategy, "")
+    if strategy == "ambiguity":
+        impact = f"Ambiguous language in {severity} context"
+    elif strategy == "deletion" and severity == "minor":
+        impact = "Zero structural impact"
+    return {
+        "id": mutation["id"],
+        "severity": SEVERITY_LABELS.get(severity, severity.capitalize()),
+        "strategy": strategy.capitalize(),
+        "location": f"Line {location['line']} ({location['section']})",
+        "description": mutation["_desc"],
+        "mutation": mutation["mutated"],
+        "impact": impact,
+        "repair": REPAIRS.get(strategy, ""),
+        "detected": mutation["detected"],
+    }
+
+
+def analyze_document(path: str, strategies: str = "all", preset: str = "", persona: str = "") -> dict[str, Any]:
+    """Mutation-test one document and summarize it for the reporters.
+
+    Runs in a worker process for multi-document runs, so it takes and
+    returns plain data only.
+
+    Without ``persona``, the preset's ``default_persona`` applies, as in
+    ``mutadoc.sh``.
+
+    Raises:
+        ValueError: If the preset is not found or a strategy is unknown.
+    """
+    if not persona and preset:
+        persona = _load_preset(preset).get("default_persona", "")
+    content = read_document(path)
+    try:
+        run = run_mutations(content, strategies, "minor", preset)
+        if isinstance(content, MappedDocument):
+            # One line more than line breaks, as str.split("\n")
+            lines = len(content) - 1
+            words = sum(len(line.split()) for line in content)
+        else:
+            lines = content.count("\n")
+            words = len(content.split())
+    finally:
+        if isinstance(content, MappedDocument):
+            content.close()
+    mutations = run["mutations"]
+
+    escalated = PERSONA_ESCALATIONS.get(persona, set())
+    for mut in mutations:
+        if mut["strategy"] in escalated and mut["severity"] == "minor":
+            mut["severity"] = "major"
+
+    findings = [_finding(m) for m in mutations]
+    counts = {label: 0 for label in SEVERITY_LABELS.values()}
+    for f in findings:
+        counts[f["severity"]] = counts.get(f["severity"], 0) + 1
+    return {
+        "document": Path(path).name,
+        "preset": preset or "auto",
+        "persona": persona or "none",
+        "strategies": ",".join(run["strategies_applied"]),
+        "lines": lines,
+        "sections": run["sections_analyzed"],
+        "words": words,
+        "kill_score": _calculate_kill_score(mutations),
+        "killed": sum(1 for m in mutations if m["detected"]),
+        "total": len(mutations),
+        "critical": counts["Critical"],
+        "major": counts["Major"],
+        "minor": counts["Minor"],
+        "dead_clauses": sum(1 for m in mutations if m["_desc"].startswith("Dead clause")),
+        "findings": findings,
+    }
+
+
+# ============================================================
+# Report generation
+# ============================================================
+def _paint(color: bool):
+    """Return a function that wraps text in an ANSI code when color is on."""
+    def paint(code: str, text: Any) -> str:
+        return f"{code}{text}{NC}" if color else str(text)
+    return paint
+
+
+def generate_header(report: dict[str, Any], color: bool = False) -> str:
+    """Progress header printed before a report (markdown and text formats)."""
+    paint = _paint(color)
+    lines = [
+        f"{paint(BOLD, 'mutadoc')} v{__version__} — Mutation Testing for Documents",
+        f"Target: {paint(CYAN, report['document'])} "
+        f"({report['lines']} lines, {report['sections']} sections, {report['words']} words)",
+    ]
+    if report["preset"] != "auto":
+        lines.append(f"Preset: {paint(CYAN, report['preset'])}")
+    if report["persona"] != "none":
+        lines.append(f"Persona: {paint(CYAN, report['persona'])}")
+    lines.append(f"Strategies: {paint(CYAN, report['strategies'])}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_report_markdown(report: dict[str, Any], repair: bool = False) -> str:
+    out = [
+        f"# MutaDoc Report: {report['document']}",
+        "",
+        f"> Preset: {report['preset']} | Persona: {report['persona']}",
+        f"> Mutation Kill Score: {report['kill_score']:g}% "
+        f"({report['killed']} killed / {report['total']} applied)",
+        f"> Generated: {datetime.now().strftime('%Y-%m-%d')}",
+        "",
+        "## Summary",
+        f"- Critical: {report['critical']}",
+        f"- Major: {report['major']}",
+        f"- Minor: {report['minor']}",
+        f"- Dead Clauses: {report['dead_clauses']}",
+        "",
+    ]
+    for severity, prefix in (("Critical", "C"), ("Major", "M"), ("Minor", "m")):
+        group = [f for f in report["findings"] if f["severity"] == severity]
+        if not group:
+            continue
+        out += [f"## {severity} Findings", ""]
+        for num, f in enumerate(group, 1):
+            out.append(f"### [{prefix}{num}] {f['strategy']}: {f['description']}")
+            out.append(f"- **Location**: {f['location']}")
+            if severity == "Minor":
+                out.append(f"- **Mutation**: {f['mutation']}")
+            else:
+                out.append(f"- **Strategy**: {f['strategy']}")
+                out.append(f"- **Mutation**: {f['mutation']}")
+                out.append(f"- **Impact**: {f['impact']}")
+                if repair and f["repair"]:
+                    out.append(f"- **Repair Suggestion**: {f['repair']}")
+            out.append("")
+    if not (report["critical"] or report["major"] or report["minor"]):
+        out += ["## No Findings", "", "All mutation tests passed. No vulnerabilities detected.", ""]
+    return "\n".join(out)
+
+
+def generate_report_text(report: dict[str, Any], repair: bool = False, color: bool = False) -> str:
+    paint = _paint(color)
+    out = [
+        paint(BOLD, f"MutaDoc Report: {report['document']}"),
+        f"Preset: {report['preset']} | Persona: {report['persona']}",
+        f"Mutation Kill Score: {paint(BOLD, format(report['kill_score'], 'g') + '%')} "
+        f"({report['killed']}/{report['total']})",
+        "",
+        f"  {paint(RED, 'Critical')}: {report['critical']}",
+        f"  {paint(YELLOW, 'Major')}:    {report['major']}",
+        f"  {paint(GRAY, 'Minor')}:    {report['minor']}",
+        f"  Dead Clauses: {report['dead_clauses']}",
+        "",
+    ]
+    if not report["findings"]:
+        out.append(f"  {paint(GREEN, '✓ All mutation tests passed.')}")
+        return "\n".join(out)
+    colors = {"Critical": RED, "Major": YELLOW}
+    for f in report["findings"]:
+        out.append(
+            f"  {paint(colors.get(f['severity'], GRAY), f['severity'])} "
+            f"{paint(BOLD, f['strategy'])}: {f['location']}"
+        )
+        out.append(f"    {f['description']}")
+        out.append(f"    {paint(GRAY, 'Mutation: ' + f['mutation'])}")
+        if repair and f["repair"]:
+            out.append(f"    {paint(CYAN, 'Repair: ' + f['repair'])}")
+        out.append("")
+    return "\n".join(out)
+
+
+def _json_report(report: dict[str, Any], repair: bool) -> dict[str, Any]:
+    return {
+        "metadata": {
+            "document": report["document"],
+            "preset": report["preset"],
+            "persona": report["persona"],
+            "version": __version__,
+            "timestamp": datetime.now().astimezone().strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "score": {
+            "kill_score": report["kill_score"],
+            "killed": report["killed"],
+            "total": report["total"],
+        },
+        "summary": {
+            "critical": report["critical"],
+            "major": report["major"],
+            "minor": report["minor"],
+            "dead_clauses": report["dead_clauses"],
+        },
+        "findings": [
+            {
+                "id": f["id"],
+                "severity": f["severity"],
+                "strategy": f["strategy"],
+                "location": f["location"],
+                "description": f["description"],
+                "mutation": f["mutation"],
+                "impact": f["impact"],
+                "repair": f["repair"] if repair else "",
+            }
+            for f in report["findings"]
+        ],
+    }
+
+
+def generate_report_json(report: dict[str, Any], repair: bool = False) -> str:
+    return json.dumps(_json_report(report, repair), indent=2, ensure_ascii=False)
+
+
+def generate_score_output(report: dict[str, Any], fmt: str = "markdown", color: bool = False) -> str:
+    if fmt == "json":
+        return json.dumps({
+            "document": report["document"],
+            "kill_score": report["kill_score"],
+            "killed": report["killed"],
+            "total": report["total"],
+        }, separators=(",", ":"), ensure_ascii=False)
+    paint = _paint(color)
+    lines = [
+        f"{paint(BOLD, report['document'])}: Mutation Kill Score "
+        f"{paint(BOLD, format(report['kill_score'], 'g') + '%')} ({report['killed']}/{report['total']})"
+    ]
+    if report["critical"]:
+        lines.append(f"  {paint(RED, str(report['critical']) + ' Critical')}, "
+                     f"{paint(YELLOW, str(report['major']) + ' Major')}")
+    elif report["major"]:
+        lines.append(f"  {paint(YELLOW, str(report['major']) + ' Major')}")
+    else:
+        lines.append(f"  {paint(GREEN, '✓ Pass')}")
+    return "\n".join(lines)
+
+
+def render(report: dict[str, Any], command: str, fmt: str, repair: bool, color: bool) -> str:
+    """Render one document's report for ``command`` in format ``fmt``."""
+    if command == "score":
+        return generate_score_output(report, fmt, color)
+    if fmt == "json":
+        return generate_report_json(report, repair)
+    if fmt == "text":
+        return generate_report_text(report, repair, color)
+    return generate_report_markdown(report, repair)
+
+
+# ============================================================
+# Main
+# ============================================================
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mutadoc",
+        description="mutadoc — Mutation Testing for Documents",
+        epilog="Exit codes: 0 all pass, 1 Critical or Major findings, "
+               "2 argument error or file not found.",
+    )
+    parser.add_argument("--version", "-v", action="version", version=f"mutadoc {__version__}")
+    parser.add_argument("command", choices=["test", "quick", "score"],
+                        help="test: full mutation test; quick: ambiguity only; score: kill score only")
+    parser.add_argument("documents", nargs="+", metavar="document")
+    parser.add_argument("--preset", default="", help="Preset configuration (contract, api_spec, academic_paper, policy)")
+    parser.add_argument("--strategies", default="all",
+                        help=f"Comma-separated strategy names ({', '.join(ALL_STRATEGIES)}) or \"all\"")
+    parser.add_argument("--persona", default="", choices=["", *PERSONA_ESCALATIONS],
+                        help="Persona lens applied to findings")
+    parser.add_argument("--repair", action="store_true", help="Include repair suggestions for each finding")
+    parser.add_argument("--output", default="", help="Write report to file (default: stdout)")
+    parser.add_argument("--format", default="markdown", choices=["markdown", "text", "json"])
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Worker processes for multiple documents (default: one per CPU)")
+    return parser
+
+
+def run_documents(paths: list[str], strategies: str, preset: str, persona: str, jobs: int = 0) -> list[dict[str, Any]]:
+    """Analyze documents in order, in parallel worker processes if more than one."""
+    workers = min(len(paths), jobs if jobs > 0 else (os.cpu_count() or 1))
+    if workers <= 1:
+        return [analyze_document(p, strategies, preset, persona) for p in paths]
+    n = len(paths)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(
+            analyze_document, paths, [strategies] * n, [preset] * n, [persona] * n,
+        ))
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    missing = [p for p in args.documents if not Path(p).is_file()]
+    if missing:
+        print(f"Error: File not found: {missing[0]}", file=sys.stderr)
+        return 2
+
+    strategies = args.strategies
+    repair = args.repair
+    if args.command == "quick":
+        strategies, repair = "ambiguity", False
+    color = not args.output and sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+    try:
+        reports = run_documents(args.documents, strategies, args.preset, args.persona, args.jobs)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.format == "json":
+        if len(reports) == 1:
+            output = render(reports[0], args.command, "json", repair, color)
+        elif args.command == "score":
+            output = "\n".join(render(r, "score", "json", repair, color) for r in reports)
+        else:
+            output = json.dumps([_json_report(r, repair) for r in reports], indent=2, ensure_ascii=False)
+    else:
+        parts = []
+        for report in reports:
+            body = render(report, args.command, args.format, repair, color)
+            if args.command != "score":
+                header = generate_header(report, color)
+                if args.output:
+                    print(header)
+                else:
+                    body = f"{header}\n{body}"
+            parts.append(body)
+        output = "\n".join(parts)
+
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        if args.format != "json":
+            print(f"Report written to: {args.output}")
+    else:
+        print(output)
+
+    return 1 if any(r["critical"] or r["major"] for r in reports) else 0